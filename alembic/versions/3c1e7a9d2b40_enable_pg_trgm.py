@@ -0,0 +1,27 @@
+
+"""enable_pg_trgm
+
+Revision ID: 3c1e7a9d2b40
+Revises: 21b492ac9cdf
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1e7a9d2b40'
+down_revision = '21b492ac9cdf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The fused hybrid search runs similarity() in the same statement as the other stages,
+    # so pg_trgm must exist instead of being optional.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+
+def downgrade() -> None:
+    op.execute("DROP EXTENSION IF EXISTS pg_trgm")
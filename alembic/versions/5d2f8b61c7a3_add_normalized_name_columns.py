@@ -0,0 +1,90 @@
+
+"""add_normalized_name_columns
+
+Revision ID: 5d2f8b61c7a3
+Revises: 3c1e7a9d2b40
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2f8b61c7a3'
+down_revision = '3c1e7a9d2b40'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# Frozen copy of app.services.etl.normalizer.normalize_name so the migration
+# keeps producing the same values if the application code changes later.
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+
+def _normalize(text):
+    if not text:
+        return ""
+    text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
+    return " ".join(t for t in _NON_ALNUM.split(text.upper().strip()) if t)
+
+
+def upgrade() -> None:
+    op.add_column('sanction', sa.Column('normalized_name', sa.String(), nullable=True))
+    op.add_column('sanction', sa.Column('normalized_aliases', sa.Text(), nullable=True))
+
+    # Backfill existing rows in batches
+    conn = op.get_bind()
+    sanction = sa.table(
+        'sanction',
+        sa.column('id', sa.Integer),
+        sa.column('entity_name', sa.String),
+        sa.column('aliases', sa.JSON),
+        sa.column('normalized_name', sa.String),
+        sa.column('normalized_aliases', sa.Text),
+    )
+    update_stmt = sanction.update().where(sanction.c.id == sa.bindparam('_id')).values(
+        normalized_name=sa.bindparam('_name'),
+        normalized_aliases=sa.bindparam('_aliases'),
+    )
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(sanction.c.id, sanction.c.entity_name, sanction.c.aliases)
+            .where(sanction.c.id > last_id).order_by(sanction.c.id).limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            alias_names = [
+                _normalize(a.get("name")) for a in (row.aliases or [])
+                if isinstance(a, dict) and a.get("name")
+            ]
+            params.append({
+                '_id': row.id,
+                '_name': _normalize(row.entity_name) or None,
+                '_aliases': " | ".join(n for n in alias_names if n) or None,
+            })
+        conn.execute(update_stmt, params)
+        last_id = rows[-1].id
+
+    op.create_index(
+        'ix_sanction_normalized_name_trgm', 'sanction', ['normalized_name'],
+        unique=False, postgresql_using='gin', postgresql_ops={'normalized_name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_sanction_normalized_aliases_trgm', 'sanction', ['normalized_aliases'],
+        unique=False, postgresql_using='gin', postgresql_ops={'normalized_aliases': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sanction_normalized_aliases_trgm', table_name='sanction')
+    op.drop_index('ix_sanction_normalized_name_trgm', table_name='sanction')
+    op.drop_column('sanction', 'normalized_aliases')
+    op.drop_column('sanction', 'normalized_name')
@@ -0,0 +1,123 @@
+
+"""add_sanction_name_table
+
+Revision ID: 8a4c0e93f1d6
+Revises: 5d2f8b61c7a3
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4c0e93f1d6'
+down_revision = '5d2f8b61c7a3'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# Frozen copies of app.services.etl.normalizer.normalize_name / detect_script
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+
+def _normalize(text):
+    if not text:
+        return ""
+    text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
+    return " ".join(t for t in _NON_ALNUM.split(text.upper().strip()) if t)
+
+def _script(text):
+    for ch in text or "":
+        if ch.isalpha():
+            return unicodedata.name(ch, "UNKNOWN").split(" ")[0]
+    return None
+
+def _row(sanction_id, name, name_type, quality):
+    return {
+        'sanction_id': sanction_id,
+        'name': name,
+        'normalized_name': _normalize(name) or None,
+        'name_type': name_type,
+        'quality': quality,
+        'script': _script(name),
+    }
+
+
+def upgrade() -> None:
+    sanction_name = op.create_table(
+        'sanction_name',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sanction_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('normalized_name', sa.String(), nullable=True),
+        sa.Column('name_type', sa.String(), nullable=False),
+        sa.Column('quality', sa.String(), nullable=True),
+        sa.Column('script', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['sanction_id'], ['sanction.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sanction_name_id'), 'sanction_name', ['id'], unique=False)
+    op.create_index(op.f('ix_sanction_name_sanction_id'), 'sanction_name', ['sanction_id'], unique=False)
+
+    # Backfill from the sanction table in batches
+    conn = op.get_bind()
+    sanction = sa.table(
+        'sanction',
+        sa.column('id', sa.Integer),
+        sa.column('entity_name', sa.String),
+        sa.column('aliases', sa.JSON),
+    )
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(sanction.c.id, sanction.c.entity_name, sanction.c.aliases)
+            .where(sanction.c.id > last_id).order_by(sanction.c.id).limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            if row.entity_name:
+                params.append(_row(row.id, row.entity_name, 'primary', None))
+            for alias in row.aliases or []:
+                if isinstance(alias, dict) and alias.get("name"):
+                    params.append(_row(row.id, alias["name"], 'alias', alias.get("quality")))
+        if params:
+            conn.execute(sanction_name.insert(), params)
+        last_id = rows[-1].id
+
+    op.create_index(
+        'ix_sanction_name_normalized_name_trgm', 'sanction_name', ['normalized_name'],
+        unique=False, postgresql_using='gin', postgresql_ops={'normalized_name': 'gin_trgm_ops'}
+    )
+
+    # Aliases are searched through sanction_name now
+    op.drop_index('ix_sanction_normalized_aliases_trgm', table_name='sanction')
+    op.drop_column('sanction', 'normalized_aliases')
+
+
+def downgrade() -> None:
+    op.add_column('sanction', sa.Column('normalized_aliases', sa.Text(), nullable=True))
+    op.execute("""
+        UPDATE sanction SET normalized_aliases = n.aliases
+        FROM (
+            SELECT sanction_id, string_agg(normalized_name, ' | ' ORDER BY id) AS aliases
+            FROM sanction_name
+            WHERE name_type = 'alias' AND normalized_name IS NOT NULL
+            GROUP BY sanction_id
+        ) AS n
+        WHERE sanction.id = n.sanction_id
+    """)
+    op.create_index(
+        'ix_sanction_normalized_aliases_trgm', 'sanction', ['normalized_aliases'],
+        unique=False, postgresql_using='gin', postgresql_ops={'normalized_aliases': 'gin_trgm_ops'}
+    )
+    op.drop_index('ix_sanction_name_normalized_name_trgm', table_name='sanction_name')
+    op.drop_index(op.f('ix_sanction_name_sanction_id'), table_name='sanction_name')
+    op.drop_index(op.f('ix_sanction_name_id'), table_name='sanction_name')
+    op.drop_table('sanction_name')
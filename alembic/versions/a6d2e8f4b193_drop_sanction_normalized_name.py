@@ -0,0 +1,37 @@
+
+"""drop_sanction_normalized_name
+
+Revision ID: a6d2e8f4b193
+Revises: f3b8d1c6e290
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d2e8f4b193'
+down_revision = 'f3b8d1c6e290'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every search stage reads sanction_name.normalized_name; the sanction copy and its
+    # trigram index were only written
+    op.drop_index('ix_sanction_normalized_name_trgm', table_name='sanction')
+    op.drop_column('sanction', 'normalized_name')
+
+
+def downgrade() -> None:
+    op.add_column('sanction', sa.Column('normalized_name', sa.String(), nullable=True))
+    op.execute("""
+        UPDATE sanction SET normalized_name = n.normalized_name
+        FROM sanction_name AS n
+        WHERE n.sanction_id = sanction.id AND n.name_type = 'primary'
+    """)
+    op.create_index(
+        'ix_sanction_normalized_name_trgm', 'sanction', ['normalized_name'],
+        unique=False, postgresql_using='gin', postgresql_ops={'normalized_name': 'gin_trgm_ops'}
+    )
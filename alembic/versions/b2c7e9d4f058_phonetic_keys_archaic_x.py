@@ -0,0 +1,122 @@
+
+"""phonetic_keys_archaic_x
+
+Revision ID: b2c7e9d4f058
+Revises: a6d2e8f4b193
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2c7e9d4f058'
+down_revision = 'a6d2e8f4b193'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+# Frozen copy of app.services.etl.phonetics so the backfill does not change with the
+# application code. sanction_name.normalized_name is already tokenized (space separated).
+_VOWELS = set("AEIOU")
+_PARTICLES = {
+    "DE", "DEL", "LA", "LAS", "LOS", "EL", "Y", "E", "VAN", "VON", "BIN", "BINT", "AL",
+    "SA", "CV", "RL", "SC", "SAPI", "SAB", "SRL", "SPR", "AC",
+}
+
+def _code(word, archaic_x):
+    out = []
+    i, n = 0, len(word)
+    while i < n:
+        ch = word[i]
+        nxt = word[i + 1] if i + 1 < n else ""
+        after = word[i + 2] if i + 2 < n else ""
+        if ch == "C":
+            if nxt == "H":
+                out.append("X")
+                i += 2
+                continue
+            out.append("S" if nxt in ("E", "I") else "K")
+        elif ch == "Q":
+            out.append("K")
+            if nxt == "U" and after in ("E", "I"):
+                i += 1
+        elif ch == "G":
+            if nxt in ("E", "I"):
+                out.append("J")
+            else:
+                out.append("G")
+                if nxt == "U" and after in ("E", "I"):
+                    i += 1
+        elif ch == "H":
+            pass
+        elif ch in ("V", "W"):
+            out.append("B")
+        elif ch == "Z":
+            out.append("S")
+        elif ch == "X":
+            if archaic_x and nxt in _VOWELS:
+                out.append("J")
+            else:
+                out.append("S" if i == 0 else "X")
+        elif ch == "L" and nxt == "L":
+            out.append("Y")
+            i += 1
+        elif ch == "Y":
+            out.append("Y" if nxt in _VOWELS else "I")
+        else:
+            out.append(ch)
+        i += 1
+    code = []
+    for c in out:
+        if not code or code[-1] != c:
+            code.append(c)
+    return "".join(code)
+
+def _keys(normalized_name, archaic_x):
+    keys = set()
+    for t in (normalized_name or "").split():
+        if len(t) < 2 or t.isdigit() or t in _PARTICLES:
+            continue
+        keys.add(_code(t, False))
+        if archaic_x and "X" in t:
+            keys.add(_code(t, True))
+    return sorted(keys) or None
+
+def _rewrite_keys(archaic_x):
+    # Only names with an X change; the content hash does not cover phonetic_keys, so the
+    # next sync would not rewrite them
+    conn = op.get_bind()
+    sanction_name = sa.table(
+        'sanction_name',
+        sa.column('id', sa.Integer),
+        sa.column('normalized_name', sa.String),
+        sa.column('phonetic_keys', postgresql.ARRAY(sa.String)),
+    )
+    update_stmt = sanction_name.update().where(sanction_name.c.id == sa.bindparam('_id')).values(
+        phonetic_keys=sa.bindparam('_keys'),
+    )
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(sanction_name.c.id, sanction_name.c.normalized_name)
+            .where(sanction_name.c.id > last_id, sanction_name.c.normalized_name.like('%X%'))
+            .order_by(sanction_name.c.id).limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(update_stmt, [{'_id': row.id, '_keys': _keys(row.normalized_name, archaic_x)} for row in rows])
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    # Tokens with an X also get the archaic X = J key (XIMENEZ/JIMENEZ, MEXIA/MEJIA)
+    _rewrite_keys(archaic_x=True)
+
+
+def downgrade() -> None:
+    _rewrite_keys(archaic_x=False)
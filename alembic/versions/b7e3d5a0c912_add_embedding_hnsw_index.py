@@ -0,0 +1,32 @@
+
+"""add_embedding_hnsw_index
+
+Revision ID: b7e3d5a0c912
+Revises: 8a4c0e93f1d6
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e3d5a0c912'
+down_revision = '8a4c0e93f1d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Approximate nearest neighbour index for the vector stage (cosine distance, '<=>').
+    # m / ef_construction must match HNSW_M / HNSW_EF_CONSTRUCTION in app/models/sanction.py.
+    op.create_index(
+        'ix_sanction_embedding_hnsw', 'sanction', ['embedding'],
+        unique=False, postgresql_using='hnsw',
+        postgresql_ops={'embedding': 'vector_cosine_ops'},
+        postgresql_with={'m': 16, 'ef_construction': 64}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sanction_embedding_hnsw', table_name='sanction')
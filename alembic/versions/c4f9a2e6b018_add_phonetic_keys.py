@@ -0,0 +1,132 @@
+
+"""add_phonetic_keys
+
+Revision ID: c4f9a2e6b018
+Revises: b7e3d5a0c912
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f9a2e6b018'
+down_revision = 'b7e3d5a0c912'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# Frozen copies of app.services.etl.normalizer.tokenize_name and
+# app.services.etl.phonetics so the backfill does not change with the application code.
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+_VOWELS = set("AEIOU")
+_PARTICLES = {
+    "DE", "DEL", "LA", "LAS", "LOS", "EL", "Y", "E", "VAN", "VON", "BIN", "BINT", "AL",
+    "SA", "CV", "RL", "SC", "SAPI", "SAB", "SRL", "SPR", "AC",
+}
+
+def _tokens(text):
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
+    return [t for t in _NON_ALNUM.split(text.upper().strip()) if t]
+
+def _code(word):
+    out = []
+    i, n = 0, len(word)
+    while i < n:
+        ch = word[i]
+        nxt = word[i + 1] if i + 1 < n else ""
+        after = word[i + 2] if i + 2 < n else ""
+        if ch == "C":
+            if nxt == "H":
+                out.append("X")
+                i += 2
+                continue
+            out.append("S" if nxt in ("E", "I") else "K")
+        elif ch == "Q":
+            out.append("K")
+            if nxt == "U" and after in ("E", "I"):
+                i += 1
+        elif ch == "G":
+            if nxt in ("E", "I"):
+                out.append("J")
+            else:
+                out.append("G")
+                if nxt == "U" and after in ("E", "I"):
+                    i += 1
+        elif ch == "H":
+            pass
+        elif ch in ("V", "W"):
+            out.append("B")
+        elif ch == "Z":
+            out.append("S")
+        elif ch == "X":
+            out.append("S" if i == 0 else "X")
+        elif ch == "L" and nxt == "L":
+            out.append("Y")
+            i += 1
+        elif ch == "Y":
+            out.append("Y" if nxt in _VOWELS else "I")
+        else:
+            out.append(ch)
+        i += 1
+    code = []
+    for c in out:
+        if not code or code[-1] != c:
+            code.append(c)
+    return "".join(code)
+
+def _keys(names):
+    return sorted({
+        _code(t) for name in names for t in _tokens(name)
+        if len(t) >= 2 and not t.isdigit() and t not in _PARTICLES
+    })
+
+
+def upgrade() -> None:
+    op.add_column('sanction', sa.Column('phonetic_keys', postgresql.ARRAY(sa.String()), nullable=True))
+
+    # Backfill existing rows in batches
+    conn = op.get_bind()
+    sanction = sa.table(
+        'sanction',
+        sa.column('id', sa.Integer),
+        sa.column('entity_name', sa.String),
+        sa.column('aliases', sa.JSON),
+        sa.column('phonetic_keys', postgresql.ARRAY(sa.String)),
+    )
+    update_stmt = sanction.update().where(sanction.c.id == sa.bindparam('_id')).values(
+        phonetic_keys=sa.bindparam('_keys'),
+    )
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(sanction.c.id, sanction.c.entity_name, sanction.c.aliases)
+            .where(sanction.c.id > last_id).order_by(sanction.c.id).limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            names = [row.entity_name] + [
+                a.get("name") for a in (row.aliases or [])
+                if isinstance(a, dict) and a.get("name")
+            ]
+            params.append({'_id': row.id, '_keys': _keys(names)})
+        conn.execute(update_stmt, params)
+        last_id = rows[-1].id
+
+    op.create_index('ix_sanction_phonetic_keys', 'sanction', ['phonetic_keys'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sanction_phonetic_keys', table_name='sanction')
+    op.drop_column('sanction', 'phonetic_keys')
@@ -0,0 +1,80 @@
+
+"""add_sanction_name_token_set
+
+Revision ID: d81b6c3e5a27
+Revises: c4f9a2e6b018
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81b6c3e5a27'
+down_revision = 'c4f9a2e6b018'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# Frozen copy of app.services.etl.normalizer.name_token_set
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+_PARTICLES = {
+    "DE", "DEL", "LA", "LAS", "LOS", "EL", "Y", "E", "VAN", "VON", "BIN", "BINT", "AL",
+    "SA", "CV", "RL", "SC", "SAPI", "SAB", "SRL", "SPR", "AC",
+}
+
+def _token_set(text):
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
+    return sorted({t for t in _NON_ALNUM.split(text.upper().strip()) if t and t not in _PARTICLES})
+
+
+def upgrade() -> None:
+    op.add_column('sanction_name', sa.Column('tokens', postgresql.ARRAY(sa.String()), nullable=True))
+    op.add_column('sanction_name', sa.Column('token_signature', sa.String(), nullable=True))
+
+    # Backfill existing rows in batches
+    conn = op.get_bind()
+    sanction_name = sa.table(
+        'sanction_name',
+        sa.column('id', sa.Integer),
+        sa.column('name', sa.String),
+        sa.column('tokens', postgresql.ARRAY(sa.String)),
+        sa.column('token_signature', sa.String),
+    )
+    update_stmt = sanction_name.update().where(sanction_name.c.id == sa.bindparam('_id')).values(
+        tokens=sa.bindparam('_tokens'),
+        token_signature=sa.bindparam('_signature'),
+    )
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(sanction_name.c.id, sanction_name.c.name)
+            .where(sanction_name.c.id > last_id).order_by(sanction_name.c.id).limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            tokens = _token_set(row.name)
+            params.append({'_id': row.id, '_tokens': tokens or None, '_signature': " ".join(tokens) or None})
+        conn.execute(update_stmt, params)
+        last_id = rows[-1].id
+
+    op.create_index(op.f('ix_sanction_name_token_signature'), 'sanction_name', ['token_signature'], unique=False)
+    op.create_index('ix_sanction_name_tokens', 'sanction_name', ['tokens'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sanction_name_tokens', table_name='sanction_name')
+    op.drop_index(op.f('ix_sanction_name_token_signature'), table_name='sanction_name')
+    op.drop_column('sanction_name', 'token_signature')
+    op.drop_column('sanction_name', 'tokens')
@@ -0,0 +1,26 @@
+
+"""add_sanction_content_hash
+
+Revision ID: e5a9c7d3f412
+Revises: d81b6c3e5a27
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c7d3f412'
+down_revision = 'd81b6c3e5a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # No backfill: rows with a NULL hash are rewritten (and hashed) once by the next sync
+    op.add_column('sanction', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sanction', 'content_hash')
@@ -0,0 +1,129 @@
+
+"""phonetic_keys_per_name
+
+Revision ID: f3b8d1c6e290
+Revises: e5a9c7d3f412
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d1c6e290'
+down_revision = 'e5a9c7d3f412'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+# Frozen copy of app.services.etl.phonetics so the backfill does not change with the
+# application code. sanction_name.normalized_name is already tokenized (space separated).
+_VOWELS = set("AEIOU")
+_PARTICLES = {
+    "DE", "DEL", "LA", "LAS", "LOS", "EL", "Y", "E", "VAN", "VON", "BIN", "BINT", "AL",
+    "SA", "CV", "RL", "SC", "SAPI", "SAB", "SRL", "SPR", "AC",
+}
+
+def _code(word):
+    out = []
+    i, n = 0, len(word)
+    while i < n:
+        ch = word[i]
+        nxt = word[i + 1] if i + 1 < n else ""
+        after = word[i + 2] if i + 2 < n else ""
+        if ch == "C":
+            if nxt == "H":
+                out.append("X")
+                i += 2
+                continue
+            out.append("S" if nxt in ("E", "I") else "K")
+        elif ch == "Q":
+            out.append("K")
+            if nxt == "U" and after in ("E", "I"):
+                i += 1
+        elif ch == "G":
+            if nxt in ("E", "I"):
+                out.append("J")
+            else:
+                out.append("G")
+                if nxt == "U" and after in ("E", "I"):
+                    i += 1
+        elif ch == "H":
+            pass
+        elif ch in ("V", "W"):
+            out.append("B")
+        elif ch == "Z":
+            out.append("S")
+        elif ch == "X":
+            out.append("S" if i == 0 else "X")
+        elif ch == "L" and nxt == "L":
+            out.append("Y")
+            i += 1
+        elif ch == "Y":
+            out.append("Y" if nxt in _VOWELS else "I")
+        else:
+            out.append(ch)
+        i += 1
+    code = []
+    for c in out:
+        if not code or code[-1] != c:
+            code.append(c)
+    return "".join(code)
+
+def _keys(normalized_name):
+    return sorted({
+        _code(t) for t in (normalized_name or "").split()
+        if len(t) >= 2 and not t.isdigit() and t not in _PARTICLES
+    }) or None
+
+
+def upgrade() -> None:
+    # Phonetic keys move from the sanction (union of every name) to each sanction_name row,
+    # so the SQL stage matches per name or alias like the in-memory index
+    op.add_column('sanction_name', sa.Column('phonetic_keys', postgresql.ARRAY(sa.String()), nullable=True))
+
+    conn = op.get_bind()
+    sanction_name = sa.table(
+        'sanction_name',
+        sa.column('id', sa.Integer),
+        sa.column('normalized_name', sa.String),
+        sa.column('phonetic_keys', postgresql.ARRAY(sa.String)),
+    )
+    update_stmt = sanction_name.update().where(sanction_name.c.id == sa.bindparam('_id')).values(
+        phonetic_keys=sa.bindparam('_keys'),
+    )
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(sanction_name.c.id, sanction_name.c.normalized_name)
+            .where(sanction_name.c.id > last_id).order_by(sanction_name.c.id).limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(update_stmt, [{'_id': row.id, '_keys': _keys(row.normalized_name)} for row in rows])
+        last_id = rows[-1].id
+
+    op.create_index('ix_sanction_name_phonetic_keys', 'sanction_name', ['phonetic_keys'], unique=False, postgresql_using='gin')
+    op.drop_index('ix_sanction_phonetic_keys', table_name='sanction')
+    op.drop_column('sanction', 'phonetic_keys')
+
+
+def downgrade() -> None:
+    op.add_column('sanction', sa.Column('phonetic_keys', postgresql.ARRAY(sa.String()), nullable=True))
+    # The sanction-level keys were the union over its names
+    op.execute("""
+        UPDATE sanction AS s SET phonetic_keys = k.keys
+        FROM (
+            SELECT n.sanction_id, array_agg(DISTINCT key ORDER BY key) AS keys
+            FROM sanction_name AS n, unnest(n.phonetic_keys) AS key
+            GROUP BY n.sanction_id
+        ) AS k
+        WHERE k.sanction_id = s.id
+    """)
+    op.create_index('ix_sanction_phonetic_keys', 'sanction', ['phonetic_keys'], unique=False, postgresql_using='gin')
+    op.drop_index('ix_sanction_name_phonetic_keys', table_name='sanction_name')
+    op.drop_column('sanction_name', 'phonetic_keys')
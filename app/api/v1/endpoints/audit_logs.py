@@ -14,7 +14,7 @@ router = APIRouter()
 async def read_audit_logs(
     skip: int = 0,
     limit: int = 50,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_active_privileged_user),
 ) -> Any:
     """
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.entity import EntityDocument
 from app.schemas.entity_schema import Entity, EntityCreate
 from app.services.etl.tasks import process_entity_data
@@ -13,7 +13,7 @@ router = APIRouter()
 
 @router.get("/", response_model=List[Entity])
 async def read_entities(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from typing import Any
 import logging
 
 from app.api import deps
-from app.services.xml_handler import parse_un_sanctions_xml
-from app.models.sanction import Sanction
+from app.services.xml_handler import iter_un_sanctions_xml
+from app.services.dataset_version import bump_dataset_version
+from app.services.sanction_loader import has_changes, load_sanctions
+from app.services.sanction_service import UN_SOURCE
 from app.db.base import Base # Assuming session dependency provides db
 
 router = APIRouter()
@@ -24,46 +25,28 @@ async def upload_sanctions_xml(
     if not file.filename.endswith('.xml'):
         raise HTTPException(status_code=400, detail="File must be an XML file")
     
-    contents = await file.read()
-    
     try:
-        parsed_data = parse_un_sanctions_xml(contents)
+        # Parsed incrementally from the spooled upload and bulk-loaded (COPY + one upsert).
+        # Additive: records missing from the file are kept.
+        result = await load_sanctions(
+            db, iter_un_sanctions_xml(file.file), source=UN_SOURCE, delete_missing=False
+        )
+        await db.commit()
     except ValueError as e:
+        await db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
-    
-    count_created = 0
-    count_updated = 0
-    
-    for item in parsed_data:
-        # Check if exists by data_id
-        data_id = item.get("data_id")
-        existing_sanction = None
-        
-        if data_id:
-            result = await db.execute(select(Sanction).filter(Sanction.data_id == data_id))
-            existing_sanction = result.scalars().first()
-            
-        if existing_sanction:
-            # Update fields
-            for key, value in item.items():
-                setattr(existing_sanction, key, value)
-            count_updated += 1
-        else:
-            # Create new
-            new_sanction = Sanction(**item)
-            db.add(new_sanction)
-            count_created += 1
-            
-    try:
-        await db.commit()
     except Exception as e:
         logger.error(f"Database commit error: {e}")
         await db.rollback()
         raise HTTPException(status_code=500, detail="Error saving data to database")
+
+    if has_changes(result):
+        await bump_dataset_version()
         
     return {
         "message": "XML processed successfully",
-        "total_processed": len(parsed_data),
-        "created": count_created,
-        "updated": count_updated
+        "total_processed": result["total_active"],
+        "created": result["created"],
+        "updated": result["updated"],
+        "unchanged": result["unchanged"]
     }
@@ -1,59 +1,269 @@
-from typing import Any, List, Dict
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Any, List, Dict, Optional
+from datetime import date
+import asyncio
+import json
+import logging
+import time
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
-from app.services.search_service import search_sanctions
+from app.core.config import settings
+from app.core.metrics import span
+from app.services.search_service import group_by_profile, iter_expanded_clusters, search_matches, search_sanctions, search_sanctions_page
 from app.models.sanction import Sanction
-from app.services.langchain_service import analyze_search_results
+from app.services.summary_service import generate_summary, get_summary, request_summary
+from app.services.batch_screening_service import screen_names
+from app.services.embedding_service import embedding_cache_stats
+from app.services.search_cache import search_cache_stats
+from app.schemas.search_schema import BatchScreeningRequest, BatchScreeningResponse, SanctionMatch
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def _serialize(s: SanctionMatch) -> Dict[str, Any]:
+    return {
+        "id": s.id,
+        "entity_name": s.entity_name,
+        "reference_number": s.reference_number,
+        "program": s.program,
+        "source": s.source,
+        "score": s.score
+    }
+
+async def _audit_search(db: AsyncSession, request: Request, user_id: Any, query: str, details: Dict[str, Any], action: str = "SEARCH_SANCTIONS"):
+    try:
+        from app.services.audit_service import log_search
+        with span("audit_log"):
+            await log_search(
+                db=db,
+                user_id=user_id,
+                query=query,
+                ip_address=request.client.host if request.client else "unknown",
+                details=details,
+                action=action
+            )
+    except Exception as e:
+        # Do not fail the search if logging fails, but log the error
+        logger.error(f"Failed to log search ({action}): {e}")
+
 @router.get("/sanctions", response_model=Dict[str, Any])
 async def search_sanctions_endpoint(
     request: Request,
+    background_tasks: BackgroundTasks,
     q: str = Query(..., min_length=2, description="Search query (name, reference, etc.)"),
     limit: int = Query(10, le=50),
-    db: AsyncSession = Depends(deps.get_db),
+    threshold: float = Query(settings.SEARCH_MATCH_THRESHOLD, ge=0, le=1, description="Minimum match score"),
+    birth_date: Optional[date] = Query(None, description="Customer birth date, used to confirm or discard matches"),
+    nationality: Optional[str] = Query(None),
+    rfc: Optional[str] = Query(None),
+    db: AsyncSession = Depends(deps.get_read_db),
+    audit_db: AsyncSession = Depends(deps.get_db), # Primary, shared with authentication
     current_user: Any = Depends(deps.get_current_active_user)
 ) -> Any:
     """
     Search for sanctioned entities using hybrid search (Exact, Fuzzy, Vector).
-    Returns a summary analysis and the list of results.
+    Returns the list of results sorted by match score (members of the same
+    EntityProfile are contiguous) and the results grouped per profile.
+    The LLM summary is not awaited: the response carries a summary_id to fetch it from
+    /summaries/{summary_id} (or its SSE stream); cached summaries are returned inline.
     """
-    results = await search_sanctions(db=db, query=q, limit=limit)
+    search_stats: Dict[str, Any] = {}
+    results = await search_sanctions(
+        db=db, query=q, limit=limit, threshold=threshold,
+        birth_date=birth_date, nationality=nationality, rfc=rfc, stats=search_stats
+    )
     
-    # Audit Logging
-    try:
-        from app.services.audit_service import log_search
-        await log_search(
-            db=db,
-            user_id=current_user.id,
-            query=q,
-            ip_address=request.client.host if request.client else "unknown",
-            details={"limit": limit, "results_count": len(results)}
-        )
-    except Exception as e:
-        # Do not fail the search if logging fails, but log the error
-        print(f"Failed to log search: {e}")
-        pass
+    await _audit_search(
+        audit_db, request, current_user.id, q,
+        {
+            "limit": limit, "threshold": threshold, "results_count": len(results),
+            # True when the negative pre-check answered without running the search
+            "negative_filter": search_stats.get("negative_filter", False)
+        }
+    )
     
     # Simple serialization
-    serialized = []
-    for s in results:
-        serialized.append({
-            "id": s.id,
-            "entity_name": s.entity_name,
-            "reference_number": s.reference_number,
-            "program": s.program,
-            "source": s.source,
-            "score": "N/A" # TODO: Return match score
-        })
-
-    # Analyze with LangChain
-    summary = await analyze_search_results(query=q, results=serialized)
+    serialized = [_serialize(s) for s in results]
+
+    # LLM summary runs after the response is sent, cached by (query, result ids)
+    with span("summary_request"):
+        summary = await request_summary(query=q, results=serialized)
+    if summary["generate"]:
+        background_tasks.add_task(generate_summary, summary["summary_id"], q, serialized)
         
     return {
         "query": q,
-        "summary": summary,
-        "results": serialized
+        "summary_id": summary["summary_id"],
+        "summary_status": summary["status"],
+        "summary": summary["summary"],
+        "results": serialized,
+        "profiles": [p.model_dump(mode="json") for p in group_by_profile(results)]
+    }
+
+@router.get("/sanctions/page", response_model=Dict[str, Any])
+async def search_sanctions_page_endpoint(
+    request: Request,
+    q: str = Query(..., min_length=2, description="Search query (name, reference, etc.)"),
+    page_size: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    threshold: float = Query(settings.SEARCH_MATCH_THRESHOLD, ge=0, le=1, description="Minimum match score"),
+    birth_date: Optional[date] = Query(None),
+    nationality: Optional[str] = Query(None),
+    rfc: Optional[str] = Query(None),
+    db: AsyncSession = Depends(deps.get_read_db),
+    audit_db: AsyncSession = Depends(deps.get_db), # Primary, shared with authentication
+    current_user: Any = Depends(deps.get_current_active_user)
+) -> Any:
+    """
+    Cursor-paginated search (up to SEARCH_MAX_RESULTS matches) for deep investigations.
+    Pages follow the score order; pass next_cursor to get the following page. No LLM summary.
+    `truncated` is true when the search hit SEARCH_MAX_RESULTS: lower-scored matches
+    are not reachable by paging, narrow the query or raise the threshold.
+    """
+    search_stats: Dict[str, Any] = {}
+    try:
+        page, next_cursor, truncated = await search_sanctions_page(
+            db=db, query=q, page_size=page_size, cursor=cursor, threshold=threshold,
+            birth_date=birth_date, nationality=nationality, rfc=rfc, stats=search_stats
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    await _audit_search(
+        audit_db, request, current_user.id, q,
+        {
+            "page_size": page_size, "threshold": threshold, "cursor": cursor, "results_count": len(page),
+            "negative_filter": search_stats.get("negative_filter", False)
+        },
+        action="SEARCH_SANCTIONS_PAGE"
+    )
+    return {
+        "query": q,
+        "results": [_serialize(s) | {"profile_id": str(s.profile_id) if s.profile_id else None, "stages": s.stages} for s in page],
+        "next_cursor": next_cursor,
+        "truncated": truncated
+    }
+
+@router.get("/sanctions/stream")
+async def stream_search_sanctions_endpoint(
+    request: Request,
+    q: str = Query(..., min_length=2, description="Search query (name, reference, etc.)"),
+    max_results: int = Query(settings.SEARCH_MAX_RESULTS, ge=1, le=settings.SEARCH_MAX_RESULTS),
+    threshold: float = Query(settings.SEARCH_MATCH_THRESHOLD, ge=0, le=1, description="Minimum match score"),
+    birth_date: Optional[date] = Query(None),
+    nationality: Optional[str] = Query(None),
+    rfc: Optional[str] = Query(None),
+    db: AsyncSession = Depends(deps.get_read_db),
+    audit_db: AsyncSession = Depends(deps.get_db), # Primary, shared with authentication
+    current_user: Any = Depends(deps.get_current_active_user)
+) -> Any:
+    """
+    Streams every match as NDJSON (one JSON object per line) in score order, for bulk
+    investigations and exports. Candidates are hydrated with projected columns only.
+    Matches are scored up front (the order needs every score); cluster expansion and
+    serialization run chunk by chunk while the response is written, not cached.
+    """
+    search_stats: Dict[str, Any] = {}
+    matches = await search_matches(
+        db=db, query=q, limit=max_results, threshold=threshold,
+        birth_date=birth_date, nationality=nationality, rfc=rfc, stats=search_stats
+    )
+    await _audit_search(
+        audit_db, request, current_user.id, q,
+        {
+            # Scored matches, before cluster siblings are added to the stream
+            "max_results": max_results, "threshold": threshold, "matches_count": len(matches),
+            "negative_filter": search_stats.get("negative_filter", False)
+        },
+        action="SEARCH_SANCTIONS_STREAM"
+    )
+
+    async def lines():
+        # The read session is a request-scoped dependency, still open while the body streams
+        async for chunk in iter_expanded_clusters(db, matches):
+            yield "".join(s.model_dump_json(exclude={"fused_score"}) + "\n" for s in chunk)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.post("/sanctions/batch", response_model=BatchScreeningResponse)
+async def batch_screen_sanctions_endpoint(
+    request: Request,
+    batch_in: BatchScreeningRequest,
+    db: AsyncSession = Depends(deps.get_read_db),
+    audit_db: AsyncSession = Depends(deps.get_db), # Primary, shared with authentication
+    current_user: Any = Depends(deps.get_current_active_user)
+) -> Any:
+    """
+    Screen a batch of names (optionally with RFC and birth date) in a single request.
+    Intended for bulk KYC jobs: one DB session, one audit entry and no LLM summary.
+    """
+    results = await screen_names(db=db, items=batch_in.items, limit=batch_in.limit, threshold=batch_in.threshold)
+    matched = sum(1 for r in results if r.hits)
+
+    await _audit_search(
+        audit_db, request, current_user.id, f"batch:{len(batch_in.items)}",
+        {"limit": batch_in.limit, "items_count": len(batch_in.items), "matched_count": matched},
+        action="SEARCH_SANCTIONS_BATCH"
+    )
+
+    return {
+        "total": len(results),
+        "matched": matched,
+        "results": results
+    }
+
+@router.get("/summaries/{summary_id}", response_model=Dict[str, Any])
+async def get_search_summary_endpoint(
+    summary_id: str,
+    current_user: Any = Depends(deps.get_current_active_user)
+) -> Any:
+    """
+    Status ("pending", "ready" or "error") and text of a search summary.
+    """
+    record = await get_summary(summary_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Summary not found or expired")
+    return {"summary_id": summary_id, **record}
+
+@router.get("/summaries/{summary_id}/stream")
+async def stream_search_summary_endpoint(
+    summary_id: str,
+    current_user: Any = Depends(deps.get_current_active_user)
+) -> Any:
+    """
+    Server-sent events: emits a "summary" event once the summary is ready (or failed),
+    then closes. Emits "timeout" after SUMMARY_STREAM_TIMEOUT_SECONDS.
+    """
+    if await get_summary(summary_id) is None:
+        raise HTTPException(status_code=404, detail="Summary not found or expired")
+
+    async def events():
+        deadline = time.monotonic() + settings.SUMMARY_STREAM_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            record = await get_summary(summary_id)
+            if record is None or record["status"] != "pending":
+                payload = {"summary_id": summary_id, **(record or {"status": "error", "summary": None})}
+                yield f"event: summary\ndata: {json.dumps(payload)}\n\n"
+                return
+            yield ": pending\n\n" # Keeps proxies from closing the idle connection
+            await asyncio.sleep(0.5)
+        yield f"event: timeout\ndata: {json.dumps({'summary_id': summary_id})}\n\n"
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/cache/stats", response_model=Dict[str, Any])
+async def search_cache_stats_endpoint(
+    current_user: Any = Depends(deps.get_current_active_privileged_user)
+) -> Any:
+    """
+    Hit/miss counters of the search caches in this API process.
+    """
+    return {
+        "embedding": embedding_cache_stats(),
+        "results": search_cache_stats()
     }
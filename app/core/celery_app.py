@@ -12,17 +12,18 @@ celery_app.conf.task_routes = {
 # Import tasks to ensure registration
 import app.tasks.sanctions_tasks
 
+# Hourly polling: the tasks send conditional GETs and skip parsing/DB work when a file is unchanged
 celery_app.conf.beat_schedule = {
-    "sync-un-sanctions-monthly": {
+    "sync-un-sanctions-hourly": {
         "task": "sync_un_sanctions_task",
-        "schedule": crontab(day_of_month="1", hour=0, minute=0), # Run at midnight on the 1st of every month
+        "schedule": crontab(minute=0), # Every hour at :00
     },
-    "sync-mex-sanctions-monthly": {
+    "sync-mex-sanctions-hourly": {
         "task": "sync_mex_sanctions_task",
-        "schedule": crontab(day_of_month="1", hour=0, minute=30), # Run at 00:30 on the 1st of every month
+        "schedule": crontab(minute=20), # Every hour at :20
     },
-    "sync-sat-sanctions-monthly": {
+    "sync-sat-sanctions-hourly": {
         "task": "sync_sat_sanctions_task",
-        "schedule": crontab(day_of_month="1", hour=1, minute=0), # Run at 01:00 on the 1st of every month
+        "schedule": crontab(minute=40), # Every hour at :40
     },
 }
@@ -37,16 +37,62 @@ class Settings(BaseSettings):
             return v
         return f"postgresql+asyncpg://{values.get('POSTGRES_USER')}:{values.get('POSTGRES_PASSWORD')}@{values.get('POSTGRES_SERVER')}/{values.get('POSTGRES_DB')}"
 
+    SQLALCHEMY_READ_DATABASE_URI: Union[str, None] = None # Read replica for search/listings; unset = primary
+    READ_REPLICA_MAX_LAG_SECONDS: float = 30.0 # Above this, reads fall back to the primary
+    READ_REPLICA_LAG_CHECK_SECONDS: float = 5.0 # Lag probe interval per process
+    READ_REPLICA_MAX_SILENCE_SECONDS: float = 75.0 # No WAL/keepalive from the primary for this long = stale (idle keepalives every wal_sender_timeout/2)
+
     # REDIS
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_SOCKET_TIMEOUT: float = 2.0
 
     # OPENAI
     OPENAI_API_KEY: str = "sk-placeholder"
+    EMBEDDING_PROVIDER: str = "openai" # openai, local (offline hashed char n-grams)
+    EMBEDDING_MODEL: str = "text-embedding-ada-002"
+    EMBEDDING_DIMENSION: int = 1536 # Must match the Vector(1536) columns
+    RAG_EMBEDDING_MODEL: str = "text-embedding-3-small"
+    EMBEDDING_CACHE_SIZE: int = 4096 # In-process LRU entries
+    EMBEDDING_CACHE_TTL_SECONDS: int = 30 * 24 * 3600 # Redis tier
 
     # Sanctions
     UN_SANCTIONS_XML_URL: str = "https://scsanctions.un.org/resources/xml/sp/consolidated.xml"
     MEX_SANCTIONS_CSV_URL: str = "https://repodatos.atdt.gob.mx/api_update/sabg/servidores_publicos_sancionados_vigentes/sancionados_102025_sabg.csv"
     SAT_69B_CSV_URL: str = "http://omawww.sat.gob.mx/cifras_sat/Documents/Listado_Completo_69-B.csv"
+    SANCTIONS_CACHE_DIR: str = "/tmp/pld_sanctions_cache" # Last synced raw file + ETag/Last-Modified/SHA-256 per source
+
+    # SEARCH
+    NAME_INDEX_ENABLED: bool = True # In-memory name index for exact/fuzzy candidates
+    NAME_INDEX_RETRY_SECONDS: float = 5.0 # First retry delay after a failed index build, doubled per failure
+    NAME_INDEX_RETRY_MAX_SECONDS: float = 300.0 # Cap of that backoff
+    NAME_INDEX_FUZZY_THRESHOLD: float = 0.3 # Trigram similarity cut-off; also set as pg_trgm.similarity_threshold for the SQL '%' operator
+    SEARCH_FUZZY_WORD_THRESHOLD: float = 0.6 # pg_trgm.word_similarity_threshold for the SQL '<%' operator (partial queries)
+    NEGATIVE_FILTER_ENABLED: bool = True # Exact token-similarity bound that answers clean screens without DB/OpenAI (needs the name index)
+    PROFILE_MAP_ENABLED: bool = True # In-memory EntityProfile membership for cluster expansion
+    PROFILE_MAP_RETRY_SECONDS: float = 5.0 # First retry delay after a failed map build, doubled per failure
+    PROFILE_MAP_RETRY_MAX_SECONDS: float = 300.0 # Cap of that backoff
+    DATASET_VERSION_POLL_SECONDS: float = 5.0
+    BATCH_SCREENING_MAX_ITEMS: int = 10000
+    SEARCH_CANDIDATE_DEPTH: int = 50 # Candidates per stage considered for fusion
+    SEARCH_RRF_K: int = 60 # Reciprocal rank fusion constant
+    SEARCH_WEIGHT_EXACT: float = 1.5
+    SEARCH_WEIGHT_TOKEN: float = 1.5 # Same words in any order (surname-first inputs)
+    SEARCH_WEIGHT_FUZZY: float = 1.0
+    SEARCH_WEIGHT_PHONETIC: float = 1.0
+    SEARCH_WEIGHT_VECTOR: float = 0.5 # Vector search always returns neighbours, so it weighs less
+    SEARCH_MATCH_THRESHOLD: float = 0.6 # Minimum normalized match score returned by search
+    SEARCH_MAX_RESULTS: int = 1000 # Depth of paginated and streamed searches
+    SEARCH_CACHE_ENABLED: bool = True # Result cache keyed by query, parameters and dataset version
+    SEARCH_CACHE_SIZE: int = 2048 # In-process LRU entries
+    SEARCH_CACHE_TTL_SECONDS: int = 24 * 3600 # Redis tier
+    SUMMARY_CACHE_TTL_SECONDS: int = 7 * 24 * 3600 # LLM summaries keyed by (query, result ids)
+    SUMMARY_PENDING_TTL_SECONDS: int = 120 # Pending/error markers; bounds a stuck generation
+    SUMMARY_STREAM_TIMEOUT_SECONDS: float = 60.0
+    HNSW_EF_SEARCH: int = 100 # Per-query candidate list, set with SET LOCAL hnsw.ef_search
+
+    # Observability
+    METRICS_ENABLED: bool = True # Exposes /metrics (Prometheus text format, per worker)
+    SERVER_TIMING_ENABLED: bool = False # Adds per-stage Server-Timing headers to API responses
 
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -0,0 +1,76 @@
+from typing import Dict, List, Optional, Sequence
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Upper bounds in seconds; +Inf is implicit
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """
+    Minimal labelled histogram (one label) exported in the Prometheus text format.
+    Values are per process; each API worker exposes its own.
+    """
+
+    def __init__(self, name: str, description: str, label: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label = label
+        self.buckets = tuple(buckets)
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+
+    def observe(self, label_value: str, seconds: float):
+        counts = self._counts.get(label_value)
+        if counts is None:
+            counts = self._counts[label_value] = [0] * (len(self.buckets) + 1)
+            self._sums[label_value] = 0.0
+        counts[bisect_left(self.buckets, seconds)] += 1
+        self._sums[label_value] += seconds
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for value in sorted(self._counts):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), self._counts[value]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{self.label}="{value}",le="{le}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{self.label}="{value}"}} {self._sums[value]:.6f}')
+            lines.append(f'{self.name}_count{{{self.label}="{value}"}} {cumulative}')
+        return lines
+
+SEARCH_STAGE_SECONDS = Histogram(
+    "search_stage_duration_seconds", "Duration of search pipeline stages.", "stage"
+)
+
+# Per-request stage timings (milliseconds) for the Server-Timing header
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+def start_request_timings() -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+    _request_timings.set(timings)
+    return timings
+
+@contextmanager
+def span(stage: str):
+    """
+    Times a block (including awaits inside it) into SEARCH_STAGE_SECONDS and,
+    inside an instrumented request, into its Server-Timing entries.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        SEARCH_STAGE_SECONDS.observe(stage, elapsed)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed * 1000
+
+def server_timing_header(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{stage};dur={ms:.1f}" for stage, ms in timings.items())
+
+def render_metrics() -> str:
+    return "\n".join(SEARCH_STAGE_SECONDS.render()) + "\n"
@@ -0,0 +1,25 @@
+import asyncio
+from typing import Optional
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+_client: Optional[redis.Redis] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_redis() -> redis.Redis:
+    """
+    Returns a process-wide async Redis client bound to the running event loop.
+    Celery tasks run each job in a fresh loop (asyncio.run), so the client is
+    recreated whenever the loop changes instead of reusing dead connections.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        )
+        _client_loop = loop
+    return _client
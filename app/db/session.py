@@ -1,14 +1,112 @@
+import logging
+import time
+from typing import Optional
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI, future=True, echo=settings.DEBUG)
 
 async_session = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Optional streaming replica for read-only traffic (search, listings, RAG retrieval).
+# Without SQLALCHEMY_READ_DATABASE_URI every read goes to the primary.
+read_engine = (
+    create_async_engine(settings.SQLALCHEMY_READ_DATABASE_URI, future=True, echo=settings.DEBUG)
+    if settings.SQLALCHEMY_READ_DATABASE_URI else engine
+)
+
+# info["replica"] marks sessions that may return rows older than the primary
+async_read_session = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False,
+    info={"replica": read_engine is not engine}
+)
+
+# Seconds the replica is behind the primary; 0 on a primary, and 0 when it has replayed
+# everything it received (an idle primary does not make it look stale) while its WAL
+# receiver is streaming and heard from the primary within :max_silence seconds.
+# NULL (unusable) when streaming stopped or went silent: receive = replay then too, but
+# the replica may be arbitrarily stale. Reading pg_stat_wal_receiver needs superuser or
+# pg_read_all_stats; without it status reads NULL and the replica is never used.
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN r.status IS DISTINCT FROM 'streaming' THEN NULL
+        WHEN r.last_msg_receipt_time IS NULL
+            OR now() - r.last_msg_receipt_time > make_interval(secs => :max_silence) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    FROM (SELECT 1) AS one
+    LEFT JOIN pg_stat_wal_receiver AS r ON true
+""")
+
+_replica_usable: bool = True
+_lag_checked_at: float = float("-inf")
+
+async def replica_lag() -> Optional[float]:
+    """
+    Lag in seconds (see REPLICA_LAG_SQL); None when the replica is not streaming.
+    """
+    async with read_engine.connect() as conn:
+        lag = (await conn.execute(REPLICA_LAG_SQL, {"max_silence": settings.READ_REPLICA_MAX_SILENCE_SECONDS})).scalar()
+    return float(lag) if lag is not None else None
+
+async def get_read_session_factory() -> sessionmaker:
+    """
+    Session factory for read-only work: the replica while its lag is under
+    READ_REPLICA_MAX_LAG_SECONDS, otherwise (or if it is unreachable) the primary.
+    The lag is checked at most every READ_REPLICA_LAG_CHECK_SECONDS per process.
+    """
+    global _replica_usable, _lag_checked_at
+    if read_engine is engine:
+        return async_session
+
+    now = time.monotonic()
+    if now - _lag_checked_at >= settings.READ_REPLICA_LAG_CHECK_SECONDS:
+        _lag_checked_at = now
+        try:
+            lag = await replica_lag()
+        except Exception as e:
+            logger.warning(f"Read replica unreachable, using the primary: {e}")
+            lag = None
+        usable = lag is not None and lag <= settings.READ_REPLICA_MAX_LAG_SECONDS
+        if usable != _replica_usable:
+            logger.warning(f"Read replica {'back in use' if usable else 'bypassed'} (lag: {lag})")
+        _replica_usable = usable
+
+    return async_read_session if _replica_usable else async_session
+
+async def read_is_current(db: AsyncSession) -> bool:
+    """
+    Whether rows read through `db` reflect every commit the primary had when the replica
+    was last heard from: always for primary sessions, for replica sessions only while the
+    replica reports no lag (checked now, on the session's own connection).
+    """
+    if not db.info.get("replica"):
+        return True
+    try:
+        lag = (await db.execute(REPLICA_LAG_SQL, {"max_silence": settings.READ_REPLICA_MAX_SILENCE_SECONDS})).scalar()
+    except Exception as e:
+        logger.warning(f"Could not check read replica lag: {e}")
+        return False
+    return lag is not None and float(lag) == 0
+
 async def get_db():
     async with async_session() as session:
         yield session
+
+async def get_read_db():
+    """
+    Read-only session (replica with lag guard, see get_read_session_factory).
+    Writes such as audit entries must keep using get_db.
+    """
+    factory = await get_read_session_factory()
+    async with factory() as session:
+        yield session
@@ -1,12 +1,36 @@
+import logging
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.core.config import settings
+from app.core.metrics import render_metrics, server_timing_header, start_request_timings
 from app.api.v1.api import api_router
+from app.services.name_index import refresh_name_index
+from app.services.profile_map import refresh_profile_map
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the in-memory name index; search falls back to SQL if this fails
+    if settings.NAME_INDEX_ENABLED:
+        try:
+            await refresh_name_index()
+        except Exception as e:
+            logger.error(f"Could not build name index at startup: {e}")
+    if settings.PROFILE_MAP_ENABLED:
+        try:
+            await refresh_profile_map()
+        except Exception as e:
+            logger.error(f"Could not build profile map at startup: {e}")
+    yield
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Set all CORS enabled origins
@@ -19,8 +43,23 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+if settings.SERVER_TIMING_ENABLED:
+    @app.middleware("http")
+    async def server_timing(request: Request, call_next):
+        # Spans recorded while handling the request land in this dict (shared through the ContextVar)
+        timings = start_request_timings()
+        response = await call_next(request)
+        if timings:
+            response.headers["Server-Timing"] = server_timing_header(timings)
+        return response
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/")
 def root():
     return {"message": "Welcome to PLD-FT Backend API"}
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
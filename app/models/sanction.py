@@ -1,11 +1,22 @@
-from sqlalchemy import Column, Integer, String, Date, JSON, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, JSON, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+# HNSW build parameters of ix_sanction_embedding_hnsw, as created by migration b7e3d5a0c912.
+# Changing them needs a new migration that rebuilds the index.
+HNSW_M = 16 # Graph degree
+HNSW_EF_CONSTRUCTION = 64 # Build-time candidate list
 
 class Sanction(Base):
+    __table_args__ = (
+        Index("ix_sanction_embedding_hnsw", "embedding",
+              postgresql_using="hnsw", postgresql_ops={"embedding": "vector_cosine_ops"},
+              postgresql_with={"m": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION}),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     entity_name = Column(String, index=True) # Mapped from FIRST_NAME + SECOND_NAME etc
+    # Names and aliases are searched through the sanction_name table
     
     # Entity Clustering
     profile_id = Column(UUID(as_uuid=True), ForeignKey("entity_profile.id"), nullable=True, index=True)
@@ -37,6 +48,8 @@ class Sanction(Base):
     source = Column(String, default="UN_CONSOLIDATED") 
     sanction_date = Column(Date, nullable=True) # Kept for compatibility, can mirror listed_on
     last_updated = Column(Date, nullable=True) # LAST_DAY_UPDATED
+    # SHA-256 of the parsed record (sanction_loader.content_hash); syncs skip rows whose hash is unchanged
+    content_hash = Column(String(64), nullable=True)
     
     # Vector Search
     from pgvector.sqlalchemy import Vector
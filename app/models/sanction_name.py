@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.db.base import Base
+
+class SanctionName(Base):
+    """
+    One row per primary name or alias of a Sanction, so every name is indexable.
+    """
+    __tablename__ = "sanction_name"
+    __table_args__ = (
+        Index("ix_sanction_name_normalized_name_trgm", "normalized_name",
+              postgresql_using="gin", postgresql_ops={"normalized_name": "gin_trgm_ops"}),
+        Index("ix_sanction_name_tokens", "tokens", postgresql_using="gin"),
+        Index("ix_sanction_name_phonetic_keys", "phonetic_keys", postgresql_using="gin"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    sanction_id = Column(Integer, ForeignKey("sanction.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String, nullable=False) # As published
+    normalized_name = Column(String, nullable=True) # normalize_name(); NULL for non-Latin scripts
+    name_type = Column(String, nullable=False, default="primary") # primary, alias
+    quality = Column(String, nullable=True) # Alias QUALITY (Good, Low)
+    script = Column(String, nullable=True) # LATIN, ARABIC, CYRILLIC, ...
+    # Order-insensitive forms (normalizer.name_token_set): token set for '@>' and its sorted signature
+    tokens = Column(ARRAY(String), nullable=True)
+    token_signature = Column(String, nullable=True, index=True)
+    # Spanish phonetic codes of the name's tokens (etl.phonetics), GIN indexed for '&&'
+    phonetic_keys = Column(ARRAY(String), nullable=True)
@@ -0,0 +1,58 @@
+from typing import List, Optional
+from datetime import date
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+class ScreeningItem(BaseModel):
+    name: str = Field(..., min_length=2)
+    rfc: Optional[str] = None
+    birth_date: Optional[date] = None
+
+class BatchScreeningRequest(BaseModel):
+    items: List[ScreeningItem] = Field(..., min_length=1, max_length=settings.BATCH_SCREENING_MAX_ITEMS)
+    limit: int = Field(5, ge=1, le=50) # Max hits per input
+    threshold: float = Field(settings.SEARCH_MATCH_THRESHOLD, ge=0, le=1) # Minimum match score
+
+class ScreeningHit(BaseModel):
+    id: int
+    entity_name: Optional[str] = None
+    reference_number: Optional[str] = None
+    program: Optional[str] = None
+    source: Optional[str] = None
+    score: float
+    stage: str # exact, token, fuzzy, phonetic, rfc
+    rfc_match: bool = False
+    birth_date_match: Optional[bool] = None # None when either side has no birth date
+
+class ScreeningResult(BaseModel):
+    index: int
+    name: str
+    hits: List[ScreeningHit]
+
+class BatchScreeningResponse(BaseModel):
+    total: int
+    matched: int
+    results: List[ScreeningResult]
+
+class SanctionMatch(BaseModel):
+    id: int
+    entity_name: Optional[str] = None
+    reference_number: Optional[str] = None
+    program: Optional[str] = None
+    source: Optional[str] = None
+    profile_id: Optional[UUID] = None
+    score: float = 0.0 # Normalized match score in [0, 1]
+    fused_score: float = 0.0 # Reciprocal rank fusion score used to pick candidates
+    stages: List[str] = [] # Candidate stages that produced the row: exact, token, fuzzy, phonetic, vector, cluster
+
+    class Config:
+        from_attributes = True
+
+class ProfileMatch(BaseModel):
+    profile_id: Optional[UUID] = None # None for sanctions not linked to a profile
+    primary_name: Optional[str] = None
+    score: float = 0.0 # Best match score in the group
+    sanction_ids: List[int] = []
+    sources: List[str] = []
@@ -10,7 +10,8 @@ async def log_search(
     user_id: int, 
     query: str, 
     ip_address: str, 
-    details: Dict[str, Any] = None
+    details: Dict[str, Any] = None,
+    action: str = "SEARCH_SANCTIONS"
 ) -> AuditLog:
     """
     Logs a search action.
@@ -23,7 +24,7 @@ async def log_search(
     
     log_entry = AuditLog(
         user_id=user_id,
-        action="SEARCH_SANCTIONS",
+        action=action,
         details=details
     )
     db.add(log_entry)
@@ -0,0 +1,182 @@
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy import Integer, String, any_, bindparam, or_, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.sanction import Sanction
+from app.schemas.search_schema import ScreeningHit, ScreeningItem, ScreeningResult
+from app.services.etl.normalizer import name_token_set, normalize_name
+from app.services.etl.phonetics import phonetic_keys, phonetic_min_shared
+from app.services.name_index import NameIndex, get_current_name_index
+from app.services.match_scoring import birth_date_agrees, rfc_agrees, score_candidates
+from app.services.search_service import set_trgm_thresholds
+
+logger = logging.getLogger(__name__)
+
+# (item index, sanction id, score, stage)
+Candidate = Tuple[int, int, float, str]
+
+# Set-based fallback when the name index is not loaded: one statement for the whole batch.
+# Mirrors NameIndex.lookup: exact (substring), token (every query token in any order),
+# fuzzy (trigram '%') and phonetic (2+ shared keys within one name) candidates over
+# sanction_name (every name and alias), at most :k per stage; a sanction keeps its
+# first stage in that order and the best :k win. Token sets and phonetic keys are passed
+# space-joined, since unnest cannot take ragged arrays.
+BATCH_CANDIDATES_SQL = text("""
+    SELECT q.idx, c.id, c.score, c.stage
+    FROM unnest(
+        CAST(:idx AS integer[]), CAST(:names AS text[]), CAST(:token_sets AS text[]), CAST(:key_sets AS text[]),
+        CAST(:min_shared AS integer[])
+    ) AS q(idx, name, token_set, key_set, min_shared)
+    CROSS JOIN LATERAL (
+        SELECT string_to_array(q.token_set, ' ')::varchar[] AS tokens,
+               string_to_array(q.key_set, ' ')::varchar[] AS keys
+    ) AS a
+    CROSS JOIN LATERAL (
+        SELECT d.id, d.score, d.stage
+        FROM (
+            SELECT DISTINCT ON (u.id) u.id, u.score, u.stage, u.priority, u.rank_key
+            FROM (
+                (SELECT n.sanction_id AS id, 1.0::float8 AS score, 'exact' AS stage, 1 AS priority,
+                        max(similarity(n.normalized_name, q.name))::float8 AS rank_key
+                 FROM sanction_name AS n
+                 WHERE n.normalized_name LIKE '%' || q.name || '%'
+                 GROUP BY n.sanction_id ORDER BY rank_key DESC LIMIT :k)
+                UNION ALL
+                (SELECT n.sanction_id, max(cardinality(a.tokens)::float8 / greatest(cardinality(n.tokens), 1)), 'token', 2,
+                        max(cardinality(a.tokens)::float8 / greatest(cardinality(n.tokens), 1))
+                 FROM sanction_name AS n
+                 WHERE cardinality(a.tokens) >= 2 AND n.tokens @> a.tokens
+                 GROUP BY n.sanction_id ORDER BY 5 DESC LIMIT :k)
+                UNION ALL
+                (SELECT n.sanction_id, max(similarity(n.normalized_name, q.name))::float8, 'fuzzy', 3,
+                        max(similarity(n.normalized_name, q.name))::float8
+                 FROM sanction_name AS n
+                 WHERE n.normalized_name % q.name
+                 GROUP BY n.sanction_id ORDER BY 5 DESC LIMIT :k)
+                UNION ALL
+                (SELECT p.sanction_id, max(p.shared)::float8 / cardinality(a.keys), 'phonetic', 4, max(p.shared)::float8
+                 FROM (
+                     SELECT n.sanction_id,
+                            cardinality(ARRAY(SELECT unnest(n.phonetic_keys) INTERSECT SELECT unnest(a.keys))) AS shared
+                     FROM sanction_name AS n
+                     WHERE n.phonetic_keys && a.keys
+                 ) AS p
+                 WHERE p.shared >= q.min_shared
+                 GROUP BY p.sanction_id ORDER BY 5 DESC LIMIT :k)
+            ) AS u
+            ORDER BY u.id, u.priority
+        ) AS d
+        ORDER BY d.priority, d.rank_key DESC, d.id
+        LIMIT :k
+    ) AS c
+""")
+
+def _index_candidates(index: NameIndex, items: List[ScreeningItem], limit: int) -> List[Candidate]:
+    candidates = []
+    for i, item in enumerate(items):
+        for sanction_id, score, stage in index.lookup(item.name, limit, min_similarity=settings.NAME_INDEX_FUZZY_THRESHOLD):
+            candidates.append((i, sanction_id, score, stage))
+    return candidates
+
+async def _sql_candidates(db: AsyncSession, items: List[ScreeningItem], limit: int) -> List[Candidate]:
+    queries = [(i, normalize_name(item.name)) for i, item in enumerate(items)]
+    # A blank name would become LIKE '%%' and match every row
+    queries = [(i, name) for i, name in queries if name]
+    if not queries:
+        return []
+
+    await set_trgm_thresholds(db)
+    res = await db.execute(
+        BATCH_CANDIDATES_SQL,
+        {
+            "idx": [i for i, _ in queries],
+            "names": [name for _, name in queries],
+            "token_sets": [" ".join(name_token_set(name)) for _, name in queries],
+            "key_sets": [" ".join(phonetic_keys(name.split())) for _, name in queries],
+            "min_shared": [phonetic_min_shared(name.split()) for _, name in queries],
+            "k": limit,
+        }
+    )
+    return [(idx, sanction_id, float(score), stage) for idx, sanction_id, score, stage in res.all()]
+
+async def screen_names(
+    db: AsyncSession, items: List[ScreeningItem], limit: int = 5, threshold: Optional[float] = None
+) -> List[ScreeningResult]:
+    """
+    Screens a batch of names in a fixed number of round trips:
+    candidate generation for the whole batch (in-memory index or one set-based query),
+    then a single hydration query that also resolves RFC matches.
+    Hits are scored with the match scoring engine and filtered by `threshold`.
+    """
+    if threshold is None:
+        threshold = settings.SEARCH_MATCH_THRESHOLD
+
+    index = await get_current_name_index()
+    if index is not None:
+        candidates = _index_candidates(index, items, limit)
+    else:
+        candidates = await _sql_candidates(db, items, limit)
+
+    rfcs = sorted({item.rfc.strip().upper() for item in items if item.rfc and item.rfc.strip()})
+    ids = sorted({sanction_id for _, sanction_id, _, _ in candidates})
+
+    rows: Dict[int, Any] = {}
+    rows_by_rfc: Dict[str, List[Any]] = {}
+    if ids or rfcs:
+        # Project only the serialized columns; array binds keep this at one parameter each
+        stmt = select(
+            Sanction.id, Sanction.entity_name, Sanction.reference_number, Sanction.program,
+            Sanction.source, Sanction.rfc, Sanction.aliases, Sanction.birth_dates, Sanction.nationality
+        ).filter(
+            or_(
+                Sanction.id == any_(bindparam("ids", ids, type_=ARRAY(Integer))),
+                Sanction.rfc == any_(bindparam("rfcs", rfcs, type_=ARRAY(String))),
+            )
+        )
+        res = await db.execute(stmt)
+        for row in res.all():
+            rows[row.id] = row
+            if row.rfc:
+                rows_by_rfc.setdefault(row.rfc.upper(), []).append(row)
+
+    per_item: Dict[int, Dict[int, Tuple[float, str]]] = {}
+    for i, sanction_id, score, stage in candidates:
+        per_item.setdefault(i, {})[sanction_id] = (score, stage)
+    for i, item in enumerate(items):
+        if item.rfc:
+            for row in rows_by_rfc.get(item.rfc.strip().upper(), []):
+                per_item.setdefault(i, {})[row.id] = (1.0, "rfc")
+
+    results = []
+    for i, item in enumerate(items):
+        item_candidates = [
+            (rows[sanction_id], stage)
+            for sanction_id, (_, stage) in per_item.get(i, {}).items()
+            if sanction_id in rows
+        ]
+        scores = score_candidates(
+            item.name, [row for row, _ in item_candidates], birth_date=item.birth_date, rfc=item.rfc
+        )
+        hits = [
+            ScreeningHit(
+                id=row.id,
+                entity_name=row.entity_name,
+                reference_number=row.reference_number,
+                program=row.program,
+                source=row.source,
+                score=round(float(score), 4),
+                stage=stage,
+                rfc_match=bool(rfc_agrees(row.rfc, item.rfc)),
+                birth_date_match=birth_date_agrees(row.birth_dates, item.birth_date),
+            )
+            for (row, stage), score in zip(item_candidates, scores)
+            if score >= threshold or stage == "rfc"
+        ]
+        hits.sort(key=lambda h: (h.rfc_match, h.score), reverse=True)
+        results.append(ScreeningResult(index=i, name=item.name, hits=hits[:limit]))
+
+    return results
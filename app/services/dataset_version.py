@@ -0,0 +1,45 @@
+import logging
+import time
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+DATASET_VERSION_KEY = "sanctions:dataset_version"
+
+_cached_version: int = 0
+_checked_at: float = 0.0
+
+async def get_dataset_version() -> int:
+    """
+    Returns the current sanctions dataset version.
+    The value lives in Redis so the API processes see bumps made by the Celery worker.
+    Reads are throttled to one every DATASET_VERSION_POLL_SECONDS per process.
+    """
+    global _cached_version, _checked_at
+    now = time.monotonic()
+    if now - _checked_at < settings.DATASET_VERSION_POLL_SECONDS:
+        return _cached_version
+
+    _checked_at = now
+    try:
+        value = await get_redis().get(DATASET_VERSION_KEY)
+        _cached_version = int(value) if value is not None else 0
+    except Exception as e:
+        # Keep serving with the last known version if Redis is unreachable
+        logger.warning(f"Could not read dataset version from Redis: {e}")
+    return _cached_version
+
+async def bump_dataset_version() -> int:
+    """
+    Increments the dataset version after the sanctions tables change.
+    """
+    global _cached_version, _checked_at
+    try:
+        _cached_version = int(await get_redis().incr(DATASET_VERSION_KEY))
+        _checked_at = time.monotonic()
+        logger.info(f"Sanctions dataset version bumped to {_cached_version}")
+    except Exception as e:
+        logger.warning(f"Could not bump dataset version in Redis: {e}")
+    return _cached_version
@@ -0,0 +1,118 @@
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+import numpy as np
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingProvider(ABC):
+    """
+    Turns texts into fixed-size vectors for the pgvector columns.
+    `model` identifies the vector space; vectors from different models must not be mixed.
+    """
+    model: str
+    dimension: int = 1536
+    remote: bool = True # Remote providers benefit from the embedding cache tiers
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        ...
+
+_client: Optional[AsyncOpenAI] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_openai_client() -> AsyncOpenAI:
+    """
+    Process-wide AsyncOpenAI client so its HTTPS connection pool is reused across searches.
+    Recreated when the event loop changes (Celery runs each task in a fresh loop).
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        _client_loop = loop
+    return _client
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    def __init__(self, model: str):
+        self.model = model
+
+    def available(self) -> bool:
+        return bool(settings.OPENAI_API_KEY) and settings.OPENAI_API_KEY != "sk-placeholder"
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        response = await get_openai_client().embeddings.create(input=texts, model=self.model)
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+@lru_cache(maxsize=262144)
+def _hashed_feature(gram: str, dimension: int) -> Tuple[int, float]:
+    # Stable across processes (unlike hash()), so stored vectors stay comparable
+    digest = hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % dimension, 1.0 if (value >> 63) & 1 else -1.0
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    Offline CPU embeddings: character n-grams of the padded words, feature-hashed
+    (signed) into `dimension` buckets with sublinear TF, L2-normalized so cosine
+    distance behaves like n-gram overlap. Deterministic and network free.
+    """
+    remote = False
+
+    def __init__(self, dimension: int = 1536, ngram_range: Tuple[int, int] = (2, 4)):
+        self.dimension = dimension
+        self.ngram_range = ngram_range
+        self.model = f"local-char-ngram-{ngram_range[0]}-{ngram_range[1]}-{dimension}"
+
+    def _vector(self, text: str) -> List[float]:
+        counts: Dict[str, int] = {}
+        low, high = self.ngram_range
+        for word in text.lower().split():
+            padded = f" {word} "
+            for n in range(low, high + 1):
+                for i in range(len(padded) - n + 1):
+                    gram = padded[i:i + n]
+                    counts[gram] = counts.get(gram, 0) + 1
+
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for gram, count in counts.items():
+            bucket, sign = _hashed_feature(gram, self.dimension)
+            vector[bucket] += sign * (1.0 + np.log(count))
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector.tolist()
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self._vector(t) for t in texts]
+
+_providers: Dict[Tuple[str, str], EmbeddingProvider] = {}
+
+def get_embedding_provider(model: Optional[str] = None) -> EmbeddingProvider:
+    """
+    Provider selected by EMBEDDING_PROVIDER ("openai" or "local").
+    `model` overrides EMBEDDING_MODEL for the OpenAI backend (e.g. the RAG documents).
+    """
+    kind = settings.EMBEDDING_PROVIDER
+    model = model or settings.EMBEDDING_MODEL
+    key = (kind, model if kind == "openai" else "")
+    provider = _providers.get(key)
+    if provider is None:
+        if kind == "local":
+            provider = LocalEmbeddingProvider(dimension=settings.EMBEDDING_DIMENSION)
+        elif kind == "openai":
+            provider = OpenAIEmbeddingProvider(model)
+        else:
+            raise ValueError(f"Unknown EMBEDDING_PROVIDER: {kind}")
+        _providers[key] = provider
+    return provider
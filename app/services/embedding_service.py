@@ -0,0 +1,109 @@
+from typing import Dict, List, Optional
+import hashlib
+import logging
+from array import array
+from collections import OrderedDict
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.services.embedding_providers import get_embedding_provider
+from app.services.etl.normalizer import normalize_name
+
+logger = logging.getLogger(__name__)
+
+# In-process LRU, first cache tier. Redis is the second tier shared by all workers.
+_memory_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+
+_stats: Dict[str, int] = {
+    "memory_hits": 0,
+    "redis_hits": 0,
+    "misses": 0,
+    "errors": 0,
+}
+
+def embedding_text(text: str) -> str:
+    """
+    Text that gets embedded: the normalized name, like the stored vectors. Scripts with
+    no Latin letters (Cyrillic, Arabic...) normalize to nothing, so they are embedded as
+    written (whitespace collapsed); the vector stage is their only candidate stage.
+    """
+    return normalize_name(text) or " ".join((text or "").split())
+
+def embedding_cache_key(text: str, model: str) -> str:
+    # `text` is the embedding_text() form
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"emb:{model}:{digest}"
+
+def embedding_cache_stats() -> Dict[str, int]:
+    lookups = _stats["memory_hits"] + _stats["redis_hits"] + _stats["misses"]
+    return {**_stats, "lookups": lookups, "memory_size": len(_memory_cache)}
+
+def _remember(key: str, embedding: List[float]):
+    _memory_cache[key] = embedding
+    _memory_cache.move_to_end(key)
+    while len(_memory_cache) > settings.EMBEDDING_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+async def _redis_get(key: str) -> Optional[List[float]]:
+    try:
+        raw = await get_redis().get(key)
+    except Exception as e:
+        logger.warning(f"Embedding cache read failed: {e}")
+        return None
+    if raw is None:
+        return None
+    return array("f", raw).tolist()
+
+async def _redis_set(key: str, embedding: List[float]):
+    try:
+        # float32 is plenty for cosine distance and halves the footprint
+        await get_redis().set(key, array("f", embedding).tobytes(), ex=settings.EMBEDDING_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Embedding cache write failed: {e}")
+
+async def get_embedding(text: str, use_cache: bool = True) -> List[float]:
+    """
+    Returns the embedding for embedding_text(`text`), normalized with the same rules as
+    the name index.
+    The backend comes from EMBEDDING_PROVIDER; remote backends are looked up
+    memory LRU -> Redis -> provider. Returns [] when embeddings are unavailable.
+    """
+    provider = get_embedding_provider()
+    if not provider.available():
+        logger.warning(f"Embedding provider {provider.model} not configured. Skipping vector generation.")
+        return []
+
+    normalized = embedding_text(text)
+    if not normalized:
+        return []
+
+    # Local vectors are cheaper to compute than a cache round trip
+    use_cache = use_cache and provider.remote
+    key = embedding_cache_key(normalized, provider.model)
+
+    if use_cache:
+        cached = _memory_cache.get(key)
+        if cached is not None:
+            _memory_cache.move_to_end(key)
+            _stats["memory_hits"] += 1
+            return cached
+
+        cached = await _redis_get(key)
+        if cached is not None:
+            _stats["redis_hits"] += 1
+            _remember(key, cached)
+            return cached
+
+        _stats["misses"] += 1
+
+    try:
+        embedding = (await provider.embed([normalized]))[0]
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.error(f"Error generating embedding: {e}")
+        return []
+
+    if use_cache:
+        _remember(key, embedding)
+        await _redis_set(key, embedding)
+    return embedding
@@ -10,6 +10,7 @@ from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from app.core.config import settings
+from app.services.dataset_version import bump_dataset_version
 
 logger = logging.getLogger(__name__)
 
@@ -111,6 +112,7 @@ async def cluster_by_rfc(db: AsyncSession):
     """
     Automatically cluster records with the same RFC.
     """
+    changed = False
     # Find RFCs that appear in multiple records
     stmt = select(Sanction.rfc).where(Sanction.rfc != None).group_by(Sanction.rfc).having(func.count(Sanction.id) > 1)
     result = await db.execute(stmt)
@@ -134,11 +136,16 @@ async def cluster_by_rfc(db: AsyncSession):
             db.add(new_profile)
             await db.flush() # Get ID
             existing_profile_id = new_profile.id
+            changed = True
             
         # Assign all to profile
         for s in sanctions:
             if s.profile_id != existing_profile_id:
                 s.profile_id = existing_profile_id
                 db.add(s)
+                changed = True
                 
     await db.commit()
+    if changed:
+        # Profiles drive cluster expansion, so cached search results are now outdated
+        await bump_dataset_version()
@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Optional
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SPOOL_MAX_SIZE = 8 * 1024 * 1024 # Downloads larger than this spill from memory to a temp file
+
+@dataclass
+class SourceDownload:
+    name: str
+    url: str
+    file: BinaryIO # Spooled temp file holding the payload, positioned at 0; the caller closes it
+    size: int
+    sha256: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+def _paths(name: str):
+    base = os.path.join(settings.SANCTIONS_CACHE_DIR, name)
+    return f"{base}.raw", f"{base}.json"
+
+def _write_atomic(path: str, data: BinaryIO):
+    # Write-then-rename: a crash never leaves a truncated payload next to valid metadata
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(data, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def load_cached_meta(name: str) -> Optional[Dict[str, Any]]:
+    """
+    Metadata of the last successfully synced payload of `name`, or None when there is
+    no usable cache entry (missing, unreadable, or its raw file is gone).
+    """
+    raw_path, meta_path = _paths(name)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if os.path.exists(raw_path) else None
+
+def fetch_source(name: str, url: str, timeout: float, force: bool = False) -> Optional[SourceDownload]:
+    """
+    Conditional GET of a sanctions source file, streamed into a spooled temp file and
+    hashed on the fly, so memory stays bounded whatever the file size. Sends
+    If-None-Match / If-Modified-Since from the cached metadata and returns None when the
+    upstream file is unchanged: a 304, or a 200 whose body has the same SHA-256 as the
+    cached payload (servers that ignore conditional headers). `force` skips the
+    validators and always returns the payload.
+    The cache is only updated by save_source, once the payload was synced.
+    """
+    meta = None if force else load_cached_meta(name)
+    headers = {}
+    if meta and meta.get("url") == url:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    else:
+        meta = None
+
+    file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        with httpx.stream("GET", url, headers=headers, timeout=timeout, follow_redirects=True) as response:
+            if response.status_code == 304:
+                logger.info(f"{name}: not modified upstream (304)")
+                file.close()
+                return None
+            response.raise_for_status()
+
+            digest, size = hashlib.sha256(), 0
+            for chunk in response.iter_bytes():
+                digest.update(chunk)
+                size += file.write(chunk)
+        file.seek(0)
+    except BaseException:
+        file.close()
+        raise
+
+    download = SourceDownload(
+        name=name, url=url, file=file, size=size, sha256=digest.hexdigest(),
+        etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"),
+    )
+    if meta and meta.get("sha256") == download.sha256:
+        logger.info(f"{name}: downloaded {download.size} bytes, same SHA-256 as the cached payload")
+        # Keeps the new validators so the next poll can get a 304
+        _write_meta(download)
+        file.close()
+        return None
+    return download
+
+def _write_meta(download: SourceDownload):
+    meta = {
+        "url": download.url, "sha256": download.sha256, "size": download.size,
+        "etag": download.etag, "last_modified": download.last_modified,
+    }
+    _write_atomic(_paths(download.name)[1], io.BytesIO(json.dumps(meta, indent=2).encode("utf-8")))
+
+def save_source(download: SourceDownload):
+    """
+    Stores the raw payload and its validators as the new baseline for fetch_source.
+    """
+    os.makedirs(settings.SANCTIONS_CACHE_DIR, exist_ok=True)
+    download.file.seek(0)
+    _write_atomic(_paths(download.name)[0], download.file)
+    _write_meta(download)
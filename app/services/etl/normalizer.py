@@ -1,5 +1,9 @@
 
+import re
 import unicodedata
+from typing import Any, Dict, List, Optional, Set
+
+from app.services.etl.phonetics import NAME_PARTICLES, phonetic_keys
 
 def normalize_text(text: str) -> str:
     """
@@ -9,3 +13,89 @@ def normalize_text(text: str) -> str:
         return ""
     text = unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
     return text.upper().strip()
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+
+def tokenize_name(text: Optional[str]) -> List[str]:
+    """
+    Splits a name into normalized tokens (accent-stripped, upper-cased, alphanumeric only).
+    """
+    return [t for t in _NON_ALNUM.split(normalize_text(text or "")) if t]
+
+def normalize_name(text: Optional[str]) -> str:
+    """
+    normalize_text plus punctuation collapsed to single spaces.
+    This is the form stored in the normalized_* columns and used for every name comparison.
+    """
+    return " ".join(tokenize_name(text))
+
+def name_trigrams(normalized: str) -> Set[str]:
+    """
+    Word trigrams following pg_trgm rules: every word is padded with two
+    leading spaces and one trailing space, so similarity() scores match the DB.
+    """
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+def sanction_names(entity_name: Optional[str], aliases: Optional[list]) -> List[str]:
+    """
+    Returns the primary name plus every alias name stored in the aliases JSON.
+    """
+    names = [entity_name] if entity_name else []
+    for alias in aliases or []:
+        if isinstance(alias, dict) and alias.get("name"):
+            names.append(alias["name"])
+    return names
+
+def detect_script(text: Optional[str]) -> Optional[str]:
+    """
+    Unicode script of the first letter (LATIN, ARABIC, CYRILLIC, CJK, ...).
+    """
+    for ch in text or "":
+        if ch.isalpha():
+            return unicodedata.name(ch, "UNKNOWN").split(" ")[0]
+    return None
+
+def is_latin_script(text: Optional[str]) -> bool:
+    """
+    True when every letter of `text` is Latin (accented letters included).
+    """
+    return all(unicodedata.name(ch, "").startswith("LATIN") for ch in text or "" if ch.isalpha())
+
+def name_token_set(text: Optional[str]) -> List[str]:
+    """
+    Sorted distinct tokens without particles/company suffixes: the order-insensitive
+    form of a name ("GUZMAN LOERA, JOAQUIN" and "JOAQUIN GUZMAN LOERA" are equal).
+    """
+    return sorted({t for t in tokenize_name(text) if t not in NAME_PARTICLES})
+
+def _name_row(name: str, name_type: str, quality: Optional[str]) -> Dict[str, Any]:
+    tokens = name_token_set(name)
+    normalized = normalize_name(name)
+    return {
+        "name": name,
+        "normalized_name": normalized or None,
+        "name_type": name_type,
+        "quality": quality,
+        "script": detect_script(name),
+        "tokens": tokens or None,
+        "token_signature": " ".join(tokens) or None,
+        # Same keys as the in-memory index computes per name
+        "phonetic_keys": phonetic_keys(normalized.split()) or None,
+    }
+
+def sanction_name_rows(entity_name: Optional[str], aliases: Optional[list]) -> List[Dict[str, Any]]:
+    """
+    Rows for the sanction_name table: the primary name plus every alias.
+    """
+    rows = []
+    if entity_name:
+        rows.append(_name_row(entity_name, "primary", None))
+    for alias in aliases or []:
+        if isinstance(alias, dict) and alias.get("name"):
+            rows.append(_name_row(alias["name"], "alias", alias.get("quality")))
+    return rows
@@ -0,0 +1,98 @@
+from typing import Iterable, List
+
+_VOWELS = set("AEIOU")
+
+# Particles and company suffixes (S.A. DE C.V.) carry no identity and would match everything
+NAME_PARTICLES = {
+    "DE", "DEL", "LA", "LAS", "LOS", "EL", "Y", "E", "VAN", "VON", "BIN", "BINT", "AL",
+    "SA", "CV", "RL", "SC", "SAPI", "SAB", "SRL", "SPR", "AC",
+}
+
+def spanish_phonetic_code(token: str, archaic_x: bool = False) -> str:
+    """
+    Phonetic code of one normalized token ([A-Z0-9]), adapted to Spanish/Mexican spelling:
+    B/V/W, C/K/Q, C/S/Z (seseo), G/J before E/I, LL/Y, silent H and doubled letters
+    collapse to the same code, e.g. GUZMAN/GUSMAN, VILLA/BIYA, HERNANDEZ/ERNANDES.
+    Vowels are kept; they rarely vary in names and separate short surnames.
+    archaic_x reads X before a vowel as the old spelling of J (XIMENEZ, MEXIA).
+    """
+    word = token.upper()
+    out = []
+    i, n = 0, len(word)
+    while i < n:
+        ch = word[i]
+        nxt = word[i + 1] if i + 1 < n else ""
+        after = word[i + 2] if i + 2 < n else ""
+
+        if ch == "C":
+            if nxt == "H":
+                out.append("X") # CH
+                i += 2
+                continue
+            out.append("S" if nxt in ("E", "I") else "K")
+        elif ch == "Q":
+            out.append("K")
+            if nxt == "U" and after in ("E", "I"):
+                i += 1 # QUE/QUI: silent U
+        elif ch == "G":
+            if nxt in ("E", "I"):
+                out.append("J")
+            else:
+                out.append("G")
+                if nxt == "U" and after in ("E", "I"):
+                    i += 1 # GUE/GUI: silent U
+        elif ch == "H":
+            pass # Silent (CH handled above)
+        elif ch in ("V", "W"):
+            out.append("B")
+        elif ch == "Z":
+            out.append("S")
+        elif ch == "X":
+            if archaic_x and nxt in _VOWELS:
+                out.append("J")
+            else:
+                # Word-initial X is usually S (XOCHITL); elsewhere KS/J vary too much, keep X
+                out.append("S" if i == 0 else "X")
+        elif ch == "L" and nxt == "L":
+            out.append("Y")
+            i += 1
+        elif ch == "Y":
+            # Consonant Y before a vowel, vowel I otherwise (Y, REY, YRMA)
+            out.append("Y" if nxt in _VOWELS else "I")
+        elif ch == "K":
+            out.append("K")
+        else:
+            out.append(ch)
+        i += 1
+
+    code = []
+    for c in out:
+        if not code or code[-1] != c:
+            code.append(c)
+    return "".join(code)
+
+def _has_key(token: str) -> bool:
+    return len(token) >= 2 and not token.isdigit() and token not in NAME_PARTICLES
+
+def phonetic_keys(tokens: Iterable[str]) -> List[str]:
+    """
+    Sorted, distinct phonetic codes of the normalized tokens
+    (2+ characters, digits and NAME_PARTICLES skipped). Tokens with an X get both
+    readings, so XIMENEZ shares a key with JIMENEZ and XOCHITL with SOCHITL.
+    """
+    keys = set()
+    for token in tokens:
+        if not _has_key(token):
+            continue
+        keys.add(spanish_phonetic_code(token))
+        if "X" in token:
+            keys.add(spanish_phonetic_code(token, archaic_x=True))
+    return sorted(keys)
+
+def phonetic_min_shared(tokens: Iterable[str]) -> int:
+    """
+    Keys a name must share with the query to be a phonetic candidate: two, so a single
+    common surname is not enough, or one for a single-token query. Counted per query
+    token rather than per key, since a token with an X has two keys.
+    """
+    return min(2, len({token for token in tokens if _has_key(token)}))
@@ -0,0 +1,65 @@
+from typing import BinaryIO, Iterable, Iterator, List, TypeVar, Union
+from itertools import islice
+import codecs
+import io
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+READ_CHUNK_SIZE = 64 * 1024 # Bytes per read from a downloaded file
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Groups a (possibly lazy) iterable into lists of at most `size` items
+    (itertools.batched is Python 3.12+).
+    """
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+class FallbackDecoder:
+    """
+    Incremental UTF-8 decoder that switches to latin-1 at the first invalid byte
+    sequence (government CSVs are often latin-1/windows-1252). Text decoded before
+    the switch was valid UTF-8; the failing chunk and everything after it is latin-1.
+    """
+    def __init__(self):
+        self.encoding = "utf-8"
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def decode(self, data: bytes, final: bool = False) -> str:
+        if self.encoding == "utf-8":
+            # Bytes of a multi-byte sequence split across chunks, still buffered
+            pending, _ = self._decoder.getstate()
+            try:
+                return self._decoder.decode(data, final)
+            except UnicodeDecodeError:
+                logger.info("Content is not valid UTF-8, decoding the rest as latin-1")
+                self.encoding = "latin-1"
+                self._decoder = codecs.getincrementaldecoder("latin-1")()
+                data = pending + data
+        return self._decoder.decode(data, final)
+
+def iter_text_lines(source: Union[bytes, BinaryIO], chunk_size: int = READ_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Lazily decodes raw bytes or a binary file object (see FallbackDecoder) and yields
+    its lines with their line endings, as csv.reader expects, so quoted fields spanning
+    lines survive. Only one chunk and one partial line are held in memory.
+    """
+    stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    decoder = FallbackDecoder()
+    partial = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        text = decoder.decode(chunk, final=not chunk)
+        if text:
+            lines = (partial + text).split("\n")
+            partial = lines.pop()
+            for line in lines:
+                yield line + "\n"
+        if not chunk:
+            break
+    if partial:
+        yield partial
@@ -1,4 +1,5 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import asyncio
 import logging
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
@@ -7,15 +8,46 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-async def analyze_search_results(query: str, results: List[Any]) -> str:
+_llm: Optional[ChatOpenAI] = None
+_llm_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_llm() -> ChatOpenAI:
     """
-    Analyzes the search results using an LLM to provide a natural language summary.
+    Process-wide ChatOpenAI client (and its HTTP connection pool) for search summaries.
+    Recreated when the event loop changes, like the embedding client.
     """
-    if not settings.OPENAI_API_KEY or settings.OPENAI_API_KEY == "sk-placeholder":
-        return "LLM analysis unavailable (API Key not set)."
+    global _llm, _llm_loop
+    loop = asyncio.get_running_loop()
+    if _llm is None or _llm_loop is not loop:
+        _llm = ChatOpenAI(
+            model="gpt-4o-mini", # Cost-effective model
+            temperature=0,
+            api_key=settings.OPENAI_API_KEY
+        )
+        _llm_loop = loop
+    return _llm
+
+def llm_available() -> bool:
+    return bool(settings.OPENAI_API_KEY) and settings.OPENAI_API_KEY != "sk-placeholder"
 
+def summary_without_llm(query: str, results: List[Any]) -> Optional[str]:
+    """
+    Summary that needs no LLM call (no API key or no results), None otherwise.
+    """
+    if not llm_available():
+        return "LLM analysis unavailable (API Key not set)."
     if not results:
         return f"No results found for '{query}'. The individual/entity does not appear in the sanctions list based on the search criteria."
+    return None
+
+async def analyze_search_results(query: str, results: List[Any], raise_errors: bool = False) -> str:
+    """
+    Analyzes the search results using an LLM to provide a natural language summary.
+    LLM failures are returned as text unless `raise_errors` is set.
+    """
+    immediate = summary_without_llm(query, results)
+    if immediate is not None:
+        return immediate
 
     try:
         # Format results for the prompt
@@ -23,12 +55,7 @@ async def analyze_search_results(query: str, results: List[Any]) -> str:
         for i, res in enumerate(results, 1):
             results_text += f"{i}. Name: {res.get('entity_name')}, Source: {res.get('source')}, Program: {res.get('program')}, ID: {res.get('reference_number')}\n"
 
-        # Initialize LLM
-        llm = ChatOpenAI(
-            model="gpt-4o-mini", # Cost-effective model
-            temperature=0,
-            api_key=settings.OPENAI_API_KEY
-        )
+        llm = get_llm()
 
         # Create Prompt
         prompt = ChatPromptTemplate.from_messages([
@@ -57,4 +84,6 @@ async def analyze_search_results(query: str, results: List[Any]) -> str:
 
     except Exception as e:
         logger.error(f"Error in LLM analysis: {e}")
+        if raise_errors:
+            raise
         return f"Error generating analysis: {str(e)}"
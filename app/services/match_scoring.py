@@ -0,0 +1,194 @@
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.distance import JaroWinkler
+
+from app.services.etl.normalizer import name_trigrams, normalize_text, sanction_names, tokenize_name
+from app.services.etl.phonetics import NAME_PARTICLES
+
+# Weights of the name features: query coverage, name coverage, token-set ratio, trigram Jaccard.
+# Query coverage and the token-set ratio both reach 1.0 for a partial query ("JUAN" for
+# "JUAN HERNANDEZ LOPEZ"), so name coverage weighs the most: a partial query only scores
+# as high as the share of the full name it accounts for.
+NAME_FEATURE_WEIGHTS = np.array([0.25, 0.50, 0.10, 0.15], dtype=np.float32)
+
+# A token only counts as matched (coverage features) at this Jaro-Winkler similarity or above
+TOKEN_MATCH_MIN_SIMILARITY = 0.8
+
+# Score adjustment per attribute when it agrees (+1) or contradicts (-1); unknown (0) is neutral
+# Order: birth date, nationality, RFC
+ATTRIBUTE_WEIGHTS = np.array([0.10, 0.05, 0.30], dtype=np.float32)
+ATTRIBUTE_PENALTIES = np.array([0.15, 0.05, 0.30], dtype=np.float32)
+
+# Highest score a candidate can reach when no query token matches any of its name tokens
+# (coverage features are 0) and the RFC does not agree. The negative pre-check relies on it.
+UNMATCHED_NAME_MAX_SCORE = float(NAME_FEATURE_WEIGHTS[2:].sum() + ATTRIBUTE_WEIGHTS[:2].sum())
+
+def jaro_winkler(a: str, b: str) -> float:
+    """
+    Jaro-Winkler similarity in [0, 1] (rapidfuzz: prefix weight 0.1, up to 4 characters,
+    boost applied above a Jaro of 0.7). The token similarity used by the coverage features.
+    """
+    return JaroWinkler.similarity(a, b)
+
+def scoring_tokens(text: str) -> List[str]:
+    """
+    Name tokens compared by the scorer: particles and company suffixes (DE, LA, SA...)
+    are dropped unless the name has nothing else.
+    """
+    tokens = tokenize_name(text)
+    return [t for t in tokens if t not in NAME_PARTICLES] or tokens
+
+@lru_cache(maxsize=262144)
+def _name_profile(name: str) -> Tuple[Tuple[str, ...], str, FrozenSet[str]]:
+    # (scoring tokens, their joined form, pg_trgm trigrams); names repeat across searches
+    tokens = tuple(scoring_tokens(name))
+    joined = " ".join(tokens)
+    return tokens, joined, frozenset(name_trigrams(joined))
+
+def name_feature_matrix(query_tokens: List[str], names: List[str]) -> np.ndarray:
+    """
+    Features of every name against the query, one row per name, in one vectorized pass:
+      - query coverage: share of the query tokens (weighted by length) matched by some
+        name token, each credited with its best Jaro-Winkler when that reaches
+        TOKEN_MATCH_MIN_SIMILARITY,
+      - name coverage: the same share the other way round (partial queries score low),
+      - token-set ratio (rapidfuzz fuzz.token_set_ratio) of the joined tokens,
+      - Jaccard similarity of the pg_trgm trigram sets (like pg_trgm similarity()).
+    Jaro-Winkler runs once per (query token, distinct name token) pair through
+    rapidfuzz process.cdist; numpy reduces it per name.
+    """
+    features = np.zeros((len(names), len(NAME_FEATURE_WEIGHTS)), dtype=np.float32)
+    if not query_tokens or not names:
+        return features
+
+    profiles = [_name_profile(name) for name in names]
+    vocabulary: Dict[str, int] = {}
+    flat, starts, rows = [], [], []
+    for i, (tokens, _, _) in enumerate(profiles):
+        if tokens:
+            rows.append(i)
+            starts.append(len(flat))
+            for t in tokens:
+                flat.append(vocabulary.setdefault(t, len(vocabulary)))
+    if not rows:
+        return features
+    rows, starts, flat = np.asarray(rows), np.asarray(starts), np.asarray(flat)
+
+    # float64: the cut-off must agree exactly with negative_filter's jaro_winkler check
+    similarity = process.cdist(query_tokens, list(vocabulary), scorer=JaroWinkler.similarity, dtype=np.float64)
+    similarity[similarity < TOKEN_MATCH_MIN_SIMILARITY] = 0.0
+    query_lengths = np.asarray([len(t) for t in query_tokens], dtype=np.float64)
+    token_lengths = np.asarray([len(t) for t in vocabulary], dtype=np.float64)[flat]
+
+    # Best name token per query token, per name: (query tokens x names)
+    query_best = np.maximum.reduceat(similarity[:, flat], starts, axis=1)
+    features[rows, 0] = query_lengths @ query_best / query_lengths.sum()
+    # Best query token per name token, summed per name
+    name_credit = similarity.max(axis=0)[flat] * token_lengths
+    features[rows, 1] = np.add.reduceat(name_credit, starts) / np.add.reduceat(token_lengths, starts)
+
+    joined = " ".join(query_tokens)
+    features[:, 2] = process.cdist([joined], [p[1] for p in profiles], scorer=fuzz.token_set_ratio, dtype=np.float32)[0] / 100.0
+    query_grams = name_trigrams(joined)
+    shared = np.fromiter((len(query_grams & grams) for _, _, grams in profiles), dtype=np.float32, count=len(profiles))
+    sizes = np.fromiter((len(grams) for _, _, grams in profiles), dtype=np.float32, count=len(profiles))
+    # |A | B| = |A| + |B| - |A & B|
+    features[:, 3] = shared / np.maximum(len(query_grams) + sizes - shared, 1.0)
+    return features
+
+def birth_date_agrees(birth_dates: Any, birth_date: Optional[date]) -> Optional[bool]:
+    """
+    Compares a customer birth date with the UN INDIVIDUAL_DATE_OF_BIRTH structure
+    (DATE, YEAR or FROM_YEAR/TO_YEAR entries). Returns None when there is nothing to compare.
+    """
+    if not birth_date or not birth_dates:
+        return None
+
+    entries = birth_dates if isinstance(birth_dates, list) else [birth_dates]
+    compared = False
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        if entry.get("DATE"):
+            compared = True
+            if str(entry["DATE"])[:10] == birth_date.isoformat():
+                return True
+        elif entry.get("YEAR"):
+            compared = True
+            if str(entry["YEAR"]) == str(birth_date.year):
+                return True
+        elif entry.get("FROM_YEAR") and entry.get("TO_YEAR"):
+            compared = True
+            try:
+                if int(entry["FROM_YEAR"]) <= birth_date.year <= int(entry["TO_YEAR"]):
+                    return True
+            except ValueError:
+                pass
+    return False if compared else None
+
+def nationality_agrees(candidate: Optional[str], nationality: Optional[str]) -> Optional[bool]:
+    if not candidate or not nationality:
+        return None
+    wanted = normalize_text(nationality)
+    return wanted in {normalize_text(n) for n in candidate.split(",")}
+
+def rfc_agrees(candidate: Optional[str], rfc: Optional[str]) -> Optional[bool]:
+    if not candidate or not rfc:
+        return None
+    return candidate.strip().upper() == rfc.strip().upper()
+
+def _agreement(value: Optional[bool]) -> int:
+    return 0 if value is None else (1 if value else -1)
+
+def score_candidates(
+    query: str,
+    candidates: Sequence[Any],
+    birth_date: Optional[date] = None,
+    nationality: Optional[str] = None,
+    rfc: Optional[str] = None,
+    fallback_scores: Optional[Sequence[float]] = None,
+) -> np.ndarray:
+    """
+    Returns a normalized match score in [0, 1] for every candidate.
+
+    Candidates are any objects exposing entity_name, aliases, birth_dates,
+    nationality and rfc (ORM rows or projected rows). The name score is the best
+    weighted feature combination (name_feature_matrix) over the primary name and all
+    aliases; optional attribute agreement then nudges it up or down.
+
+    A query without scoreable tokens (Cyrillic, Arabic... normalize to nothing) cannot be
+    compared by name: `fallback_scores` (e.g. the vector similarity of each candidate)
+    is used as its name score instead, 0 when not given.
+    """
+    if not candidates:
+        return np.zeros(0, dtype=np.float32)
+
+    query_tokens = scoring_tokens(query)
+    if query_tokens:
+        names, owners = [], []
+        for i, candidate in enumerate(candidates):
+            for name in sanction_names(candidate.entity_name, candidate.aliases):
+                names.append(name)
+                owners.append(i)
+        name_scores = np.zeros(len(candidates), dtype=np.float32)
+        if names:
+            np.maximum.at(name_scores, np.asarray(owners), name_feature_matrix(query_tokens, names) @ NAME_FEATURE_WEIGHTS)
+    elif fallback_scores is not None:
+        name_scores = np.asarray(fallback_scores, dtype=np.float32)
+    else:
+        name_scores = np.zeros(len(candidates), dtype=np.float32)
+
+    agreement = np.asarray([
+        (
+            _agreement(birth_date_agrees(candidate.birth_dates, birth_date)),
+            _agreement(nationality_agrees(candidate.nationality, nationality)),
+            _agreement(rfc_agrees(candidate.rfc, rfc)),
+        )
+        for candidate in candidates
+    ], dtype=np.int8)
+    bonus = np.where(agreement > 0, ATTRIBUTE_WEIGHTS, 0.0) - np.where(agreement < 0, ATTRIBUTE_PENALTIES, 0.0)
+    return np.clip(name_scores + bonus.sum(axis=1), 0.0, 1.0)
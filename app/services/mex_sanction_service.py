@@ -1,25 +1,22 @@
-from typing import Dict, List, Any
+from typing import BinaryIO, Dict, Iterator, Any, Union
 import logging
 import csv
-import io
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import delete
 
-from app.models.sanction import Sanction
+from app.services.etl.streaming import iter_text_lines
+from app.services.dataset_version import bump_dataset_version
+from app.services.sanction_loader import has_changes, load_sanctions
 
 logger = logging.getLogger(__name__)
 
-def parse_mex_csv(csv_content: bytes) -> List[Dict[str, Any]]:
+def iter_mex_csv(source: Union[bytes, BinaryIO]) -> Iterator[Dict[str, Any]]:
     """
-    Parses the Mexican Sanctions CSV content.
-    Returns a list of dictionaries mapped to the Sanction model fields.
+    Incrementally parses the Mexican Sanctions CSV (raw bytes or a binary file object).
+    Yields dictionaries mapped to the Sanction model fields, one row at a time.
     """
-    decoded_content = csv_content.decode('utf-8')
-    csv_reader = csv.DictReader(io.StringIO(decoded_content))
-    
-    parsed_data = []
+    # Decoded lazily: utf-8, falling back to latin-1
+    csv_reader = csv.DictReader(iter_text_lines(source))
     
     for row in csv_reader:
         try:
@@ -83,70 +80,29 @@ def parse_mex_csv(csv_content: bytes) -> List[Dict[str, Any]]:
                 "birth_places": [],
                 "documents": []
             }
-            parsed_data.append(item)
+            yield item
             
         except Exception as e:
             logger.error(f"Error parsing row: {row}. Error: {e}")
             continue
-            
-    return parsed_data
 
-async def sync_mex_sanctions_data(db: AsyncSession, csv_content: bytes) -> Dict[str, int]:
+async def sync_mex_sanctions_data(db: AsyncSession, csv_content: Union[bytes, BinaryIO]) -> Dict[str, int]:
     """
-    Synchronizes the database with the Mexican Sanctions CSV.
+    Synchronizes the database with the Mexican Sanctions CSV (bytes or a binary file object).
+    Rows are parsed as the loader consumes them, in COPY-sized chunks.
     """
+    # COPY into staging, one set-based upsert and a delete scoped to MEX_SANCIONADOS
     try:
-        parsed_data = parse_mex_csv(csv_content)
+        result = await load_sanctions(db, iter_mex_csv(csv_content), source="MEX_SANCIONADOS")
     except Exception as e:
-        logger.error(f"Failed to parse CSV for sync: {e}")
+        logger.error(f"Failed to load Mexican Sanctions CSV: {e}")
+        await db.rollback()
         raise e
 
-    csv_data_ids = set()
-    count_created = 0
-    count_updated = 0
-    
-    # 1. Upsert Logic
-    for item in parsed_data:
-        data_id = item.get("data_id")
-        if not data_id:
-            continue
-            
-        csv_data_ids.add(data_id)
-        
-        # Check existence
-        result = await db.execute(select(Sanction).filter(Sanction.data_id == data_id))
-        existing_sanction = result.scalars().first()
-        
-        if existing_sanction:
-            # Update
-            for key, value in item.items():
-                setattr(existing_sanction, key, value)
-            count_updated += 1
-        else:
-            # Insert
-            new_sanction = Sanction(**item)
-            db.add(new_sanction)
-            count_created += 1
-            
-    # 2. Delete Logic (Scoped to MEX_SANCIONADOS source)
-    # Only delete records that belong to this source and are NOT in the new CSV
-    
-    result_all = await db.execute(select(Sanction.data_id).filter(Sanction.source == "MEX_SANCIONADOS"))
-    db_data_ids = set(result_all.scalars().all())
-    
-    ids_to_delete = db_data_ids - csv_data_ids
-    count_deleted = len(ids_to_delete)
-    
-    if ids_to_delete:
-        await db.execute(delete(Sanction).where(Sanction.data_id.in_(ids_to_delete)))
-        
     await db.commit()
+    if has_changes(result):
+        await bump_dataset_version()
     
-    logger.info(f"Mexican Sanctions Sync complete. Created: {count_created}, Updated: {count_updated}, Deleted: {count_deleted}")
+    logger.info(f"Mexican Sanctions Sync complete. Created: {result['created']}, Updated: {result['updated']}, Unchanged: {result['unchanged']}, Deleted: {result['deleted']}")
     
-    return {
-        "created": count_created,
-        "updated": count_updated,
-        "deleted": count_deleted,
-        "total_active": len(csv_data_ids)
-    }
+    return result
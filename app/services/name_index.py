@@ -0,0 +1,292 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import logging
+import time
+from collections import defaultdict
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.session import async_session
+from app.models.sanction import Sanction
+from app.models.sanction_name import SanctionName
+from app.services.dataset_version import get_dataset_version
+from app.services.etl.normalizer import name_token_set, name_trigrams, normalize_name
+from app.services.etl.phonetics import phonetic_keys, phonetic_min_shared
+from app.services.negative_filter import NameFilter
+
+logger = logging.getLogger(__name__)
+
+def substring_trigrams(normalized: str) -> Set[str]:
+    """
+    Raw 3-grams of the whole string, used to prune candidates for substring (ILIKE-style) matches.
+    """
+    return {normalized[i:i + 3] for i in range(len(normalized) - 2)}
+
+def _to_postings(postings: Dict[str, List[int]]) -> Dict[str, np.ndarray]:
+    return {key: np.asarray(ids, dtype=np.int32) for key, ids in postings.items()}
+
+class NameIndex:
+    """
+    Immutable in-memory inverted index over sanction names and aliases.
+
+    Each indexed name is an entry; entries point back to their sanction id.
+    Exact candidates are substring matches (same semantics as the former ILIKE
+    stage), token candidates contain every query token in any order, fuzzy
+    candidates are ranked by pg_trgm-compatible similarity and phonetic
+    candidates by the share of query phonetic keys they contain.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[int, str]]):
+        self.names: List[str] = []
+        sanction_ids: List[int] = []
+        trigram_counts: List[int] = []
+        token_counts: List[int] = []
+        token_postings: Dict[str, List[int]] = defaultdict(list)
+        trigram_postings: Dict[str, List[int]] = defaultdict(list)
+        substring_postings: Dict[str, List[int]] = defaultdict(list)
+        phonetic_postings: Dict[str, List[int]] = defaultdict(list)
+
+        for sanction_id, raw_name in entries:
+            name = normalize_name(raw_name)
+            if not name:
+                continue
+            entry = len(self.names)
+            self.names.append(name)
+            sanction_ids.append(sanction_id)
+
+            grams = name_trigrams(name)
+            trigram_counts.append(len(grams))
+            for gram in grams:
+                trigram_postings[gram].append(entry)
+            for gram in substring_trigrams(name):
+                substring_postings[gram].append(entry)
+            for key in phonetic_keys(name.split()):
+                phonetic_postings[key].append(entry)
+            tokens = name_token_set(name)
+            token_counts.append(len(tokens))
+            for token in tokens:
+                token_postings[token].append(entry)
+
+        self.sanction_ids = np.asarray(sanction_ids, dtype=np.int64)
+        self.trigram_counts = np.asarray(trigram_counts, dtype=np.int32)
+        self.token_counts = np.asarray(token_counts, dtype=np.int32)
+        self._tokens = _to_postings(token_postings)
+        self._trigrams = _to_postings(trigram_postings)
+        self._substrings = _to_postings(substring_postings)
+        self._phonetics = _to_postings(phonetic_postings)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _exact_entries(self, query: str) -> np.ndarray:
+        if len(query) < 3:
+            # Too short for trigram pruning; a linear scan over the names is still in-memory
+            return np.asarray([i for i, name in enumerate(self.names) if query in name], dtype=np.int32)
+
+        postings = []
+        for gram in substring_trigrams(query):
+            ids = self._substrings.get(gram)
+            if ids is None:
+                return np.empty(0, dtype=np.int32)
+            postings.append(ids)
+
+        postings.sort(key=len)
+        candidates = postings[0]
+        for ids in postings[1:]:
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+            if not candidates.size:
+                return candidates
+        return np.asarray([i for i in candidates if query in self.names[i]], dtype=np.int32)
+
+    def _token_entries(self, query: str) -> np.ndarray:
+        """
+        Entries containing every query token, regardless of order (token-set containment).
+        Single-token queries are left to the exact stage.
+        """
+        tokens = name_token_set(query)
+        if len(tokens) < 2:
+            return np.empty(0, dtype=np.int32)
+        postings = []
+        for token in tokens:
+            ids = self._tokens.get(token)
+            if ids is None:
+                return np.empty(0, dtype=np.int32)
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for ids in postings[1:]:
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+            if not candidates.size:
+                break
+        return candidates
+
+    def _fuzzy_scores(self, query: str) -> np.ndarray:
+        grams = name_trigrams(query)
+        postings = [self._trigrams[g] for g in grams if g in self._trigrams]
+        if not postings:
+            return np.zeros(len(self.names), dtype=np.float32)
+
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.names))
+        union = len(grams) + self.trigram_counts - shared
+        return (shared / np.maximum(union, 1)).astype(np.float32)
+
+    def _phonetic_scores(self, query: str) -> np.ndarray:
+        tokens = query.split()
+        keys = phonetic_keys(tokens)
+        postings = [self._phonetics[k] for k in keys if k in self._phonetics]
+        if not postings:
+            return np.zeros(len(self.names), dtype=np.float32)
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.names))
+        # A single shared key (e.g. one common surname) is not a candidate on its own
+        shared[shared < phonetic_min_shared(tokens)] = 0
+        return (shared / len(keys)).astype(np.float32)
+
+    def candidates(self, query: str, depth: int, min_similarity: float = 0.3) -> Dict[str, List[Tuple[int, float]]]:
+        """
+        Returns the candidate lists per stage ("exact", "token", "fuzzy", "phonetic"), each
+        as ranked (sanction_id, score) pairs of at most `depth` distinct sanctions.
+        """
+        normalized = normalize_name(query)
+        if not normalized or not self.names:
+            return {"exact": [], "token": [], "fuzzy": [], "phonetic": []}
+
+        scores = self._fuzzy_scores(normalized)
+
+        # Exact matches ordered by how close the whole name is to the query
+        exact_entries = sorted(self._exact_entries(normalized).tolist(), key=lambda e: -scores[e])
+        exact = self._distinct(exact_entries, lambda e: 1.0, depth)
+
+        # Token-set matches: a permutation of the whole name (score 1.0) ranks first
+        query_tokens = len(name_token_set(normalized))
+        token_entries = self._token_entries(normalized)
+        token_scores = query_tokens / np.maximum(self.token_counts[token_entries], 1)
+        token_entries = token_entries[np.argsort(-token_scores, kind="stable")]
+        token = self._distinct(token_entries.tolist(), lambda e: query_tokens / max(int(self.token_counts[e]), 1), depth)
+
+        fuzzy_entries = np.flatnonzero(scores >= min_similarity)
+        fuzzy_entries = fuzzy_entries[np.argsort(-scores[fuzzy_entries], kind="stable")].tolist()
+        fuzzy = self._distinct(fuzzy_entries, lambda e: float(scores[e]), depth)
+
+        phonetic_scores = self._phonetic_scores(normalized)
+        phonetic_entries = np.flatnonzero(phonetic_scores)
+        # Ties (same share of keys) go to the closer trigram match
+        order = np.lexsort((-scores[phonetic_entries], -phonetic_scores[phonetic_entries]))
+        phonetic = self._distinct(phonetic_entries[order].tolist(), lambda e: float(phonetic_scores[e]), depth)
+        return {"exact": exact, "token": token, "fuzzy": fuzzy, "phonetic": phonetic}
+
+    def _distinct(self, entries: List[int], score_of, depth: int) -> List[Tuple[int, float]]:
+        ranked, seen = [], set()
+        for entry in entries:
+            sanction_id = int(self.sanction_ids[entry])
+            if sanction_id not in seen:
+                seen.add(sanction_id)
+                ranked.append((sanction_id, score_of(entry)))
+                if len(ranked) >= depth:
+                    break
+        return ranked
+
+    def lookup(self, query: str, limit: int, min_similarity: float = 0.3) -> List[Tuple[int, float, str]]:
+        """
+        Returns up to `limit` (sanction_id, score, stage) candidates.
+        Exact substring matches come first (score 1.0), then reordered-token matches,
+        fuzzy matches by similarity and phonetic matches.
+        """
+        ranked = self.candidates(query, limit, min_similarity)
+        hits = [(sanction_id, score, "exact") for sanction_id, score in ranked["exact"]]
+        seen = {sanction_id for sanction_id, _, _ in hits}
+        for stage in ("token", "fuzzy", "phonetic"):
+            for sanction_id, score in ranked[stage]:
+                if len(hits) >= limit:
+                    return hits
+                if sanction_id not in seen:
+                    seen.add(sanction_id)
+                    hits.append((sanction_id, score, stage))
+        return hits
+
+_index: Optional[NameIndex] = None
+_index_version: Optional[int] = None
+_negative_filter: Optional[NameFilter] = None # Built with the index, same version
+_rebuild_lock = asyncio.Lock()
+_background_tasks: Set[asyncio.Task] = set()
+_rebuild_failures = 0
+_next_rebuild_at = 0.0 # time.monotonic() before which no background rebuild is scheduled
+
+async def _load_entries() -> Tuple[List[Tuple[int, str]], List[str]]:
+    async with async_session() as db:
+        result = await db.execute(
+            select(SanctionName.sanction_id, SanctionName.normalized_name).filter(
+                SanctionName.normalized_name.isnot(None)
+            )
+        )
+        entries = [(sanction_id, name) for sanction_id, name in result.all()]
+        rfcs = await db.execute(select(Sanction.rfc).filter(Sanction.rfc.isnot(None)).distinct())
+        return entries, list(rfcs.scalars().all())
+
+def _build(entries: List[Tuple[int, str]], rfcs: List[str]) -> Tuple[NameIndex, Optional[NameFilter]]:
+    index = NameIndex(entries)
+    negative_filter = None
+    if settings.NEGATIVE_FILTER_ENABLED:
+        negative_filter = NameFilter((name.split() for _, name in entries), rfcs)
+    return index, negative_filter
+
+async def refresh_name_index() -> Optional[NameIndex]:
+    """
+    Rebuilds the index (and the negative pre-check filter) from the database and swaps
+    them in atomically. Searches use SQL while a rebuild for a newer version runs.
+    """
+    global _index, _index_version, _negative_filter
+    async with _rebuild_lock:
+        version = await get_dataset_version()
+        if _index is not None and _index_version == version:
+            return _index
+
+        started = time.perf_counter()
+        entries, rfcs = await _load_entries()
+        # Building is CPU bound; run it off the event loop thread
+        index, negative_filter = await asyncio.to_thread(_build, entries, rfcs)
+        _index, _index_version, _negative_filter = index, version, negative_filter
+        logger.info(f"Name index built: {len(index)} names, version {version}, {time.perf_counter() - started:.2f}s")
+        if negative_filter is not None:
+            logger.info(f"Negative filter built: {len(negative_filter)} tokens, {negative_filter.nbytes} bytes")
+        return index
+
+async def get_current_name_index() -> Optional[NameIndex]:
+    """
+    Returns the loaded index, scheduling a background rebuild when the dataset version moved
+    or no index was built yet (e.g. the startup build failed). Failed rebuilds are retried
+    with exponential backoff (NAME_INDEX_RETRY_SECONDS up to NAME_INDEX_RETRY_MAX_SECONDS).
+    Returns None when the index is disabled, not built yet or outdated; searches then use
+    SQL until the rebuild lands, so results cached under the new version are never stale.
+    """
+    if not settings.NAME_INDEX_ENABLED:
+        return None
+
+    version = await get_dataset_version()
+    if _index is None or version != _index_version:
+        if not _rebuild_lock.locked() and time.monotonic() >= _next_rebuild_at:
+            task = asyncio.create_task(_refresh_in_background())
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+        return None
+    return _index
+
+async def get_current_negative_filter() -> Optional[NameFilter]:
+    """
+    The negative pre-check filter, only while it matches the current dataset version.
+    """
+    if not settings.NEGATIVE_FILTER_ENABLED or await get_current_name_index() is None:
+        return None
+    return _negative_filter
+
+async def _refresh_in_background():
+    global _rebuild_failures, _next_rebuild_at
+    try:
+        await refresh_name_index()
+        _rebuild_failures = 0
+    except Exception as e:
+        _rebuild_failures += 1
+        delay = min(settings.NAME_INDEX_RETRY_SECONDS * 2 ** (_rebuild_failures - 1), settings.NAME_INDEX_RETRY_MAX_SECONDS)
+        _next_rebuild_at = time.monotonic() + delay
+        logger.error(f"Name index rebuild failed ({_rebuild_failures} in a row, next attempt in {delay:.0f}s): {e}")
@@ -0,0 +1,118 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+from uuid import UUID
+import asyncio
+import logging
+import time
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.session import async_session
+from app.models.entity_profile import EntityProfile
+from app.models.sanction import Sanction
+from app.services.dataset_version import get_dataset_version
+
+logger = logging.getLogger(__name__)
+
+class ProfileMember(NamedTuple):
+    """
+    Summary fields of a clustered sanction, enough to serialize it as a SanctionMatch.
+    """
+    id: int
+    entity_name: Optional[str]
+    reference_number: Optional[str]
+    program: Optional[str]
+    source: Optional[str]
+    profile_id: UUID
+
+class ProfileMap:
+    """
+    Immutable profile_id -> members map used to expand search results to
+    their whole EntityProfile without another database round trip.
+    """
+
+    def __init__(self, members: Iterable[ProfileMember], primary_names: Dict[UUID, str]):
+        self.primary_names = dict(primary_names)
+        self._members: Dict[UUID, List[ProfileMember]] = {}
+        for member in members:
+            self._members.setdefault(member.profile_id, []).append(member)
+        for group in self._members.values():
+            group.sort(key=lambda m: m.id)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def members(self, profile_id: UUID) -> List[ProfileMember]:
+        return self._members.get(profile_id, [])
+
+    def primary_name(self, profile_id: UUID) -> Optional[str]:
+        return self.primary_names.get(profile_id)
+
+_map: Optional[ProfileMap] = None
+_map_version: Optional[int] = None
+_rebuild_lock = asyncio.Lock()
+_background_tasks: Set[asyncio.Task] = set()
+_rebuild_failures = 0
+_next_rebuild_at = 0.0 # time.monotonic() before which no background reload is scheduled
+
+# Projected columns matching ProfileMember
+MEMBER_COLUMNS = (
+    Sanction.id, Sanction.entity_name, Sanction.reference_number,
+    Sanction.program, Sanction.source, Sanction.profile_id,
+)
+
+def get_profile_map() -> Optional[ProfileMap]:
+    return _map
+
+async def refresh_profile_map() -> Optional[ProfileMap]:
+    """
+    Reloads the membership map from the database and swaps it in atomically.
+    """
+    global _map, _map_version
+    async with _rebuild_lock:
+        version = await get_dataset_version()
+        if _map is not None and _map_version == version:
+            return _map
+
+        started = time.perf_counter()
+        async with async_session() as db:
+            members = await db.execute(select(*MEMBER_COLUMNS).filter(Sanction.profile_id.isnot(None)))
+            profiles = await db.execute(select(EntityProfile.id, EntityProfile.primary_name))
+            profile_map = ProfileMap(
+                (ProfileMember(*row) for row in members.all()),
+                {profile_id: name for profile_id, name in profiles.all()},
+            )
+        _map, _map_version = profile_map, version
+        logger.info(f"Profile map built: {len(profile_map)} profiles, version {version}, {time.perf_counter() - started:.2f}s")
+        return profile_map
+
+async def get_current_profile_map() -> Optional[ProfileMap]:
+    """
+    Returns the loaded map, scheduling a background reload when the dataset version moved
+    (syncs and cluster_by_rfc bump it) or no map was built yet (e.g. the startup build
+    failed). Failed reloads are retried with exponential backoff (PROFILE_MAP_RETRY_SECONDS
+    up to PROFILE_MAP_RETRY_MAX_SECONDS). Returns None when disabled, not built yet or
+    outdated, so callers query the database instead of caching stale clusters.
+    """
+    if not settings.PROFILE_MAP_ENABLED:
+        return None
+
+    version = await get_dataset_version()
+    if _map is None or version != _map_version:
+        if not _rebuild_lock.locked() and time.monotonic() >= _next_rebuild_at:
+            task = asyncio.create_task(_refresh_in_background())
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+        return None
+    return _map
+
+async def _refresh_in_background():
+    global _rebuild_failures, _next_rebuild_at
+    try:
+        await refresh_profile_map()
+        _rebuild_failures = 0
+    except Exception as e:
+        _rebuild_failures += 1
+        delay = min(settings.PROFILE_MAP_RETRY_SECONDS * 2 ** (_rebuild_failures - 1), settings.PROFILE_MAP_RETRY_MAX_SECONDS)
+        _next_rebuild_at = time.monotonic() + delay
+        logger.error(f"Profile map reload failed ({_rebuild_failures} in a row, next attempt in {delay:.0f}s): {e}")
@@ -1,11 +1,9 @@
 
 from sqlalchemy import select
-from openai import AsyncOpenAI
-from app.db.session import async_session
+from app.db.session import async_session, get_read_session_factory
 from app.models.entity import EntityDocument
 from app.core.config import settings
-
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+from app.services.embedding_providers import get_embedding_provider
 
 async def ingest_entity(name: str, description: str, source: str):
     """
@@ -13,12 +11,9 @@ async def ingest_entity(name: str, description: str, source: str):
     """
     text_to_embed = f"{name}: {description}"
     
-    # 1. Call OpenAI to get the vector
-    response = await client.embeddings.create(
-        input=text_to_embed,
-        model="text-embedding-3-small"
-    )
-    vector_data = response.data[0].embedding # List of 1536 floats
+    # 1. Get the vector from the configured provider (OpenAI or local)
+    provider = get_embedding_provider(settings.RAG_EMBEDDING_MODEL)
+    vector_data = (await provider.embed([text_to_embed]))[0] # List of 1536 floats
 
     # 2. Save to Postgres
     async with async_session() as session:
@@ -36,13 +31,11 @@ async def search_similar_entities(query_text: str, limit: int = 5):
     Search for similar entities using pgvector.
     """
     # 1. Convert user query to vector
-    response = await client.embeddings.create(
-        input=query_text,
-        model="text-embedding-3-small"
-    )
-    query_vector = response.data[0].embedding
+    provider = get_embedding_provider(settings.RAG_EMBEDDING_MODEL)
+    query_vector = (await provider.embed([query_text]))[0]
 
-    async with async_session() as session:
+    read_session = await get_read_session_factory()
+    async with read_session() as session:
         # 2. Query using pgvector to order by similarity (L2 distance)
         stmt = select(EntityDocument).order_by(
             EntityDocument.embedding.l2_distance(query_vector)
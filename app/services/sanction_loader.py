@@ -0,0 +1,184 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.etl.normalizer import sanction_name_rows
+from app.services.etl.streaming import batched
+
+logger = logging.getLogger(__name__)
+
+# Sanction columns the parsers produce; id, profile_id and embedding are never written by a sync.
+# Only the columns present in the records are loaded, so a source that does not provide
+# a field (e.g. rfc for MEX) leaves the stored value alone, as the ORM updates did.
+LOAD_COLUMNS = (
+    "data_id", "entity_name", "rfc", "un_list_type",
+    "reference_number", "listed_on", "gender", "nationality", "designation", "aliases",
+    "addresses", "birth_dates", "birth_places", "documents", "remarks", "program",
+    "source", "sanction_date", "last_updated",
+)
+JSON_COLUMNS = frozenset({"designation", "aliases", "addresses", "birth_dates", "birth_places", "documents"})
+NAME_COLUMNS = ("name", "normalized_name", "name_type", "quality", "script", "tokens", "token_signature", "phonetic_keys")
+
+COPY_BATCH_SIZE = 5000 # Records per COPY round trip
+UPSERT_BATCH_SIZE = 20000 # Staged records per INSERT ... ON CONFLICT statement
+
+STAGING_TABLE = "sanction_staging"
+NAME_STAGING_TABLE = "sanction_name_staging"
+CHANGED_TABLE = "sanction_changed" # Ids of the rows created or updated by this load
+
+async def _driver_connection(db: AsyncSession):
+    """
+    The asyncpg connection behind the session, inside the session's transaction.
+    """
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    return raw.driver_connection
+
+async def _create_staging(db: AsyncSession, columns: Sequence[str]):
+    # ON COMMIT DROP: the staging tables live exactly as long as the sync transaction
+    await db.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}, {NAME_STAGING_TABLE}, {CHANGED_TABLE}"))
+    await db.execute(text(
+        f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+        f"SELECT {', '.join(columns)}, content_hash FROM sanction WITH NO DATA"
+    ))
+    await db.execute(text(f"ALTER TABLE {STAGING_TABLE} ADD COLUMN ord bigint"))
+    await db.execute(text(f"CREATE TEMP TABLE {CHANGED_TABLE} (id integer, data_id varchar) ON COMMIT DROP"))
+    await db.execute(text(f"""
+        CREATE TEMP TABLE {NAME_STAGING_TABLE} (
+            ord bigint, data_id varchar, name varchar, normalized_name varchar, name_type varchar,
+            quality varchar, script varchar, tokens varchar[], token_signature varchar,
+            phonetic_keys varchar[]
+        ) ON COMMIT DROP
+    """))
+
+def content_hash(record: Dict[str, Any], columns: Sequence[str]) -> str:
+    """
+    Stable SHA-256 of the loaded columns of a parsed record (keys sorted, dates as ISO
+    strings), so an unchanged upstream record always hashes the same.
+    """
+    payload = json.dumps({c: record.get(c) for c in columns}, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _value(column: str, value: Any) -> Any:
+    # asyncpg takes json as text; the JSON type used to store None as JSON null too
+    return json.dumps(value, default=str) if column in JSON_COLUMNS else value
+
+def _staging_rows(records: List[Dict[str, Any]], columns: Sequence[str], first_ord: int) -> Tuple[List[tuple], List[tuple]]:
+    sanction_rows, name_rows = [], []
+    for ord_, item in enumerate(records, first_ord):
+        sanction_rows.append((*(_value(c, item.get(c)) for c in columns), content_hash(item, columns), ord_))
+        for row in sanction_name_rows(item.get("entity_name"), item.get("aliases")):
+            name_rows.append((ord_, item["data_id"], *(row[c] for c in NAME_COLUMNS)))
+    return sanction_rows, name_rows
+
+def has_changes(result: Dict[str, int]) -> bool:
+    """
+    Whether a load wrote anything; an all-unchanged sync must not invalidate caches.
+    """
+    return bool(result["created"] or result["updated"] or result["deleted"])
+
+async def load_sanctions(
+    db: AsyncSession, records: Iterable[Dict[str, Any]], source: str, delete_missing: bool = True
+) -> Dict[str, int]:
+    """
+    Bulk-loads the parsed records of one source (consumed lazily, in chunks):
+    1. COPY into temporary staging tables (sanctions and their names/aliases).
+    2. Set-based INSERT ... ON CONFLICT (data_id) DO UPDATE, one statement per
+       UPSERT_BATCH_SIZE staged records. Rows whose content_hash did not change are
+       not written at all (no dead tuples, WAL or index churn); created/updated come
+       from RETURNING (xmax = 0), unchanged is the rest.
+    3. Replaces the sanction_name rows of the created/updated sanctions only.
+    4. One anti-join DELETE of the `source` rows absent from the file (full syncs only;
+       pass delete_missing=False for additive loads such as manual uploads).
+    Records without data_id are skipped; for repeated data_ids the last one wins.
+    Runs in the caller's transaction, which must commit.
+    """
+    columns: Optional[List[str]] = None
+    driver = None
+    staged = skipped = 0
+
+    for batch in batched(records, COPY_BATCH_SIZE):
+        keyed = [item for item in batch if item.get("data_id")]
+        skipped += len(batch) - len(keyed)
+        if not keyed:
+            continue
+        if columns is None:
+            columns = [c for c in LOAD_COLUMNS if c in keyed[0]]
+            await _create_staging(db, columns)
+            driver = await _driver_connection(db)
+
+        sanction_rows, name_rows = _staging_rows(keyed, columns, staged)
+        await driver.copy_records_to_table(STAGING_TABLE, records=sanction_rows, columns=[*columns, "content_hash", "ord"])
+        await driver.copy_records_to_table(NAME_STAGING_TABLE, records=name_rows, columns=["ord", "data_id", *NAME_COLUMNS])
+        staged += len(keyed)
+
+    if skipped:
+        logger.warning(f"{skipped} {source} records without data_id skipped")
+    if not staged:
+        return {"created": 0, "updated": 0, "unchanged": 0, "deleted": 0, "total_active": 0}
+
+    # Temp tables are never auto-analyzed; the joins below need real row counts
+    await db.execute(text(f"CREATE INDEX ON {STAGING_TABLE} (ord)"))
+    await db.execute(text(f"ANALYZE {STAGING_TABLE}"))
+    await db.execute(text(f"ANALYZE {NAME_STAGING_TABLE}"))
+    await db.execute(text(f"""
+        DELETE FROM {STAGING_TABLE} a USING {STAGING_TABLE} b
+        WHERE a.data_id = b.data_id AND a.ord < b.ord
+    """))
+    total_active = (await db.execute(text(f"SELECT count(*) FROM {STAGING_TABLE}"))).scalar()
+
+    column_list = ", ".join([*columns, "content_hash"])
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in [*columns, "content_hash"] if c != "data_id")
+    upsert = text(f"""
+        WITH upserted AS (
+            INSERT INTO sanction ({column_list})
+            SELECT {column_list} FROM {STAGING_TABLE}
+            WHERE ord >= :first AND ord < :last
+            ON CONFLICT (data_id) DO UPDATE SET {updates}
+            WHERE sanction.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+            RETURNING id, data_id, (xmax = 0) AS created
+        ), changed AS (
+            INSERT INTO {CHANGED_TABLE} SELECT id, data_id FROM upserted
+        )
+        SELECT count(*) FILTER (WHERE created), count(*) FILTER (WHERE NOT created) FROM upserted
+    """)
+    created = updated = 0
+    for first in range(0, staged, UPSERT_BATCH_SIZE):
+        # xmax = 0 only on freshly inserted tuples; updated ones carry the upserting xid
+        batch_created, batch_updated = (await db.execute(upsert, {"first": first, "last": first + UPSERT_BATCH_SIZE})).one()
+        created += batch_created
+        updated += batch_updated
+
+    await db.execute(text(f"""
+        DELETE FROM sanction_name n
+        USING {CHANGED_TABLE} c
+        WHERE n.sanction_id = c.id
+    """))
+    name_columns = ", ".join(NAME_COLUMNS)
+    await db.execute(text(f"""
+        INSERT INTO sanction_name (sanction_id, {name_columns})
+        SELECT c.id, {', '.join(f'n.{col}' for col in NAME_COLUMNS)}
+        FROM {NAME_STAGING_TABLE} n
+        JOIN {STAGING_TABLE} st ON st.data_id = n.data_id AND st.ord = n.ord
+        JOIN {CHANGED_TABLE} c ON c.data_id = n.data_id
+    """))
+
+    deleted = 0
+    if delete_missing:
+        # Scoped to the source: a UN file never deletes MEX or SAT rows (and vice versa)
+        deleted = (await db.execute(text(f"""
+            DELETE FROM sanction s
+            WHERE s.source = :source
+              AND NOT EXISTS (SELECT 1 FROM {STAGING_TABLE} st WHERE st.data_id = s.data_id)
+        """), {"source": source})).rowcount
+
+    unchanged = total_active - created - updated
+    logger.info(f"{source} loaded: {created} created, {updated} updated, {unchanged} unchanged, {deleted} deleted")
+    return {
+        "created": created, "updated": updated, "unchanged": unchanged,
+        "deleted": deleted, "total_active": total_active,
+    }
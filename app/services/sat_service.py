@@ -1,53 +1,40 @@
-from typing import List, Dict, Any
+from typing import BinaryIO, Dict, Any, Iterator, Union
 import logging
 import csv
-import io
 from datetime import datetime
+from itertools import chain
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy import delete
 
-from app.models.sanction import Sanction
+from app.services.etl.streaming import iter_text_lines
+from app.services.dataset_version import bump_dataset_version
+from app.services.sanction_loader import has_changes, load_sanctions
 
 logger = logging.getLogger(__name__)
 
-def parse_sat_csv(csv_content: bytes) -> List[Dict[str, Any]]:
+def iter_sat_csv(source: Union[bytes, BinaryIO]) -> Iterator[Dict[str, Any]]:
     """
-    Parses the SAT 69-B CSV content.
+    Incrementally parses the SAT 69-B CSV (raw bytes or a binary file object),
+    yielding one record per row; memory stays flat regardless of the list size.
     Skips lines until header is found.
     Mappings:
       - RFC -> rfc
       - Nombre del Contribuyente -> entity_name
       - Situación del Contribuyente -> remarks / program
     """
-    # Decode latin-1 or utf-8 (SAT often uses latin-1/windows-1252)
-    try:
-        decoded_content = csv_content.decode('utf-8')
-    except UnicodeDecodeError:
-        decoded_content = csv_content.decode('latin-1')
-
-    # Read lines
-    lines = decoded_content.splitlines()
-    
-    # Find start line (header)
-    start_index = 0
-    header_found = False
+    # Decoded lazily: utf-8, falling back to latin-1 (SAT often uses latin-1/windows-1252)
+    lines = iter_text_lines(source)
     
+    # Find start line (header); the preamble lines are consumed and dropped
     # Common headers: "No.", "RFC", "Nombre del Contribuyente"
-    for i, line in enumerate(lines):
-        if "RFC" in line and "Nombre del Contribuyente" in line:
-            start_index = i
-            header_found = True
-            break
+    header = next((line for line in lines if "RFC" in line and "Nombre del Contribuyente" in line), None)
             
-    if not header_found:
+    if header is None:
         logger.error("SAT CSV Header not found")
-        return []
+        return
 
-    # Parse content from start_index
+    # Parse the rest of the stream from the header
     # We use DictReader but need to handle potential bad lines
-    reader = csv.DictReader(lines[start_index:])
-    parsed_data = []
+    reader = csv.DictReader(chain([header], lines))
 
     for row in reader:
         try:
@@ -97,69 +84,29 @@ def parse_sat_csv(csv_content: bytes) -> List[Dict[str, Any]]:
                 "birth_places": [],
                 "documents": []
             }
-            parsed_data.append(item)
+            yield item
             
         except Exception as e:
             logger.warning(f"Error parsing SAT row: {e}")
             continue
-            
-    return parsed_data
 
-async def sync_sat_sanctions_data(db: AsyncSession, csv_content: bytes) -> Dict[str, int]:
+async def sync_sat_sanctions_data(db: AsyncSession, csv_content: Union[bytes, BinaryIO]) -> Dict[str, int]:
     """
-    Synchronizes the database with the SAT 69-B CSV.
+    Synchronizes the database with the SAT 69-B CSV (bytes or a binary file object).
+    Rows are parsed as the loader consumes them, in COPY-sized chunks.
     """
+    # COPY into staging, one set-based upsert and a delete scoped to SAT_69B
     try:
-        parsed_data = parse_sat_csv(csv_content)
+        result = await load_sanctions(db, iter_sat_csv(csv_content), source="SAT_69B")
     except Exception as e:
-        logger.error(f"Failed to parse SAT CSV for sync: {e}")
+        logger.error(f"Failed to load SAT 69-B CSV: {e}")
+        await db.rollback()
         raise e
 
-    csv_data_ids = set()
-    count_created = 0
-    count_updated = 0
-    
-    # 1. Upsert Logic
-    for item in parsed_data:
-        data_id = item.get("data_id")
-        if not data_id:
-            continue
-            
-        csv_data_ids.add(data_id)
-        
-        # Check existence
-        result = await db.execute(select(Sanction).filter(Sanction.data_id == data_id))
-        existing_sanction = result.scalars().first()
-        
-        if existing_sanction:
-            # Update
-            for key, value in item.items():
-                setattr(existing_sanction, key, value)
-            count_updated += 1
-        else:
-            # Insert
-            new_sanction = Sanction(**item)
-            db.add(new_sanction)
-            count_created += 1
-            
-    # 2. Delete Logic (Scoped to SAT_69B source)
-    
-    result_all = await db.execute(select(Sanction.data_id).filter(Sanction.source == "SAT_69B"))
-    db_data_ids = set(result_all.scalars().all())
-    
-    ids_to_delete = db_data_ids - csv_data_ids
-    count_deleted = len(ids_to_delete)
-    
-    if ids_to_delete:
-         await db.execute(delete(Sanction).where(Sanction.data_id.in_(ids_to_delete)))
-        
     await db.commit()
+    if has_changes(result):
+        await bump_dataset_version()
     
-    logger.info(f"SAT 69-B Sync complete. Created: {count_created}, Updated: {count_updated}, Deleted: {count_deleted}")
+    logger.info(f"SAT 69-B Sync complete. Created: {result['created']}, Updated: {result['updated']}, Unchanged: {result['unchanged']}, Deleted: {result['deleted']}")
     
-    return {
-        "created": count_created,
-        "updated": count_updated,
-        "deleted": count_deleted,
-        "total_active": len(csv_data_ids)
-    }
+    return result
@@ -0,0 +1,78 @@
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.schemas.search_schema import SanctionMatch
+from app.services.etl.normalizer import normalize_name
+
+logger = logging.getLogger(__name__)
+
+# In-process LRU in front of Redis. Keys embed the dataset version, so a sync
+# (or re-clustering) makes every older entry unreachable instead of stale.
+_memory_cache: "OrderedDict[str, List[SanctionMatch]]" = OrderedDict()
+_memory_version: Optional[int] = None
+
+_stats: Dict[str, int] = {
+    "memory_hits": 0,
+    "redis_hits": 0,
+    "misses": 0,
+    "errors": 0,
+}
+
+def search_cache_key(version: int, query: str, limit: int, **params: Any) -> str:
+    """
+    Key over the normalized query, limit and every parameter that changes the result.
+    """
+    payload = {"q": normalize_name(query), "limit": limit}
+    payload.update({k: (str(v) if v is not None else None) for k, v in sorted(params.items())})
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"search:v{version}:{digest}"
+
+def search_cache_stats() -> Dict[str, int]:
+    lookups = _stats["memory_hits"] + _stats["redis_hits"] + _stats["misses"]
+    return {**_stats, "lookups": lookups, "memory_size": len(_memory_cache), "version": _memory_version}
+
+def _remember(version: int, key: str, results: List[SanctionMatch]):
+    global _memory_version
+    if version != _memory_version:
+        _memory_cache.clear()
+        _memory_version = version
+    _memory_cache[key] = results
+    _memory_cache.move_to_end(key)
+    while len(_memory_cache) > settings.SEARCH_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+async def get_cached_results(version: int, key: str) -> Optional[List[SanctionMatch]]:
+    cached = _memory_cache.get(key) if version == _memory_version else None
+    if cached is not None:
+        _memory_cache.move_to_end(key)
+        _stats["memory_hits"] += 1
+        return list(cached)
+
+    try:
+        raw = await get_redis().get(key)
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning(f"Search cache read failed: {e}")
+        raw = None
+    if raw is not None:
+        results = [SanctionMatch.model_validate(item) for item in json.loads(raw)]
+        _stats["redis_hits"] += 1
+        _remember(version, key, results)
+        return list(results)
+
+    _stats["misses"] += 1
+    return None
+
+async def set_cached_results(version: int, key: str, results: List[SanctionMatch]):
+    _remember(version, key, list(results))
+    try:
+        payload = json.dumps([r.model_dump(mode="json") for r in results])
+        await get_redis().set(key, payload, ex=settings.SEARCH_CACHE_TTL_SECONDS)
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning(f"Search cache write failed: {e}")
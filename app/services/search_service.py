@@ -1,142 +1,584 @@
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from datetime import date
+from functools import partial, reduce
+import asyncio
+import base64
+import json
 import logging
+import operator
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text, or_, String, cast
+from sqlalchemy import select, or_, Float, Integer, String, cast, func, literal, union_all, any_, bindparam, null, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from app.models.sanction import Sanction
-from openai import AsyncOpenAI
-import logging
+from app.models.sanction_name import SanctionName
+from app.schemas.search_schema import ProfileMatch, SanctionMatch
 from app.core.config import settings
+from app.core.metrics import span
+from app.db.session import read_is_current
+from app.services.embedding_service import get_embedding
+from app.services.etl.normalizer import is_latin_script, name_token_set, normalize_name, tokenize_name
+from app.services.etl.phonetics import phonetic_keys, phonetic_min_shared
+from app.services.name_index import NameIndex, get_current_name_index, get_current_negative_filter
+from app.services.match_scoring import UNMATCHED_NAME_MAX_SCORE, score_candidates
+from app.services.dataset_version import get_dataset_version
+from app.services.profile_map import MEMBER_COLUMNS, ProfileMember, get_current_profile_map, get_profile_map
+from app.services.search_cache import get_cached_results, search_cache_key, set_cached_results
 
 logger = logging.getLogger(__name__)
 
-# ...
+STREAM_CHUNK_SIZE = 100 # Results expanded and written per chunk by the NDJSON stream
+HNSW_EF_SEARCH_MAX = 1000 # pgvector rejects larger hnsw.ef_search values
+SCORING_THREAD_MIN_CANDIDATES = 500 # Larger candidate sets (page/stream depth) are scored off the event loop
+
+async def search_sanctions(
+    db: AsyncSession,
+    query: str,
+    limit: int = 10,
+    threshold: Optional[float] = None,
+    birth_date: Optional[date] = None,
+    nationality: Optional[str] = None,
+    rfc: Optional[str] = None,
+    use_cache: bool = True,
+    stats: Optional[Dict[str, Any]] = None,
+) -> List[SanctionMatch]:
+    """
+    Cached entry point: results are keyed by the normalized query, limit, filters
+    and the dataset version, so they are served from memory/Redis until the next
+    sync or re-clustering bumps the version. Results read from a lagging replica
+    are returned but not cached.
 
-async def get_embedding(text: str) -> List[float]:
-    # ... (unchanged)
-    if not settings.OPENAI_API_KEY or settings.OPENAI_API_KEY == "sk-placeholder":
-        logger.warning("OpenAI API Key not set. Skipping vector generation.")
+    Clean screens are answered first by the negative pre-check (negative_filter.NameFilter,
+    an exact upper bound of the token similarity the scorer needs, plus RFCs): when no
+    query token can match, no candidate can reach `threshold` and [] is returned without
+    touching the DB, the cache or the embedding API. `stats`, when given, receives
+    {"negative_filter": True} on such a short-circuit.
+    """
+    if threshold is None:
+        threshold = settings.SEARCH_MATCH_THRESHOLD
+    if await _is_clean_screen(query, threshold, rfc, stats):
         return []
 
-    client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-    
-    try:
-        response = await client.embeddings.create(
-            input=text,
-            model="text-embedding-ada-002"
+    if not (use_cache and settings.SEARCH_CACHE_ENABLED):
+        return await _search_sanctions(db, query, limit, threshold, birth_date, nationality, rfc)
+
+    with span("cache_lookup"):
+        version = await get_dataset_version()
+        key = search_cache_key(
+            version, query, limit,
+            threshold=threshold, birth_date=birth_date,
+            nationality=normalize_name(nationality) or None,
+            rfc=rfc.strip().upper() if rfc else None,
         )
-        return response.data[0].embedding
-    except Exception as e:
-        logger.error(f"Error generating embedding: {e}")
+        cached = await get_cached_results(version, key)
+    if cached is not None:
+        return cached
+
+    results = await _search_sanctions(db, query, limit, threshold, birth_date, nationality, rfc)
+    with span("cache_store"):
+        # A lagging replica may not have replayed the sync behind `version` yet; its rows
+        # must not be cached under that version for the whole TTL
+        if await read_is_current(db):
+            await set_cached_results(version, key, results)
+        else:
+            logger.info("Search results not cached: read replica is behind the primary")
+    return results
+
+async def _is_clean_screen(query: str, threshold: float, rfc: Optional[str], stats: Optional[Dict[str, Any]]) -> bool:
+    # Only sound while the threshold is above what an unmatched name can score. Queries with
+    # non-Latin letters always run fully: the vector stage is their only way in.
+    if threshold <= UNMATCHED_NAME_MAX_SCORE or not is_latin_script(query):
+        return False
+    with span("negative_filter"):
+        negative_filter = await get_current_negative_filter()
+        # A few ms of numpy per uncached token: keep it off the event loop
+        clean = negative_filter is not None and not await asyncio.to_thread(
+            negative_filter.might_match, tokenize_name(query), rfc
+        )
+    if clean and stats is not None:
+        stats["negative_filter"] = True
+    return clean
+
+async def search_matches(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    threshold: Optional[float] = None,
+    birth_date: Optional[date] = None,
+    nationality: Optional[str] = None,
+    rfc: Optional[str] = None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> List[SanctionMatch]:
+    """
+    Uncached search returning the scored matches before cluster expansion, in
+    match_sort_key order. Used by the NDJSON stream, which expands them chunk by chunk
+    with iter_expanded_clusters while it writes the response.
+    """
+    if threshold is None:
+        threshold = settings.SEARCH_MATCH_THRESHOLD
+    if await _is_clean_screen(query, threshold, rfc, stats):
         return []
+    return await _score_matches(db, query, limit, threshold, birth_date, nationality, rfc)
+
+async def _search_sanctions(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    threshold: float,
+    birth_date: Optional[date],
+    nationality: Optional[str],
+    rfc: Optional[str],
+) -> List[SanctionMatch]:
+    matches = await _score_matches(db, query, limit, threshold, birth_date, nationality, rfc)
+    with span("expand_clusters"):
+        return await expand_clusters(db, matches)
 
-async def search_sanctions(db: AsyncSession, query: str, limit: int = 10, threshold: float = 0.8) -> List[Sanction]:
+async def _score_matches(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    threshold: float,
+    birth_date: Optional[date],
+    nationality: Optional[str],
+    rfc: Optional[str],
+) -> List[SanctionMatch]:
     """
-    Performs a hybrid search:
-    1. Exact Match (High Priority)
-    2. Fuzzy Match (Trigram)
+    Performs a hybrid search in a single database round trip:
+    1. Exact Match (substring of any name or alias, sanction_name table)
+    1b. Token Match (same words in any order, sanction_name token set)
+    2. Fuzzy Match (Trigram, sanction_name table)
+    2b. Phonetic Match (Spanish phonetic keys, GIN array overlap)
     3. Vector Match (Semantic) - if configured
+
+    All stages are evaluated and fused with weighted reciprocal rank fusion,
+    fused_score = sum(weight_stage / (SEARCH_RRF_K + rank_stage)).
+    When the in-memory name index is loaded it supplies the exact/fuzzy ranks
+    and the single statement only runs the vector stage plus hydration.
+
+    Every fused candidate then gets a normalized match score (see match_scoring);
+    candidates below `threshold` (default SEARCH_MATCH_THRESHOLD) are dropped.
+
+    Each step is timed with app.core.metrics.span: embedding, index_lookup,
+    db_candidates and scoring. Returns the best `limit` matches, before cluster expansion.
     """
-    results = []
-    seen_ids = set()
+    with span("embedding"):
+        embedding = await get_embedding(query)
+    depth = max(limit, settings.SEARCH_CANDIDATE_DEPTH)
+
+    if embedding:
+        await _set_ef_search(db, depth)
+
+    index = await get_current_name_index()
+    if index is not None:
+        candidates = await _index_hybrid_search(db, index, query, embedding, depth)
+    else:
+        # Exact, fuzzy, token, phonetic and vector stages plus hydration are one statement
+        with span("db_candidates"):
+            await set_trgm_thresholds(db)
+            candidates = await _sql_hybrid_search(db, query, embedding, depth)
+
+    with span("scoring"):
+        rows = [row for row, _, _ in candidates]
+        score = partial(
+            score_candidates, query, rows, birth_date=birth_date, nationality=nationality, rfc=rfc,
+            # Name score of queries without Latin tokens: cosine similarity of the vector stage
+            fallback_scores=[1.0 - row.vector_distance if row.vector_distance is not None else 0.0 for row in rows]
+        )
+        scores = await asyncio.to_thread(score) if len(rows) >= SCORING_THREAD_MIN_CANDIDATES else score()
+        matches = [
+            _to_match(row, float(score), fused_score, stages)
+            for (row, fused_score, stages), score in zip(candidates, scores)
+            if score >= threshold
+        ]
+        matches.sort(key=match_sort_key)
+    return matches[:limit]
+
+# Columns hydrated for candidates: the serialized fields plus what match scoring reads.
+# JSON-heavy columns not needed here (addresses, documents...) and the embedding stay in the DB.
+SEARCH_COLUMNS = (
+    Sanction.id, Sanction.entity_name, Sanction.reference_number, Sanction.program,
+    Sanction.source, Sanction.profile_id, Sanction.rfc, Sanction.aliases,
+    Sanction.birth_dates, Sanction.nationality,
+)
+
+# (projected sanction row, fused rank score, stages that produced it). Rows also carry
+# vector_distance, the cosine distance of the vector stage (None when it did not return them).
+FusedCandidate = Tuple[Any, float, List[str]]
+
+def _stage_weight(stage: str) -> float:
+    return {
+        "exact": settings.SEARCH_WEIGHT_EXACT,
+        "token": settings.SEARCH_WEIGHT_TOKEN,
+        "fuzzy": settings.SEARCH_WEIGHT_FUZZY,
+        "phonetic": settings.SEARCH_WEIGHT_PHONETIC,
+        "vector": settings.SEARCH_WEIGHT_VECTOR,
+    }[stage]
+
+def _rrf(stage: str, rank: int) -> float:
+    return _stage_weight(stage) / (settings.SEARCH_RRF_K + rank)
 
-    # 1. Exact Match (High Priority)
-    stmt_exact = select(Sanction).filter(
+def _ranked_cte(name: str, inner, ascending: bool):
+    """
+    Candidate CTE with (id, score, rank) from an inner (id, score) query. The inner query
+    keeps its ORDER BY ... LIMIT shape so Postgres can serve it from an index,
+    the outer query numbers the rows.
+    """
+    inner = inner.subquery()
+    outer_order = inner.c.score.asc() if ascending else inner.c.score.desc()
+    return select(inner.c.id, inner.c.score, func.row_number().over(order_by=outer_order).label("rank")).cte(name)
+
+async def _set_ef_search(db: AsyncSession, depth: int):
+    """
+    Sets hnsw.ef_search for the current transaction only (SET LOCAL semantics).
+    HNSW returns at most ef_search rows, so it never goes below the candidate depth, up to
+    pgvector's limit of 1000 (deeper vector stages are capped there).
+    """
+    ef_search = min(max(settings.HNSW_EF_SEARCH, depth), HNSW_EF_SEARCH_MAX)
+    await db.execute(text("SELECT set_config('hnsw.ef_search', :value, true)"), {"value": str(ef_search)})
+
+async def set_trgm_thresholds(db: AsyncSession):
+    """
+    Sets the pg_trgm cut-offs of the '%' and '<%' operators for the current transaction
+    only, so the SQL fuzzy stage filters like the in-memory index instead of relying on
+    the server defaults.
+    """
+    await db.execute(
+        text(
+            "SELECT set_config('pg_trgm.similarity_threshold', :similarity, true), "
+            "set_config('pg_trgm.word_similarity_threshold', :word_similarity, true)"
+        ),
+        {
+            "similarity": str(settings.NAME_INDEX_FUZZY_THRESHOLD),
+            "word_similarity": str(settings.SEARCH_FUZZY_WORD_THRESHOLD),
+        }
+    )
+
+def _vector_cte(embedding: List[float], depth: int):
+    distance = Sanction.embedding.cosine_distance(embedding)
+    inner = select(Sanction.id.label("id"), distance.label("score")).filter(
+        Sanction.embedding.isnot(None)
+    ).order_by(distance).limit(depth)
+    return _ranked_cte("vector", inner, True)
+
+def _name_cte(name: str, distance, depth: int, *criteria):
+    """
+    Candidate CTE over sanction_name: every primary name and alias is its own
+    indexed row, ranked by the best (smallest) distance per sanction.
+    """
+    best = func.min(distance)
+    inner = select(SanctionName.sanction_id.label("id"), best.label("score")).filter(
+        *criteria
+    ).group_by(SanctionName.sanction_id).order_by(best).limit(depth)
+    return _ranked_cte(name, inner, True)
+
+def _token_cte(tokens: List[str], depth: int):
+    """
+    Names containing every query token in any order: the sorted-token signature
+    answers full permutations through its b-tree index, '@>' on the GIN-indexed
+    token set answers partial ones. Fewer extra tokens rank first.
+    """
+    extra = func.cardinality(SanctionName.tokens) - len(tokens)
+    return _name_cte(
+        "token", extra, depth,
         or_(
-            Sanction.entity_name.ilike(f"%{query}%"),
-            cast(Sanction.aliases, String).ilike(f"%{query}%") # Search in aliases JSON
+            SanctionName.token_signature == " ".join(tokens),
+            SanctionName.tokens.contains(cast(tokens, ARRAY(String)))
         )
-    ).limit(limit)
-    res_exact = await db.execute(stmt_exact)
-    exact_matches = res_exact.scalars().all()
-    
-    for m in exact_matches:
-        if m.id not in seen_ids:
-            results.append(m)
-            seen_ids.add(m.id)
-
-    if len(results) >= limit:
-        return await expand_clusters(db, results)
-
-    # 2. Fuzzy Match (Trigram)
-    # Requires pg_trgm extension enabled in DB
-    try:
-        async with db.begin_nested():
-            # Note: 'similarity' function comes from pg_trgm. 
-            # We order by similarity descending.
-            stmt_fuzzy = select(Sanction).filter(
-                text(f"similarity(entity_name, :query) > 0.3")
-            ).order_by(text(f"similarity(entity_name, :query) DESC")).limit(limit)
-            
-            res_fuzzy = await db.execute(stmt_fuzzy, {"query": query})
-            fuzzy_matches = res_fuzzy.scalars().all()
-            
-            for m in fuzzy_matches:
-                if m.id not in seen_ids:
-                    results.append(m)
-                    seen_ids.add(m.id)
-                
-            if len(results) >= limit:
-                return await expand_clusters(db, results[:limit])
+    )
 
-    except Exception as e:
-        logger.warning(f"Fuzzy search failed (ensure pg_trgm is enabled): {e}")
+def _phonetic_cte(keys: List[str], min_shared: int, depth: int):
+    """
+    Names sharing phonetic keys with the query, per name or alias like the in-memory
+    index: '&&' (array overlap) is served by the GIN index, sanctions are ranked by the
+    most query keys a single name contains.
+    """
+    shared = reduce(operator.add, [cast(literal(key) == any_(SanctionName.phonetic_keys), Integer) for key in keys])
+    return _name_cte(
+        "phonetic", -shared, depth,
+        SanctionName.phonetic_keys.overlap(cast(keys, ARRAY(String))),
+        # A single shared key (e.g. one common surname) is not a candidate on its own
+        shared >= min_shared
+    )
+
+async def _sql_hybrid_search(db: AsyncSession, query: str, embedding: List[float], depth: int) -> List[FusedCandidate]:
+    """
+    Evaluates exact, fuzzy and vector candidates server-side and fuses them in one statement.
+    """
+    stages = []
+    normalized = normalize_name(query)
+    if normalized:
+        # Predicates on sanction_name.normalized_name so its GIN gin_trgm_ops index applies.
+        # normalize_name output is [A-Z0-9 ], so it never contains LIKE wildcards.
+        # Exact hits rank the shortest (closest) containing name first.
+        exact = _name_cte(
+            "exact", func.length(SanctionName.normalized_name), depth,
+            SanctionName.normalized_name.like(f"%{normalized}%")
+        )
+        # pg_trgm operators: '%' (similarity, pg_trgm.similarity_threshold) and
+        # '<%' (word similarity, partial queries) filter through the index,
+        # '<->' / '<<->' rank by distance
+        distance = func.least(
+            SanctionName.normalized_name.op("<->")(normalized),
+            literal(normalized).op("<<->")(SanctionName.normalized_name)
+        )
+        fuzzy = _name_cte(
+            "fuzzy", distance, depth,
+            or_(
+                SanctionName.normalized_name.op("%")(normalized),
+                literal(normalized).op("<%")(SanctionName.normalized_name)
+            )
+        )
+        stages += [("exact", exact), ("fuzzy", fuzzy)]
+
+        tokens = name_token_set(normalized)
+        if len(tokens) >= 2:
+            # Single tokens are already covered by the exact stage
+            stages.append(("token", _token_cte(tokens, depth)))
+
+        keys = phonetic_keys(normalized.split())
+        if keys:
+            stages.append(("phonetic", _phonetic_cte(keys, phonetic_min_shared(normalized.split()), depth)))
 
-    # 3. Vector Search
-    embedding = await get_embedding(query)
     if embedding:
-        try:
-             async with db.begin_nested():
-                 # Using pgvector's cosine distance operator (<=>). 
-                 # We want closest distance, so order by embedding <=> query_vector
-                 stmt_vector = select(Sanction).order_by(
-                     Sanction.embedding.cosine_distance(embedding)
-                 ).limit(limit)
-                 
-                 res_vector = await db.execute(stmt_vector)
-                 vector_matches = res_vector.scalars().all()
-                 
-                 for m in vector_matches:
-                     if m.id not in seen_ids:
-                         results.append(m)
-                         seen_ids.add(m.id)
-
-        except Exception as e:
-            logger.warning(f"Vector search failed (ensure pgvector is enabled): {e}")
-
-    return await expand_clusters(db, results[:limit])
-
-from sqlalchemy.orm import selectinload
-
-async def expand_clusters(db: AsyncSession, results: List[Sanction]) -> List[Sanction]:
+        stages.append(("vector", _vector_cte(embedding, depth)))
+    if not stages:
+        return []
+
+    k = literal(settings.SEARCH_RRF_K, Float)
+    ranked = union_all(*[
+        select(
+            cte.c.id,
+            (literal(_stage_weight(stage), Float) / (k + cte.c.rank)).label("rrf"),
+            literal(stage).label("stage")
+        )
+        for stage, cte in stages
+    ]).subquery("ranked")
+
+    fused = select(
+        ranked.c.id,
+        func.sum(ranked.c.rrf).label("score"),
+        func.array_agg(ranked.c.stage).label("stages")
+    ).group_by(ranked.c.id).subquery("fused")
+
+    vector = dict(stages).get("vector")
+    stmt = select(
+        *SEARCH_COLUMNS, fused.c.score.label("fused_score"), fused.c.stages.label("fused_stages"),
+        (vector.c.score if vector is not None else null()).label("vector_distance")
+    ).join(fused, fused.c.id == Sanction.id)
+    if vector is not None:
+        stmt = stmt.outerjoin(vector, vector.c.id == Sanction.id)
+    stmt = stmt.order_by(fused.c.score.desc(), Sanction.id).limit(depth)
+
+    res = await db.execute(stmt)
+    return [(row, float(row.fused_score), list(row.fused_stages)) for row in res.all()]
+
+async def _index_hybrid_search(db: AsyncSession, index: NameIndex, query: str, embedding: List[float], depth: int) -> List[FusedCandidate]:
+    """
+    Exact/token/fuzzy/phonetic ranks come from the in-memory index; one statement runs the vector
+    stage and hydrates the union of candidates, fusion happens here.
+    """
+    with span("index_lookup"):
+        candidates = index.candidates(query, depth, min_similarity=settings.NAME_INDEX_FUZZY_THRESHOLD)
+
+    scores: Dict[int, float] = {}
+    stages: Dict[int, List[str]] = {}
+    for stage, ranked in candidates.items():
+        for rank, (sanction_id, _) in enumerate(ranked, 1):
+            scores[sanction_id] = scores.get(sanction_id, 0.0) + _rrf(stage, rank)
+            stages.setdefault(sanction_id, []).append(stage)
+
+    ids = list(scores)
+    if not ids and not embedding:
+        return []
+
+    index_ids = bindparam("ids", ids, type_=ARRAY(Integer))
+    if embedding:
+        # The vector CTE runs once (HNSW), its ids are appended to the index ids and every
+        # row is hydrated through the primary key: an OR across the outer join would make
+        # Postgres scan the whole sanction table instead
+        vector = _vector_cte(embedding, depth)
+        vector_ids = select(func.array_agg(vector.c.id)).scalar_subquery()
+        stmt = select(*SEARCH_COLUMNS, vector.c.rank.label("vector_rank"), vector.c.score.label("vector_distance")).outerjoin(
+            vector, vector.c.id == Sanction.id
+        ).filter(Sanction.id == any_(func.array_cat(index_ids, vector_ids, type_=ARRAY(Integer))))
+    else:
+        stmt = select(*SEARCH_COLUMNS, null().label("vector_rank"), null().label("vector_distance")).filter(Sanction.id == any_(index_ids))
+
+    # Vector stage (when there is an embedding) and hydration share this statement
+    with span("db_candidates"):
+        res = await db.execute(stmt)
+        fetched = res.all()
+    rows = {}
+    for row in fetched:
+        rows[row.id] = row
+        if row.vector_rank is not None:
+            scores[row.id] = scores.get(row.id, 0.0) + _rrf("vector", row.vector_rank)
+            stages.setdefault(row.id, []).append("vector")
+
+    # Rows deleted since the last index build are simply skipped
+    ordered = sorted((i for i in scores if i in rows), key=lambda i: (-scores[i], i))
+    return [(rows[i], scores[i], stages[i]) for i in ordered]
+
+def match_sort_key(match: SanctionMatch) -> Tuple[float, float, int]:
+    """
+    Total order of search results (best first); also the keyset used by paging cursors.
+    """
+    return (-match.score, -match.fused_score, match.id)
+
+def encode_cursor(match: SanctionMatch) -> str:
+    raw = json.dumps(list(match_sort_key(match))).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[float, float, int]:
+    """
+    Raises ValueError for malformed cursors.
+    """
+    try:
+        neg_score, neg_fused, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return (float(neg_score), float(neg_fused), int(last_id))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+async def search_sanctions_page(
+    db: AsyncSession,
+    query: str,
+    page_size: int = 50,
+    cursor: Optional[str] = None,
+    threshold: Optional[float] = None,
+    birth_date: Optional[date] = None,
+    nationality: Optional[str] = None,
+    rfc: Optional[str] = None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[SanctionMatch], Optional[str], bool]:
+    """
+    Keyset-paginated search over up to SEARCH_MAX_RESULTS matches (cluster siblings
+    included), ordered by match_sort_key. The deep result list is computed once per
+    dataset version and served from the result cache for the following pages.
+    Scores are computed in Python, so the cursor cannot be pushed into the candidate
+    SQL: matches past SEARCH_MAX_RESULTS are not reachable by paging.
+    Returns the page, the cursor of the next one (None on the last page) and whether
+    the deep list hit SEARCH_MAX_RESULTS (lower-scored matches may have been cut).
+    """
+    after = decode_cursor(cursor) if cursor else None
+    results = await search_sanctions(
+        db, query, limit=settings.SEARCH_MAX_RESULTS, threshold=threshold,
+        birth_date=birth_date, nationality=nationality, rfc=rfc, stats=stats
+    )
+    truncated = sum(1 for m in results if m.stages != ["cluster"]) >= settings.SEARCH_MAX_RESULTS
+    ordered = sorted(results, key=match_sort_key)
+    if after is not None:
+        ordered = [m for m in ordered if match_sort_key(m) > after]
+
+    page = ordered[:page_size]
+    next_cursor = encode_cursor(page[-1]) if len(ordered) > page_size else None
+    return page, next_cursor, truncated
+
+def _to_match(sanction: Any, score: float, fused_score: float, stages: List[str]) -> SanctionMatch:
+    match = SanctionMatch.model_validate(sanction)
+    match.score = round(score, 4)
+    match.fused_score = round(fused_score, 6)
+    match.stages = stages
+    return match
+
+async def _profile_members(db: AsyncSession, profile_ids: List[Any]) -> Dict[Any, List[ProfileMember]]:
+    profiles = await get_current_profile_map()
+    if profiles is not None:
+        return {pid: profiles.members(pid) for pid in profile_ids}
+
+    # Map not loaded (or outdated): one projected query for all profiles
+    res = await db.execute(select(*MEMBER_COLUMNS).filter(Sanction.profile_id.in_(profile_ids)).order_by(Sanction.id))
+    members: Dict[Any, List[ProfileMember]] = {}
+    for row in res.all():
+        members.setdefault(row.profile_id, []).append(ProfileMember(*row))
+    return members
+
+async def expand_clusters(db: AsyncSession, results: List[SanctionMatch]) -> List[SanctionMatch]:
     """
     For each result, checks if it belongs to a profile.
-    If so, fetches ALL other sanctions in that profile and adds them to the result set (if not present).
+    If so, adds ALL other sanctions in that profile to the result set (if not present).
     This ensures that if we find "El Chapo", we return ALL his linked records (UN, MEX, SAT).
+
+    Members come from the in-memory profile map (no extra query when it is loaded).
+    Each profile is emitted as a contiguous group at the position of its best match:
+    matched members keep their own score, siblings inherit the profile's best score
+    and are tagged with the "cluster" stage.
     """
     final_results = []
+    async for chunk in iter_expanded_clusters(db, results, chunk_size=max(len(results), 1)):
+        final_results.extend(chunk)
+    return final_results
+
+async def iter_expanded_clusters(
+    db: AsyncSession, results: List[SanctionMatch], chunk_size: int = STREAM_CHUNK_SIZE
+) -> AsyncIterator[List[SanctionMatch]]:
+    """
+    expand_clusters over `results` (in match_sort_key order), `chunk_size` results at a
+    time: profile members are fetched and yielded per chunk, so a stream can send its
+    first rows before every profile was expanded. The concatenated output equals
+    expand_clusters(db, results).
+    """
+    profile_scores: Dict[Any, float] = {}
+    matched: Dict[Any, List[SanctionMatch]] = {}
+    for r in results:
+        if r.profile_id:
+            profile_scores[r.profile_id] = max(profile_scores.get(r.profile_id, 0.0), r.score)
+            matched.setdefault(r.profile_id, []).append(r)
+
     seen_ids = set()
-    
-    profile_ids_to_fetch = set()
-    
-    # First pass: collect results and profile IDs
+    for start in range(0, len(results), chunk_size):
+        chunk = results[start:start + chunk_size]
+        # Profiles whose group is emitted in this chunk (first time one of their members shows up)
+        profile_ids = list(dict.fromkeys(
+            r.profile_id for r in chunk if r.profile_id and r.id not in seen_ids
+        ))
+        members = await _profile_members(db, profile_ids) if profile_ids else {}
+
+        expanded = []
+        for r in chunk:
+            if r.id in seen_ids:
+                continue
+            if not r.profile_id:
+                expanded.append(r)
+                seen_ids.add(r.id)
+                continue
+
+            # First (best) member of a profile: emit the whole group here
+            for m in matched[r.profile_id]:
+                if m.id not in seen_ids:
+                    expanded.append(m)
+                    seen_ids.add(m.id)
+            for member in members.get(r.profile_id, []):
+                if member.id not in seen_ids:
+                    expanded.append(_to_match(member, profile_scores[r.profile_id], 0.0, ["cluster"]))
+                    seen_ids.add(member.id)
+        if expanded:
+            yield expanded
+
+def group_by_profile(results: List[SanctionMatch]) -> List[ProfileMatch]:
+    """
+    Collapses expanded results to one entry per EntityProfile (unclustered sanctions
+    are their own group) with the best score, in result order.
+    """
+    groups: Dict[Any, ProfileMatch] = {}
     for r in results:
-        if r.id not in seen_ids:
-            final_results.append(r)
-            seen_ids.add(r.id)
-            if r.profile_id:
-                profile_ids_to_fetch.add(r.profile_id)
-                
-    if not profile_ids_to_fetch:
-        return final_results
-        
-    # Fetch all siblings
-    stmt = select(Sanction).filter(Sanction.profile_id.in_(profile_ids_to_fetch))
-    res = await db.execute(stmt)
-    siblings = res.scalars().all()
-    
-    for s in siblings:
-        if s.id not in seen_ids:
-            final_results.append(s)
-            seen_ids.add(s.id)
-            
-    return final_results
+        key = r.profile_id or r.id
+        group = groups.get(key)
+        if group is None:
+            groups[key] = ProfileMatch(
+                profile_id=r.profile_id,
+                primary_name=r.entity_name,
+                score=r.score,
+                sanction_ids=[r.id],
+                sources=[r.source] if r.source else [],
+            )
+        else:
+            group.score = max(group.score, r.score)
+            group.sanction_ids.append(r.id)
+            if r.source and r.source not in group.sources:
+                group.sources.append(r.source)
+
+    profiles = get_profile_map()
+    if profiles is not None:
+        for group in groups.values():
+            if group.profile_id:
+                group.primary_name = profiles.primary_name(group.profile_id) or group.primary_name
+    return list(groups.values())
@@ -0,0 +1,89 @@
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import logging
+
+from app.core.config import settings
+from app.core.metrics import span
+from app.core.redis_client import get_redis
+from app.services.etl.normalizer import normalize_name
+from app.services.langchain_service import analyze_search_results, llm_available, summary_without_llm
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_KEY_PREFIX = "summary:"
+
+def summary_id_for(query: str, result_ids: List[int]) -> str:
+    """
+    Deterministic id over the normalized query and the result-id set, so a repeat
+    screen with the same outcome reuses the stored summary instead of calling the LLM.
+    """
+    payload = f"{normalize_name(query)}|{','.join(str(i) for i in sorted(set(result_ids)))}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+def _key(summary_id: str) -> str:
+    return f"{SUMMARY_KEY_PREFIX}{summary_id}"
+
+async def get_summary(summary_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns {"status": "pending" | "ready" | "error", "summary": ...} or None if unknown/expired.
+    """
+    try:
+        raw = await get_redis().get(_key(summary_id))
+    except Exception as e:
+        logger.warning(f"Summary read failed: {e}")
+        return None
+    return json.loads(raw) if raw is not None else None
+
+async def _store(summary_id: str, record: Dict[str, Any], ttl: int, only_if_absent: bool = False) -> Optional[bool]:
+    """
+    True when stored, False when `only_if_absent` and the key already existed,
+    None when Redis failed.
+    """
+    try:
+        return bool(await get_redis().set(_key(summary_id), json.dumps(record), ex=ttl, nx=only_if_absent))
+    except Exception as e:
+        logger.warning(f"Summary write failed: {e}")
+        return None
+
+async def request_summary(query: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Registers a summary for (query, results) without waiting for the LLM.
+    Returns the record plus "summary_id" and "generate": True when the caller must
+    schedule generate_summary (first request for this id, nothing cached yet).
+    """
+    summary_id = summary_id_for(query, [r["id"] for r in results])
+
+    immediate = summary_without_llm(query, results)
+    if immediate is not None:
+        record = {"status": "ready", "summary": immediate}
+        # The "no API key" text must not outlive a key being configured
+        ttl = settings.SUMMARY_CACHE_TTL_SECONDS if llm_available() else settings.SUMMARY_PENDING_TTL_SECONDS
+        await _store(summary_id, record, ttl)
+        return {"summary_id": summary_id, "generate": False, **record}
+
+    existing = await get_summary(summary_id)
+    if existing is not None:
+        return {"summary_id": summary_id, "generate": False, **existing}
+
+    pending = {"status": "pending", "summary": None}
+    # NX: only one request (in any API process) generates a given summary. If Redis is
+    # unreachable nobody can claim it, so this request generates it anyway.
+    claimed = await _store(summary_id, pending, settings.SUMMARY_PENDING_TTL_SECONDS, only_if_absent=True)
+    return {"summary_id": summary_id, "generate": claimed is not False, **pending}
+
+async def generate_summary(summary_id: str, query: str, results: List[Dict[str, Any]]):
+    """
+    Background job: calls the LLM and stores the outcome under the summary id.
+    Failures are kept briefly so a later screen can retry.
+    """
+    try:
+        # Runs after the response is sent: recorded in the histogram, not in Server-Timing
+        with span("llm_summary"):
+            summary = await analyze_search_results(query=query, results=results, raise_errors=True)
+        await _store(summary_id, {"status": "ready", "summary": summary}, settings.SUMMARY_CACHE_TTL_SECONDS)
+    except Exception as e:
+        await _store(
+            summary_id, {"status": "error", "summary": f"Error generating analysis: {e}"},
+            settings.SUMMARY_PENDING_TTL_SECONDS
+        )
@@ -1,7 +1,9 @@
-import xmltodict
-from typing import List, Dict, Any, Optional
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
 from datetime import datetime
+import io
 import logging
+import xml.etree.ElementTree as ET
+
 
 logger = logging.getLogger(__name__)
 
@@ -82,85 +84,117 @@ def extract_addresses(addr_data: Any) -> List[Dict[str, str]]:
             })
     return addresses
 
-def parse_un_sanctions_xml(content: bytes) -> List[Dict[str, Any]]:
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+def _element_to_dict(elem: ET.Element) -> Any:
+    """
+    Converts an element the way xmltodict does (repeated children become lists,
+    text-only elements strings, empty ones None, attributes '@name'), so the
+    extract_* helpers and the raw JSON columns keep their shape.
+    """
+    children = list(elem)
+    text = (elem.text or "").strip()
+    if not children and not elem.attrib:
+        return text or None
+
+    result: Dict[str, Any] = {f"@{_local_name(k)}": v for k, v in elem.attrib.items()}
+    for child in children:
+        tag = _local_name(child.tag)
+        value = _element_to_dict(child)
+        if tag not in result:
+            result[tag] = value
+        elif isinstance(result[tag], list):
+            result[tag].append(value)
+        else:
+            result[tag] = [result[tag], value]
+    if text:
+        result["#text"] = text
+    return result
+
+def _parse_individual(indiv: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Maps one INDIVIDUAL record to the Sanction model fields.
+    """
+    # Basic Info
+    first_name = indiv.get("FIRST_NAME", "")
+    second_name = indiv.get("SECOND_NAME", "")
+    third_name = indiv.get("THIRD_NAME", "")
+    fourth_name = indiv.get("FOURTH_NAME", "")
+
+    # Construct full entity name
+    full_name_parts = [p for p in [first_name, second_name, third_name, fourth_name] if p]
+    entity_name = " ".join(full_name_parts)
+
+    # Dates
+    listed_on_str = indiv.get("LISTED_ON")
+    listed_on = parse_date(listed_on_str)
+
+    last_updated_container = indiv.get("LAST_DAY_UPDATED", {})
+    last_updated_vals = extract_list_value(last_updated_container)
+    last_updated_str = last_updated_vals[-1] if last_updated_vals else None
+    last_updated = parse_date(last_updated_str)
+
+    # Lists
+    app_designations = extract_list_value(indiv.get("DESIGNATION"))
+    app_aliases = extract_aliases(indiv.get("INDIVIDUAL_ALIAS"))
+    app_addresses = extract_addresses(indiv.get("INDIVIDUAL_ADDRESS"))
+
+    # Nationality
+    nationality_container = indiv.get("NATIONALITY", {})
+    nationalities = extract_list_value(nationality_container)
+    nationality = ", ".join(nationalities) if nationalities else None
+
+    # Birth Info
+    dob_container = indiv.get("INDIVIDUAL_DATE_OF_BIRTH")
+    pob_container = indiv.get("INDIVIDUAL_PLACE_OF_BIRTH")
+
+    # Documents
+    docs_container = indiv.get("INDIVIDUAL_DOCUMENT")
+
+    return {
+        "data_id": indiv.get("DATAID"),
+        "un_list_type": indiv.get("UN_LIST_TYPE"),
+        "reference_number": indiv.get("REFERENCE_NUMBER"),
+        "entity_name": entity_name,
+        "gender": indiv.get("GENDER"),
+        "remarks": indiv.get("COMMENTS1"),
+        "listed_on": listed_on,
+        "last_updated": last_updated,
+        "nationality": nationality,
+        "designation": app_designations,
+        "aliases": app_aliases,
+        "addresses": app_addresses,
+        "birth_dates": dob_container if dob_container else [], # Keeping raw dict/list or simplified? Let's keep structure for JSON
+        "birth_places": pob_container if pob_container else [],
+        "documents": docs_container if docs_container else [],
+        "program": indiv.get("UN_LIST_TYPE"), # Reuse list type or specific program
+        "source": "UN_CONSOLIDATED",
+        "sanction_date": listed_on, # Mirroring
+    }
+
+def iter_un_sanctions_xml(source: Union[bytes, BinaryIO]) -> Iterator[Dict[str, Any]]:
     """
-    Parses the UN Sanctions XML content and returns a list of individual dictionaries ready for DB insertion.
+    Incrementally parses the UN Sanctions XML (raw bytes or a binary file object)
+    and yields one record per INDIVIDUAL, ready for DB insertion.
+    Each INDIVIDUAL element is dropped once converted, so memory stays flat
+    regardless of the list size. Raises ValueError on malformed XML; since records
+    are yielded as they are read, callers must not commit before the end.
     """
+    stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    path: List[ET.Element] = []
     try:
-        data = xmltodict.parse(content)
-    except Exception as e:
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                path.append(elem)
+                continue
+            path.pop()
+            # Direct children of INDIVIDUALS / ENTITIES: CONSOLIDATED_LIST > section > record
+            if len(path) != 2:
+                continue
+            if _local_name(elem.tag) == "INDIVIDUAL" and _local_name(path[1].tag) == "INDIVIDUALS":
+                yield _parse_individual(_element_to_dict(elem))
+            path[1].remove(elem)
+    except ET.ParseError as e:
         logger.error(f"Failed to parse XML: {e}")
         raise ValueError(f"Invalid XML format: {e}")
-
-    consolidated_list = data.get("CONSOLIDATED_LIST", {})
-    individuals = consolidated_list.get("INDIVIDUALS", {}).get("INDIVIDUAL", [])
-    
-    if not individuals:
-        return []
-        
-    if not isinstance(individuals, list):
-        individuals = [individuals]
-
-    parsed_individuals = []
-
-    for indiv in individuals:
-        # Basic Info
-        first_name = indiv.get("FIRST_NAME", "")
-        second_name = indiv.get("SECOND_NAME", "")
-        third_name = indiv.get("THIRD_NAME", "")
-        fourth_name = indiv.get("FOURTH_NAME", "")
-        
-        # Construct full entity name
-        full_name_parts = [p for p in [first_name, second_name, third_name, fourth_name] if p]
-        entity_name = " ".join(full_name_parts)
-
-        # Dates
-        listed_on_str = indiv.get("LISTED_ON")
-        listed_on = parse_date(listed_on_str)
-        
-        last_updated_container = indiv.get("LAST_DAY_UPDATED", {})
-        last_updated_vals = extract_list_value(last_updated_container)
-        last_updated_str = last_updated_vals[-1] if last_updated_vals else None
-        last_updated = parse_date(last_updated_str)
-
-        # Lists
-        app_designations = extract_list_value(indiv.get("DESIGNATION"))
-        app_aliases = extract_aliases(indiv.get("INDIVIDUAL_ALIAS"))
-        app_addresses = extract_addresses(indiv.get("INDIVIDUAL_ADDRESS"))
-        
-        # Nationality
-        nationality_container = indiv.get("NATIONALITY", {})
-        nationalities = extract_list_value(nationality_container)
-        nationality = ", ".join(nationalities) if nationalities else None
-
-        # Birth Info
-        dob_container = indiv.get("INDIVIDUAL_DATE_OF_BIRTH")
-        pob_container = indiv.get("INDIVIDUAL_PLACE_OF_BIRTH")
-        
-        # Documents
-        docs_container = indiv.get("INDIVIDUAL_DOCUMENT")
-
-        sanction_entry = {
-            "data_id": indiv.get("DATAID"),
-            "un_list_type": indiv.get("UN_LIST_TYPE"),
-            "reference_number": indiv.get("REFERENCE_NUMBER"),
-            "entity_name": entity_name,
-            "gender": indiv.get("GENDER"),
-            "remarks": indiv.get("COMMENTS1"),
-            "listed_on": listed_on,
-            "last_updated": last_updated,
-            "nationality": nationality,
-            "designation": app_designations,
-            "aliases": app_aliases,
-            "addresses": app_addresses,
-            "birth_dates": dob_container if dob_container else [], # Keeping raw dict/list or simplified? Let's keep structure for JSON
-            "birth_places": pob_container if pob_container else [],
-            "documents": docs_container if docs_container else [],
-            "program": indiv.get("UN_LIST_TYPE"), # Reuse list type or specific program
-            "source": "UN_CONSOLIDATED",
-            "sanction_date": listed_on # Mirroring
-        }
-        
-        parsed_individuals.append(sanction_entry)
-        
-    return parsed_individuals
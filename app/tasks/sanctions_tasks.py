@@ -1,6 +1,6 @@
+from typing import BinaryIO
 from celery.utils.log import get_task_logger
 import asyncio
-import httpx
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
@@ -11,27 +11,33 @@ from app.core.config import settings
 from app.services.sanction_service import sync_sanctions_data
 from app.services.mex_sanction_service import sync_mex_sanctions_data
 from app.services.sat_service import sync_sat_sanctions_data
+from app.services.etl.download import fetch_source, save_source
 
 logger = get_task_logger(__name__)
 
 @celery_app.task(name="sync_un_sanctions_task")
-def sync_un_sanctions_task():
+def sync_un_sanctions_task(force: bool = False):
     """
     Celery task to:
-    1. Download the UN Sanctions XML.
-    2. Run the async synchronization service.
+    1. Download the UN Sanctions XML (conditional GET, see etl.download).
+    2. Run the async synchronization service, unless the file is unchanged.
+    `force` re-downloads and re-syncs regardless of the cached validators.
     """
     logger.info("Starting UN Sanctions Sync Task...")
     
     try:
-        # Download XML
-        response = httpx.get(settings.UN_SANCTIONS_XML_URL, timeout=60.0, follow_redirects=True)
-        response.raise_for_status()
-        xml_content = response.content
-        logger.info(f"Downloaded XML successfully. Size: {len(xml_content)} bytes")
-        
-        # Run Async Logic in Sync Task
-        asyncio.run(run_sync_logic(xml_content))
+        # Download XML; None when the upstream file did not change since the last sync
+        download = fetch_source("un_consolidated", settings.UN_SANCTIONS_XML_URL, timeout=60.0, force=force)
+        if download is None:
+            logger.info("UN Sanctions XML unchanged. Skipping sync.")
+            return "Unchanged"
+        # Parsed straight from the spooled file; the payload is never held as one blob
+        with download.file as xml_content:
+            logger.info(f"Downloaded XML successfully. Size: {download.size} bytes")
+            
+            # Run Async Logic in Sync Task
+            asyncio.run(run_sync_logic(xml_content))
+            save_source(download)
         
         logger.info("UN Sanctions Sync Task Completed Successfully.")
         return "Sync Successful"
@@ -43,11 +49,11 @@ def sync_un_sanctions_task():
         raise e
 
 @celery_app.task(name="sync_mex_sanctions_task")
-def sync_mex_sanctions_task():
+def sync_mex_sanctions_task(force: bool = False):
     """
     Celery task to:
-    1. Download the Mexican Sanctions CSV.
-    2. Run the async synchronization service.
+    1. Download the Mexican Sanctions CSV (conditional GET, see etl.download).
+    2. Run the async synchronization service, unless the file is unchanged.
     """
     logger.info("Starting Mexican Sanctions Sync Task...")
     
@@ -56,13 +62,16 @@ def sync_mex_sanctions_task():
         # verify=False is often needed for some gov sites if cert chain is incomplete, 
         # but let's try with default first or follow existing pattern.
         # User output showed curl worked with default options, so standard httpx should work.
-        response = httpx.get(settings.MEX_SANCTIONS_CSV_URL, timeout=120.0, follow_redirects=True)
-        response.raise_for_status()
-        csv_content = response.content
-        logger.info(f"Downloaded CSV successfully. Size: {len(csv_content)} bytes")
-        
-        # Run Async Logic in Sync Task
-        asyncio.run(run_mex_sync_logic(csv_content))
+        download = fetch_source("mex_sancionados", settings.MEX_SANCTIONS_CSV_URL, timeout=120.0, force=force)
+        if download is None:
+            logger.info("Mexican Sanctions CSV unchanged. Skipping sync.")
+            return "Unchanged"
+        with download.file as csv_content:
+            logger.info(f"Downloaded CSV successfully. Size: {download.size} bytes")
+            
+            # Run Async Logic in Sync Task
+            asyncio.run(run_mex_sync_logic(csv_content))
+            save_source(download)
         
         logger.info("Mexican Sanctions Sync Task Completed Successfully.")
         return "Sync Successful"
@@ -72,11 +81,11 @@ def sync_mex_sanctions_task():
         raise e
 
 @celery_app.task(name="sync_sat_sanctions_task")
-def sync_sat_sanctions_task():
+def sync_sat_sanctions_task(force: bool = False):
     """
     Celery task to:
-    1. Download the SAT 69-B CSV.
-    2. Run the async synchronization service.
+    1. Download the SAT 69-B CSV (conditional GET, see etl.download).
+    2. Run the async synchronization service, unless the file is unchanged.
     """
     logger.info("Starting SAT 69-B Sync Task...")
     
@@ -84,13 +93,16 @@ def sync_sat_sanctions_task():
         # Download CSV
         # SAT often redirects or blocks automated requests, so headers/timeouts might be needed.
         # But we start simple as per requirement.
-        response = httpx.get(settings.SAT_69B_CSV_URL, timeout=120.0, follow_redirects=True)
-        response.raise_for_status()
-        csv_content = response.content
-        logger.info(f"Downloaded SAT CSV successfully. Size: {len(csv_content)} bytes")
-        
-        # Run Async Logic
-        asyncio.run(run_sat_sync_logic(csv_content))
+        download = fetch_source("sat_69b", settings.SAT_69B_CSV_URL, timeout=120.0, force=force)
+        if download is None:
+            logger.info("SAT 69-B CSV unchanged. Skipping sync.")
+            return "Unchanged"
+        with download.file as csv_content:
+            logger.info(f"Downloaded SAT CSV successfully. Size: {download.size} bytes")
+            
+            # Run Async Logic
+            asyncio.run(run_sat_sync_logic(csv_content))
+            save_source(download)
         
         logger.info("SAT 69-B Sync Task Completed Successfully.")
         return "Sync Successful"
@@ -103,7 +115,7 @@ from sqlalchemy.ext.asyncio import create_async_engine
 
 # ... (imports)
 
-async def run_sync_logic(xml_content: bytes):
+async def run_sync_logic(xml_content: BinaryIO):
     """
     Helper to run async service logic from sync task.
     Creates a dedicated engine to avoid event loop conflicts in Celery.
@@ -125,7 +137,7 @@ async def run_sync_logic(xml_content: bytes):
         # Crucial: Dispose the engine to close connections
         await local_engine.dispose()
 
-async def run_mex_sync_logic(csv_content: bytes):
+async def run_mex_sync_logic(csv_content: BinaryIO):
     """
     Helper to run async service logic from sync task.
     """
@@ -142,7 +154,7 @@ async def run_mex_sync_logic(csv_content: bytes):
     finally:
         await local_engine.dispose()
 
-async def run_sat_sync_logic(csv_content: bytes):
+async def run_sat_sync_logic(csv_content: BinaryIO):
     """
     Helper to run async service logic from sync task.
     """
@@ -0,0 +1,7 @@
+"""
+Reproducible search benchmark.
+
+Generates a synthetic sanctions corpus (UN XML, MEX and SAT 69-B CSV), loads it
+through the real sync services and replays a labelled query workload through
+search_sanctions. Run it with `python -m benchmarks --help`.
+"""
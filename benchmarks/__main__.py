@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Deterministic, network-free stand-in for the embedding API; must be set before app settings load
+os.environ["EMBEDDING_PROVIDER"] = "local"
+
+from benchmarks.corpus import SIZES, generate_corpus, generate_workload, mex_csv, sat_csv, un_xml
+
+def write_files(entities, directory: str):
+    os.makedirs(directory, exist_ok=True)
+    for filename, render in (("un_consolidated.xml", un_xml), ("mex_sancionados.csv", mex_csv), ("sat_69b.csv", sat_csv)):
+        path = os.path.join(directory, filename)
+        with open(path, "wb") as f:
+            f.write(render(entities))
+        print(f"Wrote {path}")
+
+async def main(args):
+    from benchmarks.runner import corpus_summary, load_corpus, print_report, run_mode
+
+    entities = generate_corpus(SIZES[args.size], seed=args.seed)
+    queries = generate_workload(entities, args.queries, seed=args.seed + 1)
+    report = {"corpus": corpus_summary(entities, args.seed), "limit": args.limit, "concurrency": args.concurrency}
+    print(f"Corpus {args.size}: {report['corpus']['sources']}, {len(queries)} queries")
+
+    if not args.skip_load:
+        report["load"] = await load_corpus(entities)
+
+    modes = ["index", "sql"] if args.mode == "both" else [args.mode]
+    report["modes"] = {}
+    for mode in modes:
+        report["modes"][mode] = await run_mode(mode, queries, args.limit, args.concurrency)
+        print_report(mode, report["modes"][mode], args.limit)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Synthetic sanctions corpus + search workload benchmark. "
+                    "Loading REPLACES the UN, MEX and SAT sanctions in the configured database: use a dedicated one."
+    )
+    parser.add_argument("--size", choices=sorted(SIZES), default="10k")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=10, help="k for recall@k (results per search)")
+    parser.add_argument("--mode", choices=["index", "sql", "both"], default="both")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-load", action="store_true", help="Replay against a corpus loaded earlier with the same size/seed")
+    parser.add_argument("--write-files", metavar="DIR", help="Only write the UN XML / MEX CSV / SAT CSV files to DIR")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    parser.add_argument("--yes", action="store_true", help="Confirm that the database sanctions may be replaced")
+    args = parser.parse_args()
+
+    if args.write_files:
+        write_files(generate_corpus(SIZES[args.size], seed=args.seed), args.write_files)
+        sys.exit(0)
+    if not args.skip_load and not args.yes:
+        parser.error("loading replaces the UN, MEX and SAT sanctions in the database; pass --yes (or --skip-load)")
+
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(main(args))
@@ -0,0 +1,320 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import csv
+import io
+import random
+import re
+from datetime import date, timedelta
+from xml.sax.saxutils import escape
+
+# Corpus sizes accepted on the command line
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# The UN list is a few hundred individuals in production; its share is kept small (and capped)
+UN_SHARE = 0.01
+UN_MAX_ROWS = 1_000
+MEX_SHARE = 0.6 # Of the non-UN rows; the rest are SAT 69-B taxpayers
+
+FIRST_NAMES = [
+    "JOSE", "JUAN", "MARIA", "GUADALUPE", "FRANCISCO", "ANTONIO", "JESUS", "ALEJANDRO", "MIGUEL", "PEDRO",
+    "MANUEL", "RICARDO", "FERNANDO", "JORGE", "ROBERTO", "CARLOS", "LUIS", "JAVIER", "RAFAEL", "SERGIO",
+    "ARTURO", "EDUARDO", "ENRIQUE", "RAUL", "VICTOR", "HECTOR", "SALVADOR", "IGNACIO", "GERARDO", "ALFREDO",
+    "ROSA", "LETICIA", "VERONICA", "PATRICIA", "ELIZABETH", "GABRIELA", "SILVIA", "BEATRIZ", "YOLANDA", "CECILIA",
+    "ISABEL", "LORENA", "XOCHITL", "HERMINIA", "ZENAIDA", "GILBERTO", "HUMBERTO", "OCTAVIO", "BENITO", "EZEQUIEL",
+    "JOAQUIN", "ISMAEL", "OVIDIO", "NEMESIO", "HERIBERTO", "ADAN", "VALENTIN", "GENARO", "ESTEBAN", "ALVARO",
+]
+
+SURNAMES = [
+    "HERNANDEZ", "GARCIA", "MARTINEZ", "LOPEZ", "GONZALEZ", "RODRIGUEZ", "PEREZ", "SANCHEZ", "RAMIREZ", "CRUZ",
+    "FLORES", "GOMEZ", "MORALES", "VAZQUEZ", "JIMENEZ", "REYES", "DIAZ", "TORRES", "GUTIERREZ", "RUIZ",
+    "MENDOZA", "AGUILAR", "ORTIZ", "MORENO", "CASTILLO", "ROMERO", "ALVAREZ", "MENDEZ", "CHAVEZ", "RIVERA",
+    "JUAREZ", "RAMOS", "DOMINGUEZ", "HERRERA", "MEDINA", "CASTRO", "VARGAS", "GUZMAN", "VELAZQUEZ", "MUNOZ",
+    "ROJAS", "CONTRERAS", "SALAZAR", "LUNA", "ORTEGA", "GUERRERO", "ESTRADA", "BAUTISTA", "CERVANTES", "VILLANUEVA",
+    "LOERA", "CARO", "QUINTERO", "FELIX", "GALLARDO", "ARELLANO", "BELTRAN", "LEYVA", "CARRILLO", "FUENTES",
+    "ZAMBRANO", "VALENCIA", "OSEGUERA", "CISNEROS", "BALLESTEROS", "YEPEZ", "VILLARREAL", "ZAVALA", "HINOJOSA", "LLAMAS",
+    "CEBALLOS", "QUEZADA", "ECHEVERRIA", "BRAVO", "GIL", "VEGA", "SOTO", "NAVARRO", "CAMPOS", "ESPINOZA",
+]
+
+UN_GIVEN = [
+    "ABDUL", "AHMAD", "MOHAMMED", "MUHAMMAD", "ABU", "OMAR", "KHALID", "YUSUF", "IBRAHIM", "HASSAN",
+    "HUSSEIN", "ALI", "SAYED", "TARIQ", "ZIAUDDIN", "NASIR", "JALALUDDIN", "SIRAJUDDIN", "MULLAH", "HAFIZ",
+    "ABDULLAH", "FAZL", "QARI", "AMIR", "WALID", "SALEH", "BAKR", "HAMZA", "YASIN", "RAHMAN",
+]
+
+UN_FAMILY = [
+    "HAQQANI", "AL-ZAWAHIRI", "BARADAR", "MANSOOR", "OMARI", "AKHUND", "NOORZAI", "ZAKIR", "AL-BAGHDADI", "AL-MASRI",
+    "KHAIRKHWA", "WARDAK", "AGHA", "SAMAD", "ZAHID", "AL-QAHTANI", "AL-RIMI", "ISHAKZAI", "KAKAR", "TURABI",
+]
+
+COMPANY_WORDS = [
+    "COMERCIALIZADORA", "SERVICIOS", "CONSTRUCTORA", "GRUPO", "DISTRIBUIDORA", "CONSULTORES", "SOLUCIONES",
+    "INMOBILIARIA", "TRANSPORTES", "ASESORES", "CORPORATIVO", "PROVEEDORA", "INTEGRADORA", "MULTISERVICIOS",
+    "AZTECA", "DEL NORTE", "DEL PACIFICO", "DEL GOLFO", "DEL BAJIO", "INTEGRAL", "EMPRESARIAL", "GLOBAL",
+    "INDUSTRIAL", "ESTRATEGICA", "PROFESIONAL", "ALFA", "OMEGA", "VALLE", "SIERRA", "HORIZONTE",
+]
+
+COMPANY_SUFFIXES = ["SA DE CV", "S DE RL DE CV", "SAPI DE CV", "SC", "SAS DE CV"]
+
+# Tokens guaranteed absent from the corpus: queries made of them must return nothing
+CLEAN_TOKENS = [
+    "TORVALD", "OKSANEN", "HAKONSEN", "YUKIKO", "TAKAHASHI", "BJORKLUND", "NGUYEN", "KOWALCZYK", "LINDQVIST",
+    "SVETLANA", "IVANKOVIC", "MAGNUSSEN", "HIROSHI", "PETTERSSON", "ADEBAYO", "OKONKWO", "KAUR", "DVORAK",
+]
+
+NICKNAMES = ["EL CHAPO", "EL MAYO", "EL MENCHO", "EL AZUL", "EL GUERO", "EL FLACO", "EL TIGRE", "EL PADRINO", "EL JEFE", "LA TIA"]
+
+# Spelling swaps common in Spanish name transcription (what the phonetic stage targets)
+PHONETIC_SWAPS = [
+    (r"V", "B"), (r"B", "V"), (r"Z", "S"), (r"S(?=[AOU])", "Z"), (r"LL", "Y"), (r"Y(?=[AEIOU])", "LL"),
+    (r"^H", ""), (r"C(?=[EI])", "S"), (r"QU", "K"), (r"G(?=[EI])", "J"), (r"X", "J"),
+]
+
+class SyntheticEntity(NamedTuple):
+    data_id: str
+    source: str # UN_CONSOLIDATED, MEX_SANCIONADOS, SAT_69B
+    name: str
+    aliases: Tuple[str, ...]
+    given: Tuple[str, ...] # Given names, to build reordered queries
+    family: Tuple[str, ...] # Surnames / family names
+    rfc: Optional[str] = None
+    birth_year: Optional[int] = None
+
+class BenchmarkQuery(NamedTuple):
+    text: str
+    kind: str # exact, reordered, typo, phonetic, alias, partial, clean
+    expected: Optional[str] # data_id that must be found; None for clean queries
+
+def split_sizes(total: int) -> Dict[str, int]:
+    un = min(UN_MAX_ROWS, max(1, int(total * UN_SHARE)))
+    mex = int((total - un) * MEX_SHARE)
+    return {"UN_CONSOLIDATED": un, "MEX_SANCIONADOS": mex, "SAT_69B": total - un - mex}
+
+def typo_variant(name: str, rng: random.Random) -> Optional[str]:
+    """
+    One edit (substitution, deletion or transposition) inside a token of 5+ letters.
+    """
+    tokens = name.split()
+    positions = [i for i, t in enumerate(tokens) if len(t) >= 5 and t.isalpha()]
+    if not positions:
+        return None
+    i = rng.choice(positions)
+    token = tokens[i]
+    j = rng.randrange(1, len(token) - 1)
+    edit = rng.choice(("substitute", "delete", "transpose"))
+    if edit == "substitute":
+        letter = rng.choice([c for c in "AEIOURNSTL" if c != token[j]])
+        token = token[:j] + letter + token[j + 1:]
+    elif edit == "delete":
+        token = token[:j] + token[j + 1:]
+    else:
+        token = token[:j - 1] + token[j] + token[j - 1] + token[j + 1:]
+    tokens[i] = token
+    return " ".join(tokens)
+
+def phonetic_variant(name: str, rng: random.Random) -> Optional[str]:
+    """
+    Applies one Spanish spelling swap (B/V, S/Z, LL/Y, silent H...) to one token.
+    """
+    tokens = name.split()
+    candidates = [(i, pattern, repl) for i, t in enumerate(tokens) for pattern, repl in PHONETIC_SWAPS if re.search(pattern, t)]
+    if not candidates:
+        return None
+    i, pattern, repl = rng.choice(candidates)
+    tokens[i] = re.sub(pattern, repl, tokens[i], count=1)
+    return " ".join(t for t in tokens if t)
+
+def _person(rng: random.Random, given: List[str], family: List[str], extra_given: float) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    names = [rng.choice(given)]
+    if rng.random() < extra_given:
+        second = rng.choice(given)
+        if second != names[0]:
+            names.append(second)
+    return tuple(names), (rng.choice(family), rng.choice(family))
+
+def _rfc(rng: random.Random, letters: int, used: set) -> str:
+    while True:
+        born = date(1950, 1, 1) + timedelta(days=rng.randrange(0, 365 * 55))
+        rfc = (
+            "".join(rng.choice("ABCDEFGHIJKLMNOPRSTUVWXYZ") for _ in range(letters))
+            + born.strftime("%y%m%d")
+            + "".join(rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ0123456789") for _ in range(3))
+        )
+        if rfc not in used:
+            used.add(rfc)
+            return rfc
+
+def generate_corpus(total: int, seed: int = 42) -> List[SyntheticEntity]:
+    """
+    Deterministic synthetic corpus: UN individuals (with aliases, nicknames and
+    transliteration variants), MEX sanctioned public servants and SAT 69-B
+    taxpayers (companies and individuals, with RFC).
+    """
+    rng = random.Random(seed)
+    sizes = split_sizes(total)
+    entities: List[SyntheticEntity] = []
+
+    for i in range(sizes["UN_CONSOLIDATED"]):
+        # Mostly Arabic transliterations, a share of Latin American cartel members
+        if rng.random() < 0.7:
+            given, family = _person(rng, UN_GIVEN, UN_FAMILY, 0.6)
+            family = family[:1]
+        else:
+            given, family = _person(rng, FIRST_NAMES, SURNAMES, 0.4)
+        name = " ".join(given + family)
+        aliases = []
+        for _ in range(rng.choice((0, 1, 1, 2, 3))):
+            variant = rng.choice((typo_variant, phonetic_variant))(name, rng)
+            if variant and variant != name:
+                aliases.append(variant)
+        if rng.random() < 0.2:
+            aliases.append(rng.choice(NICKNAMES))
+        entities.append(SyntheticEntity(
+            data_id=str(6_900_000 + i), source="UN_CONSOLIDATED", name=name, aliases=tuple(aliases),
+            given=given, family=family, birth_year=rng.randrange(1950, 1995)
+        ))
+
+    for i in range(sizes["MEX_SANCIONADOS"]):
+        given, family = _person(rng, FIRST_NAMES, SURNAMES, 0.35)
+        expediente = f"{rng.randrange(2005, 2025)}/{i:07d}"
+        entities.append(SyntheticEntity(
+            data_id=f"MEX-{expediente}", source="MEX_SANCIONADOS", name=" ".join(given + family),
+            aliases=(), given=given, family=family
+        ))
+
+    used_rfcs: set = set()
+    for _ in range(sizes["SAT_69B"]):
+        if rng.random() < 0.75:
+            words = rng.sample(COMPANY_WORDS, rng.choice((2, 2, 3)))
+            name = f"{' '.join(words)} {rng.choice(COMPANY_SUFFIXES)}"
+            rfc = _rfc(rng, 3, used_rfcs)
+            given, family = (), tuple(words)
+        else:
+            given, family = _person(rng, FIRST_NAMES, SURNAMES, 0.35)
+            name = " ".join(given + family)
+            rfc = _rfc(rng, 4, used_rfcs)
+        entities.append(SyntheticEntity(
+            data_id=f"SAT-69B-{rfc}", source="SAT_69B", name=name, aliases=(),
+            given=given, family=family, rfc=rfc
+        ))
+    return entities
+
+# Share of each query kind in the replayed workload
+WORKLOAD_MIX = {
+    "exact": 0.2, "reordered": 0.1, "typo": 0.2, "phonetic": 0.15, "alias": 0.05, "partial": 0.1, "clean": 0.2,
+}
+
+def _query_for(entity: SyntheticEntity, kind: str, rng: random.Random) -> Optional[str]:
+    if kind == "exact":
+        return entity.name
+    if kind == "reordered":
+        if not entity.given:
+            return None
+        return " ".join(entity.family + entity.given)
+    if kind == "typo":
+        return typo_variant(entity.name, rng)
+    if kind == "phonetic":
+        return phonetic_variant(entity.name, rng)
+    if kind == "alias":
+        return rng.choice(entity.aliases) if entity.aliases else None
+    if kind == "partial":
+        if not entity.given:
+            return None
+        return f"{entity.given[0]} {entity.family[0]}"
+    raise ValueError(f"Unknown query kind: {kind}")
+
+def generate_workload(entities: List[SyntheticEntity], count: int, seed: int = 7) -> List[BenchmarkQuery]:
+    """
+    Labelled queries sampled from the corpus: each carries the data_id it must find.
+    Clean queries use tokens that never appear in the corpus.
+    """
+    rng = random.Random(seed)
+    kinds = list(WORKLOAD_MIX)
+    weights = [WORKLOAD_MIX[k] for k in kinds]
+    with_aliases = [e for e in entities if e.aliases]
+
+    queries: List[BenchmarkQuery] = []
+    while len(queries) < count:
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "clean":
+            text = " ".join(rng.sample(CLEAN_TOKENS, rng.choice((2, 3))))
+            queries.append(BenchmarkQuery(text, kind, None))
+            continue
+        pool = with_aliases if kind == "alias" else entities
+        if not pool:
+            continue
+        entity = rng.choice(pool)
+        text = _query_for(entity, kind, rng)
+        if text:
+            queries.append(BenchmarkQuery(text, kind, entity.data_id))
+    return queries
+
+def un_xml(entities: List[SyntheticEntity]) -> bytes:
+    """
+    UN consolidated list XML with the elements iter_un_sanctions_xml reads.
+    """
+    out = io.StringIO()
+    out.write('<?xml version="1.0" encoding="UTF-8"?>\n<CONSOLIDATED_LIST dateGenerated="2024-01-01T00:00:00Z">\n<INDIVIDUALS>\n')
+    field_names = ("FIRST_NAME", "SECOND_NAME", "THIRD_NAME", "FOURTH_NAME")
+    for n, e in enumerate(entities):
+        if e.source != "UN_CONSOLIDATED":
+            continue
+        out.write("<INDIVIDUAL>\n")
+        out.write(f"<DATAID>{e.data_id}</DATAID>\n<VERSIONNUM>1</VERSIONNUM>\n")
+        for field, value in zip(field_names, e.name.split()):
+            out.write(f"<{field}>{escape(value)}</{field}>\n")
+        list_type = "Al-Qaida" if e.given and e.given[0] in UN_GIVEN else "DRC"
+        out.write(f"<UN_LIST_TYPE>{list_type}</UN_LIST_TYPE>\n<REFERENCE_NUMBER>QDi.{n:04d}</REFERENCE_NUMBER>\n")
+        out.write(f"<LISTED_ON>{2001 + n % 23}-0{1 + n % 9}-1{n % 10}</LISTED_ON>\n")
+        out.write("<COMMENTS1>Synthetic benchmark record.</COMMENTS1>\n")
+        out.write("<DESIGNATION><VALUE>Member</VALUE></DESIGNATION>\n")
+        out.write("<NATIONALITY><VALUE>Afghanistan</VALUE></NATIONALITY>\n")
+        out.write("<LAST_DAY_UPDATED><VALUE>2023-06-01</VALUE></LAST_DAY_UPDATED>\n")
+        for i, alias in enumerate(e.aliases):
+            quality = "Good" if i % 2 == 0 else "Low"
+            out.write(f"<INDIVIDUAL_ALIAS><QUALITY>{quality}</QUALITY><ALIAS_NAME>{escape(alias)}</ALIAS_NAME></INDIVIDUAL_ALIAS>\n")
+        out.write("<INDIVIDUAL_ADDRESS><COUNTRY>Afghanistan</COUNTRY></INDIVIDUAL_ADDRESS>\n")
+        if e.birth_year:
+            out.write(f"<INDIVIDUAL_DATE_OF_BIRTH><TYPE_OF_DATE>EXACT</TYPE_OF_DATE><YEAR>{e.birth_year}</YEAR></INDIVIDUAL_DATE_OF_BIRTH>\n")
+        out.write("</INDIVIDUAL>\n")
+    out.write("</INDIVIDUALS>\n<ENTITIES/>\n</CONSOLIDATED_LIST>\n")
+    return out.getvalue().encode("utf-8")
+
+def mex_csv(entities: List[SyntheticEntity]) -> bytes:
+    """
+    Servidores públicos sancionados CSV with the columns iter_mex_csv reads.
+    """
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow([
+        "expediente", "nombre", "apellido_paterno", "apellido_materno", "dependencia", "autoridad",
+        "causa", "sancion_impuesta", "ley", "fecha_resolucion", "inicio",
+    ])
+    for n, e in enumerate(entities):
+        if e.source != "MEX_SANCIONADOS":
+            continue
+        expediente = e.data_id[len("MEX-"):]
+        resolved = date(2010, 1, 1) + timedelta(days=n % 5000)
+        writer.writerow([
+            expediente, " ".join(e.given), e.family[0], e.family[1], "SECRETARIA DE LA FUNCION PUBLICA",
+            "ORGANO INTERNO DE CONTROL", "NEGLIGENCIA ADMINISTRATIVA", "INHABILITACION", "LGRA",
+            resolved.isoformat(), (resolved + timedelta(days=30)).isoformat(),
+        ])
+    return out.getvalue().encode("utf-8")
+
+def sat_csv(entities: List[SyntheticEntity]) -> bytes:
+    """
+    SAT 69-B list as published: a preamble before the header, latin-1 encoded.
+    """
+    out = io.StringIO()
+    out.write("Listado completo de contribuyentes (Artículo 69-B del Código Fiscal de la Federación)\n")
+    out.write("Información actualizada al 01 de enero de 2024\n")
+    writer = csv.writer(out)
+    writer.writerow([
+        "No", "RFC", "Nombre del Contribuyente", "Situación del Contribuyente",
+        "Fecha de publicación página SAT presuntos",
+    ])
+    for n, e in enumerate(entities):
+        if e.source != "SAT_69B":
+            continue
+        published = date(2014, 1, 1) + timedelta(days=n % 3650)
+        writer.writerow([n + 1, e.rfc, e.name, "Definitivo", published.strftime("%d/%m/%Y")])
+    return out.getvalue().encode("latin-1")
@@ -0,0 +1,185 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import time
+from collections import defaultdict
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.metrics import start_request_timings
+from app.db.session import async_session
+from app.models.sanction import Sanction
+from app.services.mex_sanction_service import sync_mex_sanctions_data
+from app.services.name_index import refresh_name_index
+from app.services.profile_map import refresh_profile_map
+from app.services.sanction_service import sync_sanctions_data
+from app.services.sat_service import sync_sat_sanctions_data
+from app.services.search_service import search_sanctions
+from benchmarks.corpus import BenchmarkQuery, SyntheticEntity, mex_csv, sat_csv, un_xml
+from scripts.backfill_embeddings import backfill_embeddings
+
+logger = logging.getLogger(__name__)
+
+# Candidate stages reported in SanctionMatch.stages
+RETRIEVAL_STAGES = ("exact", "token", "fuzzy", "phonetic", "vector", "cluster")
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2)}
+
+async def load_corpus(entities: List[SyntheticEntity]) -> Dict[str, Any]:
+    """
+    Loads the corpus through the production sync services, then builds embeddings
+    and the in-memory structures. Each sync deletes the rows of its source that are
+    not in its file, which also clears a previous benchmark corpus.
+    """
+    report: Dict[str, Any] = {}
+    steps = (
+        ("un_sync", sync_sanctions_data, un_xml),
+        ("mex_sync", sync_mex_sanctions_data, mex_csv),
+        ("sat_sync", sync_sat_sanctions_data, sat_csv),
+    )
+    for step, sync, render in steps:
+        payload = render(entities)
+        started = time.perf_counter()
+        async with async_session() as db:
+            counts = await sync(db, payload)
+        report[step] = {"seconds": round(time.perf_counter() - started, 2), "bytes": len(payload), **counts}
+        print(f"{step:>10}: {report[step]['seconds']:8.2f}s  {counts}")
+
+    for step, job in (
+        ("embeddings", lambda: backfill_embeddings(recompute_all=True)),
+        ("name_index", refresh_name_index),
+        ("profile_map", refresh_profile_map),
+    ):
+        started = time.perf_counter()
+        await job()
+        report[step] = {"seconds": round(time.perf_counter() - started, 2)}
+        print(f"{step:>10}: {report[step]['seconds']:8.2f}s")
+    return report
+
+async def _data_ids() -> Dict[int, str]:
+    async with async_session() as db:
+        res = await db.execute(select(Sanction.id, Sanction.data_id))
+        return {sanction_id: data_id for sanction_id, data_id in res.all()}
+
+async def replay(queries: List[BenchmarkQuery], limit: int = 10, concurrency: int = 1, warmup: int = 20) -> Dict[str, Any]:
+    """
+    Replays the workload through search_sanctions (result cache off) with `concurrency`
+    workers, each on its own session. Per query it records the latency, the per-stage
+    span timings and the rank of the expected sanction.
+    """
+    data_ids = await _data_ids()
+
+    async with async_session() as db:
+        for query in queries[:warmup]:
+            await search_sanctions(db, query.text, limit=limit, use_cache=False)
+
+    records: List[Dict[str, Any]] = []
+    pending = iter(queries)
+
+    async def worker():
+        async with async_session() as db:
+            for query in pending:
+                timings = start_request_timings()
+                started = time.perf_counter()
+                results = await search_sanctions(db, query.text, limit=limit, use_cache=False)
+                elapsed = (time.perf_counter() - started) * 1000
+                # Ends the read transaction, like a request-scoped session would
+                await db.rollback()
+
+                rank, stages = None, []
+                for position, match in enumerate(results, 1):
+                    if query.expected and data_ids.get(match.id) == query.expected:
+                        rank, stages = position, match.stages
+                        break
+                records.append({
+                    "kind": query.kind, "ms": elapsed, "timings": dict(timings),
+                    "results": len(results), "rank": rank, "stages": stages,
+                })
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    return summarize(records, wall, limit)
+
+def summarize(records: List[Dict[str, Any]], wall_seconds: float, limit: int) -> Dict[str, Any]:
+    labelled = [r for r in records if r["kind"] != "clean"]
+    by_kind: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    stage_ms: Dict[str, List[float]] = defaultdict(list)
+    for r in records:
+        by_kind[r["kind"]].append(r)
+        for stage, ms in r["timings"].items():
+            stage_ms[stage].append(ms)
+
+    kinds = {}
+    for kind, rows in sorted(by_kind.items()):
+        entry = {"queries": len(rows), **percentiles([r["ms"] for r in rows])}
+        if kind == "clean":
+            # Any hit on a name absent from the corpus is a false positive
+            entry["false_positive_rate"] = round(sum(1 for r in rows if r["results"]) / len(rows), 4)
+        else:
+            entry["recall@1"] = round(sum(1 for r in rows if r["rank"] == 1) / len(rows), 4)
+            entry[f"recall@{limit}"] = round(sum(1 for r in rows if r["rank"]) / len(rows), 4)
+        kinds[kind] = entry
+
+    # Share of labelled queries whose expected sanction was returned with each stage among its sources
+    stage_recall = {
+        stage: round(sum(1 for r in labelled if r["rank"] and stage in r["stages"]) / max(len(labelled), 1), 4)
+        for stage in RETRIEVAL_STAGES
+    }
+
+    return {
+        "queries": len(records),
+        "wall_seconds": round(wall_seconds, 2),
+        "throughput_qps": round(len(records) / wall_seconds, 2) if wall_seconds else 0.0,
+        "latency_ms": percentiles([r["ms"] for r in records]),
+        f"recall@{limit}": round(sum(1 for r in labelled if r["rank"]) / max(len(labelled), 1), 4),
+        "stages_ms": {stage: {"calls": len(ms), **percentiles(ms)} for stage, ms in sorted(stage_ms.items())},
+        "stage_recall": stage_recall,
+        "kinds": kinds,
+    }
+
+async def run_mode(mode: str, queries: List[BenchmarkQuery], limit: int, concurrency: int) -> Dict[str, Any]:
+    """
+    mode "index": in-memory name index (and negative pre-check) serve the name stages.
+    mode "sql": every stage runs in Postgres.
+    """
+    enabled = settings.NAME_INDEX_ENABLED
+    settings.NAME_INDEX_ENABLED = mode == "index"
+    try:
+        return await replay(queries, limit=limit, concurrency=concurrency)
+    finally:
+        settings.NAME_INDEX_ENABLED = enabled
+
+def print_report(mode: str, report: Dict[str, Any], limit: int):
+    latency = report["latency_ms"]
+    print(f"\n== {mode} ==")
+    print(
+        f"{report['queries']} queries in {report['wall_seconds']}s  {report['throughput_qps']} q/s  "
+        f"p50={latency['p50']}ms p95={latency['p95']}ms p99={latency['p99']}ms  "
+        f"recall@{limit}={report[f'recall@{limit}']}"
+    )
+    print(f"{'stage':>16} {'calls':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for stage, row in report["stages_ms"].items():
+        print(f"{stage:>16} {row['calls']:>7} {row['p50']:>9} {row['p95']:>9} {row['p99']:>9}")
+    print("stage recall: " + "  ".join(f"{stage}={value}" for stage, value in report["stage_recall"].items()))
+    print(f"{'query kind':>16} {'n':>6} {'recall@1':>9} {f'recall@{limit}':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    for kind, row in report["kinds"].items():
+        if kind == "clean":
+            print(f"{kind:>16} {row['queries']:>6} {'fp rate':>9} {row['false_positive_rate']:>10} {row['p50']:>9} {row['p99']:>9}")
+        else:
+            print(f"{kind:>16} {row['queries']:>6} {row['recall@1']:>9} {row[f'recall@{limit}']:>10} {row['p50']:>9} {row['p99']:>9}")
+
+def corpus_summary(entities: List[SyntheticEntity], seed: Optional[int]) -> Dict[str, Any]:
+    sources: Dict[str, int] = defaultdict(int)
+    for e in entities:
+        sources[e.source] += 1
+    return {
+        "rows": len(entities), "seed": seed, "sources": dict(sources),
+        "aliases": sum(len(e.aliases) for e in entities),
+    }
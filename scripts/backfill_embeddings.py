@@ -1,54 +1,67 @@
+import argparse
 import asyncio
 import sys
 import os
 import logging
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 # Add parent directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.db.session import async_session
 from app.models.sanction import Sanction
-from app.services.search_service import get_embedding
+from app.services.embedding_providers import get_embedding_provider
+from app.services.etl.normalizer import normalize_name
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def backfill_embeddings():
-    logger.info("🚀 Starting embedding backfill...")
+BATCH_SIZE = 100 # Texts per provider call
+
+async def backfill_embeddings(recompute_all: bool = False):
+    provider = get_embedding_provider()
+    logger.info(f"🚀 Starting embedding backfill with {provider.model}...")
+    if not provider.available():
+        logger.error("Embedding provider is not configured (EMBEDDING_PROVIDER / OPENAI_API_KEY).")
+        return
     
     async with async_session() as db:
-        # Fetch records without embeddings
-        stmt = select(Sanction).filter(Sanction.embedding.is_(None))
-        result = await db.execute(stmt)
-        sanctions = result.scalars().all()
-        
-        logger.info(f"Found {len(sanctions)} records missing embeddings.")
+        # Fetch records without embeddings (or all of them after switching providers)
+        stmt = select(Sanction.id, Sanction.entity_name).filter(Sanction.entity_name.isnot(None))
+        if not recompute_all:
+            stmt = stmt.filter(Sanction.embedding.is_(None))
+        result = await db.execute(stmt.order_by(Sanction.id))
+        rows = [(sanction_id, normalize_name(name)) for sanction_id, name in result.all()]
+        rows = [(sanction_id, name) for sanction_id, name in rows if name]
         
-        count = 0
-        total = len(sanctions)
+        total = len(rows)
+        logger.info(f"Found {total} records to embed.")
         
-        for s in sanctions:
-            count += 1
-            if not s.entity_name:
-                continue
-                
+        for start in range(0, total, BATCH_SIZE):
+            batch = rows[start:start + BATCH_SIZE]
             try:
-                logger.info(f"[{count}/{total}] Generating for: {s.entity_name}")
-                embedding = await get_embedding(s.entity_name)
-                if embedding:
-                    s.embedding = embedding
-                    
-                # Commit every 10 records to avoid huge transactions
-                if count % 10 == 0:
-                    await db.commit()
+                # Same normalized form search_sanctions embeds at query time
+                embeddings = await provider.embed([name for _, name in batch])
+                await db.execute(
+                    update(Sanction),
+                    [{"id": sanction_id, "embedding": e} for (sanction_id, _), e in zip(batch, embeddings)]
+                )
+                await db.commit()
+                logger.info(f"[{min(start + BATCH_SIZE, total)}/{total}] embedded")
             except Exception as e:
-                logger.error(f"Failed for {s.entity_name}: {e}")
+                await db.rollback()
+                logger.error(f"Failed batch starting at {batch[0][1]}: {e}")
                 
-        await db.commit()
         logger.info("✅ Backfill complete.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate sanction embeddings")
+    parser.add_argument(
+        "--all", action="store_true",
+        help="Recompute every embedding (required after changing EMBEDDING_PROVIDER, and once for vectors embedded from the raw entity_name)"
+    )
+    args = parser.parse_args()
+
     if sys.platform == 'win32':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    asyncio.run(backfill_embeddings())
+    asyncio.run(backfill_embeddings(args.all))
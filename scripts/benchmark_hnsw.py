@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import async_session
+from app.models.sanction import Sanction
+from sqlalchemy import select, func, text
+
+# Recall vs latency of the HNSW index on sanction.embedding.
+# Query vectors are embeddings already stored in the table, so no OpenAI calls are made.
+# Ground truth is the exact (sequential scan) cosine top-k.
+
+async def top_k(db, embedding, k, exact=False, ef_search=None):
+    if exact:
+        await db.execute(text("SET LOCAL enable_indexscan = off"))
+    else:
+        await db.execute(text("SELECT set_config('hnsw.ef_search', :value, true)"), {"value": str(ef_search)})
+
+    stmt = select(Sanction.id).filter(Sanction.embedding.isnot(None)).order_by(
+        Sanction.embedding.cosine_distance(embedding)
+    ).limit(k)
+    started = time.perf_counter()
+    result = await db.execute(stmt)
+    ids = result.scalars().all()
+    elapsed = (time.perf_counter() - started) * 1000
+    await db.rollback() # Ends the transaction so SET LOCAL does not leak
+    return ids, elapsed
+
+async def benchmark(queries: int, k: int, ef_values):
+    async with async_session() as db:
+        result = await db.execute(
+            select(Sanction.embedding).filter(Sanction.embedding.isnot(None)).order_by(func.random()).limit(queries)
+        )
+        samples = [list(e) for e in result.scalars().all()]
+        await db.rollback()
+
+        if not samples:
+            print("No embeddings found. Run scripts/backfill_embeddings.py first.")
+            return
+
+        print(f"Queries: {len(samples)}, k={k}")
+
+        truth, exact_ms = [], []
+        for embedding in samples:
+            ids, elapsed = await top_k(db, embedding, k, exact=True)
+            truth.append(set(ids))
+            exact_ms.append(elapsed)
+        print(f"{'exact':>10} recall@{k}=1.000  p50={np.percentile(exact_ms, 50):7.2f}ms  p95={np.percentile(exact_ms, 95):7.2f}ms")
+
+        for ef in ef_values:
+            recalls, latencies = [], []
+            for embedding, expected in zip(samples, truth):
+                ids, elapsed = await top_k(db, embedding, k, ef_search=ef)
+                recalls.append(len(expected & set(ids)) / max(len(expected), 1))
+                latencies.append(elapsed)
+            print(
+                f"{'ef=' + str(ef):>10} recall@{k}={np.mean(recalls):.3f}  "
+                f"p50={np.percentile(latencies, 50):7.2f}ms  p95={np.percentile(latencies, 95):7.2f}ms"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HNSW recall vs latency benchmark")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--ef", type=int, nargs="+", default=[40, 64, 100, 200, 400])
+    args = parser.parse_args()
+
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(benchmark(args.queries, args.k, args.ef))
@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.db.session import engine 
 from app.models.sanction import Sanction
-from app.services.xml_handler import parse_un_sanctions_xml
+from app.services.xml_handler import iter_un_sanctions_xml
 
 # XML Snippet to insert if DB is empty (from User's prompt)
 SAMPLE_XML = """<CONSOLIDATED_LIST xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:noNamespaceSchemaLocation="https://www.un.org/sc/resources/sc-sanctions.xsd" dateGenerated="2026-01-20T00:00:01.474Z">
@@ -61,7 +61,7 @@ async def run_search_test():
             print("\n[INFO] 'ERIC BADEGE' not found initially. Installing sample data...")
             
             # Parse and Insert
-            parsed_items = parse_un_sanctions_xml(SAMPLE_XML.encode('utf-8'))
+            parsed_items = iter_un_sanctions_xml(SAMPLE_XML.encode('utf-8'))
             for item in parsed_items:
                 # Check for duplicate before inserting
                 existing = await session.execute(select(Sanction).filter(Sanction.data_id == item['data_id']))
@@ -0,0 +1,42 @@
+import asyncio
+
+from app.schemas.search_schema import ScreeningItem
+from app.services.batch_screening_service import BATCH_CANDIDATES_SQL, _sql_candidates
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+class FakeSession:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.calls = []
+
+    async def execute(self, statement, params=None):
+        self.calls.append((statement, params))
+        return FakeResult(self.rows if statement is BATCH_CANDIDATES_SQL else [])
+
+def candidate_params(db):
+    return [params for statement, params in db.calls if statement is BATCH_CANDIDATES_SQL]
+
+def test_blank_names_never_reach_the_sql():
+    db = FakeSession()
+    items = [ScreeningItem(name="   "), ScreeningItem(name="!!!")]
+    assert asyncio.run(_sql_candidates(db, items, 5)) == []
+    assert db.calls == []
+
+def test_params_keep_the_item_index_and_feed_every_stage():
+    db = FakeSession(rows=[(2, 10, 1.0, "exact")])
+    items = [ScreeningItem(name="Guzmán Loera, Joaquín"), ScreeningItem(name="--"), ScreeningItem(name="Villa")]
+    assert asyncio.run(_sql_candidates(db, items, 5)) == [(2, 10, 1.0, "exact")]
+
+    (params,) = candidate_params(db)
+    assert params["idx"] == [0, 2]
+    assert params["names"] == ["GUZMAN LOERA JOAQUIN", "VILLA"]
+    # Token and phonetic stages get the same inputs NameIndex.lookup uses
+    assert params["token_sets"] == ["GUZMAN JOAQUIN LOERA", "VILLA"]
+    assert params["key_sets"] == ["GUSMAN JOAKIN LOERA", "BIYA"]
+    assert params["k"] == 5
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services.match_scoring import score_candidates
+
+def sanction(name, aliases=None, rfc=None):
+    return SimpleNamespace(entity_name=name, aliases=aliases or [], birth_dates=None, nationality=None, rfc=rfc)
+
+def score(query, name, **kwargs):
+    return float(score_candidates(query, [sanction(name)], **kwargs)[0])
+
+@pytest.mark.parametrize("query, name", [
+    ("JUAN", "JUAN HERNANDEZ LOPEZ"),
+    ("GARCIA", "JOSE LUIS GARCIA PEREZ"),
+    ("LOPEZ", "MARIA GUADALUPE LOPEZ HERNANDEZ"),
+])
+def test_single_common_token_is_below_threshold(query, name):
+    assert score(query, name) < settings.SEARCH_MATCH_THRESHOLD
+
+@pytest.mark.parametrize("query, name", [
+    ("MARIA LOPEZ", "MARIA GUADALUPE LOPEZ HERNANDEZ"),
+    ("JOAQUIN GUZMAN LOERA", "JOAQUIN ARCHIVALDO GUZMAN LOERA"),
+])
+def test_partial_query_scores_below_full_name(query, name):
+    partial = score(query, name)
+    assert partial < 0.85
+    assert partial < score(name, name)
+
+def test_full_name_scores_one_in_any_order():
+    assert score("JOSE LUIS GARCIA PEREZ", "JOSE LUIS GARCIA PEREZ") == pytest.approx(1.0)
+    assert score("GUZMAN LOERA, JOAQUIN", "JOAQUIN GUZMAN LOERA") == pytest.approx(1.0)
+
+@pytest.mark.parametrize("query, name", [
+    ("JOAQUIN GUSMAN LOERA", "JOAQUIN GUZMAN LOERA"),
+    ("MOHAMED ALI", "MUHAMMAD ALI"),
+    ("OSAMA BIN LADEN", "USAMA BIN LADIN"),
+])
+def test_spelling_variants_reach_threshold(query, name):
+    assert score(query, name) >= settings.SEARCH_MATCH_THRESHOLD
+
+def test_different_person_sharing_a_first_name_is_below_threshold():
+    assert score("JUAN PEREZ", "JUAN LOPEZ") < settings.SEARCH_MATCH_THRESHOLD
+
+def test_best_alias_wins():
+    candidate = sanction("JOAQUIN ARCHIVALDO GUZMAN LOERA", aliases=[{"name": "EL CHAPO GUZMAN"}])
+    assert float(score_candidates("EL CHAPO GUZMAN", [candidate])[0]) == pytest.approx(1.0)
+
+def test_rfc_agreement_and_contradiction():
+    base = score("JUAN PEREZ", "JUAN PEREZ LOPEZ")
+    candidate = sanction("JUAN PEREZ LOPEZ", rfc="PELJ800101AAA")
+    assert float(score_candidates("JUAN PEREZ", [candidate], rfc="PELJ800101AAA")[0]) > base
+    assert float(score_candidates("JUAN PEREZ", [candidate], rfc="XXXX000000XXX")[0]) < base
+
+def test_non_latin_query_falls_back_to_vector_similarity():
+    candidates = [sanction("USAMA BIN LADIN"), sanction("JUAN PEREZ")]
+    scores = score_candidates("Усама бен Ладен", candidates, fallback_scores=[0.83, 0.2])
+    assert scores.tolist() == pytest.approx([0.83, 0.2])
+    # Without a fallback there is nothing to compare
+    assert score_candidates("أسامة بن لادن", candidates).tolist() == [0.0, 0.0]
+
+def test_batch_scores_match_single_candidate_scores():
+    candidates = [
+        sanction("JOAQUIN ARCHIVALDO GUZMAN LOERA", aliases=[{"name": "EL CHAPO"}, {"name": "JOAQUIN GUZMAN"}]),
+        sanction("JUAN LOPEZ"),
+        sanction("S.A. DE C.V."),
+        sanction(None),
+        sanction("GUZMAN LOERA JOAQUIN"),
+    ]
+    batch = score_candidates("JOAQUIN GUSMAN", candidates)
+    single = [float(score_candidates("JOAQUIN GUSMAN", [c])[0]) for c in candidates]
+    assert batch.tolist() == pytest.approx(single)
@@ -0,0 +1,42 @@
+import pytest
+
+from app.services.name_index import NameIndex
+
+ENTRIES = [
+    (1, "Joaquín Archivaldo Guzmán Loera"),
+    (1, "El Chapo"),
+    (2, "Ismael Zambada García"),
+    (3, "María de la Luz García Zambada"),
+    (4, "Guzmán Loera, Aureliano"),
+    (5, "Rafael Caro Quintero"),
+]
+
+@pytest.fixture(scope="module")
+def index():
+    return NameIndex(ENTRIES)
+
+def test_surname_first_input_matches_by_token_set(index):
+    ranked = index.candidates("GUZMAN LOERA, JOAQUIN ARCHIVALDO", depth=5)
+    assert ranked["exact"] == []
+    # A permutation of the whole name scores 1.0
+    assert ranked["token"] == [(1, 1.0)]
+
+def test_partial_token_sets_rank_by_extra_tokens(index):
+    token = index.candidates("LOERA GUZMAN", depth=5)["token"]
+    assert [sanction_id for sanction_id, _ in token] == [4, 1]
+    assert token[0][1] == pytest.approx(2 / 3)
+    assert token[1][1] == pytest.approx(2 / 4)
+
+def test_particles_are_ignored(index):
+    # "DE LA" is not part of the token set, so the reordered name is a full permutation
+    assert index.candidates("GARCIA ZAMBADA MARIA LUZ", depth=5)["token"] == [(3, 1.0)]
+    assert {s for s, _ in index.candidates("ZAMBADA GARCIA", depth=5)["token"]} == {2, 3}
+
+def test_every_query_token_is_required(index):
+    assert index.candidates("GUZMAN LOERA PEREZ", depth=5)["token"] == []
+    # Single tokens are left to the exact stage
+    assert index.candidates("QUINTERO", depth=5)["token"] == []
+
+def test_lookup_reports_the_token_stage(index):
+    hits = index.lookup("QUINTERO CARO RAFAEL", limit=5)
+    assert hits[0] == (5, 1.0, "token")
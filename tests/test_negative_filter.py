@@ -0,0 +1,108 @@
+import random
+import statistics
+import time
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.etl.normalizer import tokenize_name
+from app.services.match_scoring import UNMATCHED_NAME_MAX_SCORE, jaro_winkler, score_candidates
+from app.services.negative_filter import NameFilter
+
+NAMES = [
+    "JOSE LUIS GARCIA PEREZ", "MARIA GUADALUPE LOPEZ HERNANDEZ", "JOAQUIN ARCHIVALDO GUZMAN LOERA",
+    "ISMAEL ZAMBADA GARCIA", "NEMESIO OSEGUERA CERVANTES", "RAFAEL CARO QUINTERO", "MUHAMMAD TAHER ANWARI",
+    "ABDUL GHANI BARADAR", "SIRAJUDDIN JALLALOUDINE HAQQANI", "YUSUF AL-QARADAWI", "OSAMA BIN LADIN",
+    "HECTOR LUIS PALMA SALAZAR", "COMERCIALIZADORA DEL NORTE SA DE CV", "XOCHITL HERMINIA VILLARREAL",
+]
+
+# Transliterations and Spanish spelling drift that the scorer accepts
+VARIANTS = [
+    "MOHAMED", "MOHAMMED TAHER", "MUHAMED ANWARI", "ABDEL GHANI", "BARADER", "SERAJUDDIN HAQANI",
+    "YOUSSEF QARADAWI", "USAMA BIN LADEN", "JOAKIN GUSMAN", "ISMAEL SAMBADA", "NEMECIO OSEGERA",
+    "RAFAEL KARO KINTERO", "HECTOR PALMA", "XOCHITL VILLAREAL", "JOSE GARSIA", "MARIA LOPES",
+]
+
+def sanction(name):
+    # Agreeing attributes maximize the score the filter has to account for
+    return SimpleNamespace(
+        entity_name=name, aliases=[], rfc=None, nationality="MEXICO",
+        birth_dates=[{"DATE": "1957-04-04"}],
+    )
+
+def mutations(token, rng, count=4):
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    for _ in range(count):
+        word = token
+        for _ in range(rng.randint(1, 3)):
+            i = rng.randrange(len(word))
+            op = rng.randrange(4)
+            if op == 0 and len(word) > 2:
+                word = word[:i] + word[i + 1:]
+            elif op == 1:
+                word = word[:i] + rng.choice(letters) + word[i:]
+            elif op == 2:
+                word = word[:i] + rng.choice(letters) + word[i + 1:]
+            elif i < len(word) - 1:
+                word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        yield word
+
+@pytest.fixture(scope="module")
+def name_filter():
+    return NameFilter([tokenize_name(name) for name in NAMES], rfcs=["PELJ800101AAA"])
+
+@pytest.fixture(scope="module")
+def queries():
+    rng = random.Random(7)
+    result = set(VARIANTS) | set(NAMES)
+    for name in NAMES:
+        tokens = tokenize_name(name)
+        result.update(" ".join(tokens[:k]) for k in range(1, len(tokens)))
+        for token in tokens:
+            result.update(mutations(token, rng))
+    return sorted(result)
+
+def test_bound_is_never_below_jaro_winkler(name_filter, queries):
+    for query in queries:
+        for token in tokenize_name(query):
+            bounds = name_filter.similarity_bounds(token)
+            for bound, indexed in zip(bounds, name_filter.tokens):
+                assert bound >= jaro_winkler(token, indexed) - 1e-9, (token, indexed)
+
+def test_never_rejects_a_query_the_scorer_accepts(name_filter, queries):
+    candidates = [sanction(name) for name in NAMES]
+    for query in queries:
+        scores = score_candidates(query, candidates, birth_date=date(1957, 4, 4), nationality="MEXICO")
+        if scores.max() > UNMATCHED_NAME_MAX_SCORE:
+            assert name_filter.might_match(tokenize_name(query)), (query, float(scores.max()))
+
+def test_transliterated_query_is_not_rejected(name_filter):
+    assert score_candidates("MOHAMED", [sanction("MUHAMMAD")])[0] > UNMATCHED_NAME_MAX_SCORE
+    assert name_filter.might_match(["MOHAMED"])
+
+@pytest.mark.parametrize("query", ["TORVALD OKSANEN", "YUKIKO TAKAHASHI", "BJORKLUND"])
+def test_clean_names_are_rejected(name_filter, query):
+    assert not name_filter.might_match(tokenize_name(query))
+
+def test_rfc_and_particle_only_queries_pass(name_filter):
+    assert name_filter.might_match(["NOBODY"], rfc="pelj800101aaa")
+    assert name_filter.might_match(["DE", "LA"])
+
+def test_latency_on_a_large_vocabulary():
+    # Benchmark: ~180k distinct tokens, the size of the UN + MEX + SAT vocabulary
+    rng = random.Random(11)
+    letters = "ABCDEFGHIJLMNOPRSTUVYZ"
+    def word():
+        return "".join(rng.choice(letters) for _ in range(rng.randint(3, 12)))
+    name_filter = NameFilter([[word()] for _ in range(185000)], rfcs=[])
+    assert len(name_filter) > 170000
+    assert name_filter.nbytes < 10 * 2**20
+    timings = []
+    for _ in range(50):
+        query = [word() for _ in range(3)]
+        start = time.perf_counter()
+        name_filter.might_match(query)
+        timings.append(time.perf_counter() - start)
+    # ~3 ms for 3 uncached tokens here; generous bound for slow CI machines
+    assert statistics.median(timings) < 0.03
@@ -0,0 +1,35 @@
+import pytest
+
+from app.services.etl.phonetics import phonetic_keys, phonetic_min_shared, spanish_phonetic_code
+
+@pytest.mark.parametrize("a, b", [
+    ("GUZMAN", "GUSMAN"), ("VILLA", "BIYA"), ("HERNANDEZ", "ERNANDES"), ("GERARDO", "JERARDO"),
+    ("QUINTERO", "KINTERO"), ("CERVANTES", "SERBANTES"), ("GUILLEN", "GUIYEN"), ("ZAMBADA", "SAMBADA"),
+    ("CHAVEZ", "CHABES"), ("VILLARREAL", "VILLAREAL"),
+])
+def test_spelling_variants_share_a_code(a, b):
+    assert spanish_phonetic_code(a) == spanish_phonetic_code(b)
+
+@pytest.mark.parametrize("a, b", [("GARCIA", "GARZA"), ("LUNA", "LARA"), ("PEREZ", "PARRA"), ("RUIZ", "RIOS")])
+def test_different_surnames_keep_different_codes(a, b):
+    assert spanish_phonetic_code(a) != spanish_phonetic_code(b)
+
+@pytest.mark.parametrize("a, b", [
+    ("XIMENEZ", "JIMENEZ"), ("XIMENA", "JIMENA"), ("MEXIA", "MEJIA"), ("XAVIER", "JAVIER"),
+    ("XOCHITL", "SOCHITL"), ("MEXICO", "MEJICO"),
+])
+def test_x_variants_share_a_key(a, b):
+    assert set(phonetic_keys([a])) & set(phonetic_keys([b]))
+
+def test_x_keeps_its_plain_reading():
+    assert spanish_phonetic_code("XIMENEZ") == "SIMENES"
+    assert spanish_phonetic_code("XIMENEZ", archaic_x=True) == "JIMENES"
+    assert phonetic_keys(["ALEX"]) == ["ALEX"]
+
+def test_keys_skip_particles_digits_and_single_letters():
+    assert phonetic_keys(["JUAN", "DE", "LA", "CRUZ", "Y", "123", "J", "SA", "CV"]) == ["JUAN", "KRUS"]
+
+def test_min_shared_counts_tokens_not_keys():
+    assert phonetic_min_shared(["XIMENEZ"]) == 1
+    assert phonetic_min_shared(["XIMENEZ", "DE", "LA", "LOPEZ"]) == 2
+    assert phonetic_min_shared(["DE", "LA"]) == 0
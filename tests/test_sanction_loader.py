@@ -0,0 +1,159 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.services import sanction_loader
+from app.services.sanction_loader import NAME_COLUMNS, content_hash, has_changes, load_sanctions
+
+class FakeResult:
+    def __init__(self, scalar=None, row=None, rowcount=0):
+        self._scalar = scalar
+        self._row = row
+        self.rowcount = rowcount
+
+    def scalar(self):
+        return self._scalar
+
+    def one(self):
+        return self._row
+
+class FakeDriver:
+    def __init__(self):
+        self.copies = []
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copies.append((table, list(records), list(columns)))
+
+class FakeSession:
+    """
+    Records the SQL of a load; the upsert reports `upserts` (created, updated) per batch.
+    """
+    def __init__(self, upserts=((0, 0),), deleted=0):
+        self.driver = FakeDriver()
+        self.statements = []
+        self.upserts = list(upserts)
+        self.deleted = deleted
+
+    async def connection(self):
+        driver = self.driver
+
+        class Raw:
+            driver_connection = driver
+
+        class Conn:
+            async def get_raw_connection(self):
+                return Raw()
+
+        return Conn()
+
+    async def execute(self, statement, params=None):
+        sql = " ".join(str(statement).split())
+        self.statements.append((sql, params))
+        if sql.startswith("SELECT count(*) FROM sanction_staging"):
+            staged = {row[0] for table, rows, _ in self.driver.copies if table == "sanction_staging" for row in rows}
+            return FakeResult(scalar=len(staged))
+        if "INSERT INTO sanction (" in sql:
+            return FakeResult(row=self.upserts.pop(0))
+        if sql.startswith("DELETE FROM sanction s"):
+            return FakeResult(rowcount=self.deleted)
+        return FakeResult()
+
+    def copied(self, table):
+        return [(rows, columns) for name, rows, columns in self.driver.copies if name == table]
+
+    def sql(self, fragment):
+        return [(sql, params) for sql, params in self.statements if fragment in sql]
+
+def record(data_id, name, **fields):
+    return {
+        "data_id": data_id, "entity_name": name, "aliases": [{"name": f"{name} ALIAS"}],
+        "listed_on": date(2020, 1, 1), "source": "MEX_SANCTIONS", **fields,
+    }
+
+RECORDS = [
+    record("MEX-1", "JUAN PEREZ"),
+    record(None, "SIN ID"),
+    record("MEX-2", "MARIA LOPEZ"),
+    record("MEX-3", "PEDRO GARCIA"),
+    record("MEX-2", "MARIA LOPEZ HERNANDEZ"), # Repeated data_id: the last one wins
+]
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr(sanction_loader, "COPY_BATCH_SIZE", 2)
+
+def test_copies_in_chunks_with_only_the_provided_columns():
+    db = FakeSession(upserts=[(2, 1)], deleted=1)
+    result = asyncio.run(load_sanctions(db, iter(RECORDS), "MEX_SANCTIONS"))
+
+    sanction_copies = db.copied("sanction_staging")
+    assert [len(rows) for rows, _ in sanction_copies] == [1, 2, 1]
+    # No rfc column: a source that does not provide a field never overwrites it
+    columns = sanction_copies[0][1]
+    assert columns == ["data_id", "entity_name", "listed_on", "aliases", "source", "content_hash", "ord"]
+    rows = [row for rows, _ in sanction_copies for row in rows]
+    assert [row[0] for row in rows] == ["MEX-1", "MEX-2", "MEX-3", "MEX-2"]
+    assert [row[-1] for row in rows] == [0, 1, 2, 3]
+    # JSON columns go as text
+    assert rows[0][3] == '[{"name": "JUAN PEREZ ALIAS"}]'
+
+    name_rows = [row for rows, _ in db.copied("sanction_name_staging") for row in rows]
+    assert db.copied("sanction_name_staging")[0][1] == ["ord", "data_id", *NAME_COLUMNS]
+    assert [(row[0], row[1], row[2]) for row in name_rows[:2]] == [(0, "MEX-1", "JUAN PEREZ"), (0, "MEX-1", "JUAN PEREZ ALIAS")]
+
+    assert result == {"created": 2, "updated": 1, "unchanged": 0, "deleted": 1, "total_active": 3}
+
+def test_upsert_is_set_based_and_delete_is_scoped_to_the_source():
+    db = FakeSession(upserts=[(1, 0)])
+    asyncio.run(load_sanctions(db, RECORDS, "MEX_SANCTIONS"))
+
+    (upsert, params), = db.sql("INSERT INTO sanction (")
+    assert "ON CONFLICT (data_id) DO UPDATE" in upsert
+    assert "WHERE sanction.content_hash IS DISTINCT FROM EXCLUDED.content_hash" in upsert
+    assert "rfc" not in upsert
+    assert params == {"first": 0, "last": sanction_loader.UPSERT_BATCH_SIZE}
+    assert db.sql("DELETE FROM sanction_staging a USING sanction_staging b")
+    (delete, params), = db.sql("DELETE FROM sanction s")
+    assert params == {"source": "MEX_SANCTIONS"}
+
+def test_additive_loads_keep_missing_rows():
+    db = FakeSession(upserts=[(1, 0)])
+    result = asyncio.run(load_sanctions(db, RECORDS[:1], "UN_CONSOLIDATED", delete_missing=False))
+    assert db.sql("DELETE FROM sanction s") == []
+    assert result["deleted"] == 0
+
+def test_nothing_staged_touches_no_table():
+    db = FakeSession()
+    result = asyncio.run(load_sanctions(db, [record(None, "SIN ID")], "SAT_69B"))
+    assert db.statements == [] and db.driver.copies == []
+    assert result == {"created": 0, "updated": 0, "unchanged": 0, "deleted": 0, "total_active": 0}
+
+COLUMNS = ["data_id", "entity_name", "listed_on", "aliases", "source"]
+
+def test_content_hash_is_stable():
+    a = record("MEX-1", "JUAN PEREZ")
+    b = dict(reversed(list(a.items())))
+    assert content_hash(a, COLUMNS) == content_hash(b, COLUMNS)
+    assert content_hash(a, COLUMNS) == content_hash(record("MEX-1", "JUAN PEREZ"), COLUMNS)
+
+def test_content_hash_changes_with_loaded_fields_only():
+    base = content_hash(record("MEX-1", "JUAN PEREZ"), COLUMNS)
+    assert content_hash(record("MEX-1", "JUAN PERES"), COLUMNS) != base
+    assert content_hash(record("MEX-1", "JUAN PEREZ", listed_on=date(2020, 1, 2)), COLUMNS) != base
+    assert content_hash(record("MEX-1", "JUAN PEREZ", aliases=[]), COLUMNS) != base
+    # Fields outside the loaded columns do not trigger a rewrite
+    assert content_hash(record("MEX-1", "JUAN PEREZ", embedding=[0.1]), COLUMNS) == base
+
+def test_staged_rows_carry_the_content_hash():
+    db = FakeSession(upserts=[(0, 0)])
+    asyncio.run(load_sanctions(db, RECORDS[:1], "MEX_SANCTIONS"))
+    ((row,), columns), = db.copied("sanction_staging")
+    assert row[columns.index("content_hash")] == content_hash(RECORDS[0], COLUMNS)
+
+def test_unchanged_load_reports_no_changes():
+    db = FakeSession(upserts=[(0, 0)])
+    result = asyncio.run(load_sanctions(db, RECORDS, "MEX_SANCTIONS"))
+    assert result == {"created": 0, "updated": 0, "unchanged": 3, "deleted": 0, "total_active": 3}
+    assert not has_changes(result)
+    assert has_changes({**result, "deleted": 1})
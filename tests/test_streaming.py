@@ -0,0 +1,44 @@
+import csv
+import io
+
+from app.services.etl.streaming import FallbackDecoder, batched, iter_text_lines
+
+def decode_chunks(chunks):
+    decoder = FallbackDecoder()
+    text = "".join(decoder.decode(chunk) for chunk in chunks) + decoder.decode(b"", final=True)
+    return text, decoder.encoding
+
+def test_utf8_sequences_split_across_chunks():
+    data = "PEÑA NIETO, JOSÉ\n".encode("utf-8")
+    chunks = [data[i:i + 3] for i in range(0, len(data), 3)]
+    assert decode_chunks(chunks) == ("PEÑA NIETO, JOSÉ\n", "utf-8")
+
+def test_falls_back_to_latin1_mid_stream():
+    utf8 = "JOSÉ PÉREZ\n".encode("utf-8")
+    latin1 = "MUÑOZ ÁLVAREZ\n".encode("latin-1")
+    text, encoding = decode_chunks([utf8, latin1])
+    assert encoding == "latin-1"
+    # Text before the switch stays UTF-8, the failing chunk onwards is latin-1
+    assert text == "JOSÉ PÉREZ\nMUÑOZ ÁLVAREZ\n"
+
+def test_pending_bytes_are_decoded_as_latin1_after_the_switch():
+    # b"\xc3" starts a UTF-8 sequence that the next chunk does not complete
+    text, encoding = decode_chunks([b"GARC\xc3", b"A\n"])
+    assert encoding == "latin-1"
+    assert text == "GARCÃA\n"
+
+def test_lines_keep_their_endings_for_csv():
+    data = 'RFC,NOMBRE\r\nAAA010101AAA,"MUÑOZ\r\nSA DE CV"\r\nBBB020202BBB,ÚLTIMO'.encode("latin-1")
+    lines = list(iter_text_lines(io.BytesIO(data), chunk_size=8))
+    assert "".join(lines) == data.decode("latin-1")
+    assert all(line.endswith("\n") for line in lines[:-1])
+    assert list(csv.reader(lines)) == [
+        ["RFC", "NOMBRE"], ["AAA010101AAA", "MUÑOZ\r\nSA DE CV"], ["BBB020202BBB", "ÚLTIMO"],
+    ]
+
+def test_iter_text_lines_accepts_bytes():
+    assert list(iter_text_lines(b"A\nB\n")) == ["A\n", "B\n"]
+    assert list(iter_text_lines(b"")) == []
+
+def test_batched_is_lazy_and_keeps_the_tail():
+    assert list(batched(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
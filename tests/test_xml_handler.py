@@ -0,0 +1,40 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from app.services.xml_handler import _parse_individual, iter_un_sanctions_xml
+
+FIXTURE = Path(__file__).parent / "fixtures" / "un_consolidated_list.xml"
+
+def xmltodict_records(content: bytes):
+    # The parser iter_un_sanctions_xml replaced: xmltodict over the whole document
+    xmltodict = pytest.importorskip("xmltodict")
+    individuals = xmltodict.parse(content)["CONSOLIDATED_LIST"]["INDIVIDUALS"]["INDIVIDUAL"]
+    if not isinstance(individuals, list):
+        individuals = [individuals]
+    return [_parse_individual(indiv) for indiv in individuals]
+
+def test_iterparse_matches_xmltodict():
+    content = FIXTURE.read_bytes()
+    records = list(iter_un_sanctions_xml(content))
+    assert records == xmltodict_records(content)
+    # Entities are not loaded
+    assert [r["data_id"] for r in records] == ["6908555", "6908556", "6908557"]
+
+def test_record_fields():
+    first, second, third = iter_un_sanctions_xml(io.BytesIO(FIXTURE.read_bytes()))
+    assert first["entity_name"] == "JOAQUÍN ARCHIVALDO GUZMÁN LOERA"
+    assert first["designation"] == ["Leader", "Financier"]
+    assert first["last_updated"].isoformat() == "2019-11-22"
+    assert [a["name"] for a in first["aliases"]] == ["El Chapo", "Joaquín Guzmán"]
+    assert len(first["birth_dates"]) == 2
+    assert second["listed_on"].isoformat() == "2001-01-01"
+    assert second["remarks"] is None
+    assert second["addresses"] == [] and second["documents"] == []
+    assert third["aliases"] == [] and third["nationality"] is None
+
+def test_malformed_xml_raises_value_error():
+    content = FIXTURE.read_bytes()
+    with pytest.raises(ValueError):
+        list(iter_un_sanctions_xml(content[: len(content) // 2]))